@@ -0,0 +1,73 @@
+import argparse
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+from benchmark.runner import BACKENDS, ROOT_DIR, add_async_arguments, add_connection_arguments
+
+DEFAULT_SIZES = [1000, 100000, 1000000]
+
+
+def run_backend(args, backend, rows):
+    command = [
+        sys.executable, '-m', 'benchmark.runner',
+        '--backend', backend, '--rows', str(rows), '--calls', str(args.calls),
+        '--mode', args.mode, '--seed', str(args.seed),
+        '--concurrency', str(args.concurrency), '--pool-size', str(args.pool_size),
+        '--db-name', args.db_name, '--user', args.user, '--password', args.password,
+        '--host', args.host, '--port', args.port,
+    ]
+    completed = subprocess.run(command, cwd=ROOT_DIR, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"Бенчмарк {backend} на {rows} рядках завершився з помилкою:\n{completed.stderr}")
+    return json.loads(completed.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmark',
+        description="Бенчмарк операцій Model для бекендів rgr (psycopg2), lab2 (SQLAlchemy) "
+                    "і rgr_async (asyncpg, конкурентні виклики)."
+    )
+    parser.add_argument('--backends', nargs='+', choices=BACKENDS, default=BACKENDS)
+    parser.add_argument('--sizes', nargs='+', type=int, default=DEFAULT_SIZES)
+    parser.add_argument('--calls', type=int, default=1000,
+                        help="кількість викликів insert/update/delete для вимірювання затримок")
+    parser.add_argument('--mode', choices=['row', 'bulk', 'copy'], default='bulk',
+                        help="режим generate_data")
+    parser.add_argument('--seed', type=int, default=0)
+    add_async_arguments(parser)
+    parser.add_argument('--output', help="файл для JSON-звіту (за замовчуванням stdout)")
+    add_connection_arguments(parser)
+    args = parser.parse_args()
+
+    report = {
+        'meta': {
+            'started_at': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'sizes': args.sizes,
+            'calls': args.calls,
+            'mode': args.mode,
+            'seed': args.seed,
+            'concurrency': args.concurrency,
+            'pool_size': args.pool_size,
+        },
+        'results': [],
+    }
+    # Кожна пара (бекенд, розмір) - окремий процес, тож peak_rss_kb не
+    # змішується між прогонами.
+    for rows in args.sizes:
+        for backend in args.backends:
+            report['results'].extend(run_backend(args, backend, rows))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            json.dump(report, output_file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+
+if __name__ == '__main__':
+    main()
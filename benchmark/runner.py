@@ -0,0 +1,275 @@
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import resource
+import sys
+import time
+
+import psycopg2
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(PACKAGE_DIR)
+SCHEMA_PATH = os.path.join(PACKAGE_DIR, 'schema.sql')
+
+BACKENDS = ['rgr', 'lab2', 'rgr_async']
+GENERATED_TABLES = ['researcher', 'research_project', 'experiment']
+REPORT_TABLES = ['publication', 'researcher_project', 'researcher_experiment', 'researcher_publication']
+REPORT_RESEARCHERS = 100
+VIEW_REPEATS = 3
+ASYNC_CONCURRENCY = 100
+ASYNC_POOL_SIZE = 20
+
+
+# Обидва бекенди імпортують модуль model та його залежності з власної теки
+# (спільні модулі - з пакета common у ROOT_DIR), тому кожен бекенд
+# запускається в окремому процесі (див. __main__.py).
+def load_model_class(backend):
+    sys.path.insert(0, os.path.join(ROOT_DIR, backend))
+    from model import Model
+    return Model
+
+
+def load_async_model_class():
+    sys.path.insert(0, os.path.join(ROOT_DIR, 'rgr'))
+    from async_model import AsyncModel
+    return AsyncModel
+
+
+def connection_kwargs(args):
+    return dict(db_name=args.db_name, user=args.user, password=args.password, host=args.host, port=args.port)
+
+
+def reset_schema(args):
+    connection = psycopg2.connect(
+        dbname=args.db_name, user=args.user, password=args.password, host=args.host, port=args.port
+    )
+    try:
+        with open(SCHEMA_PATH, encoding='utf-8') as schema_file:
+            connection.cursor().execute(schema_file.read())
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def peak_rss_kb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+# Для конкурентних прогонів пропускна здатність рахується за загальним
+# часом (wall), а не за сумою затримок окремих викликів.
+def record(backend, rows, operation, latencies, units, unit, wall=None, **extra):
+    total = sum(latencies) if wall is None else wall
+    result = {
+        'backend': backend,
+        'rows': rows,
+        'operation': operation,
+        'calls': len(latencies),
+        'throughput': units / total if total else None,
+        'unit': unit,
+        'latency_ms': {
+            'p50': percentile(latencies, 0.50) * 1000,
+            'p99': percentile(latencies, 0.99) * 1000,
+        },
+        'peak_rss_kb': peak_rss_kb(),
+    }
+    result.update(extra)
+    return result
+
+
+def timed(call, *args):
+    started = time.perf_counter()
+    call(*args)
+    return time.perf_counter() - started
+
+
+# Перед кожним повтором кеш результатів Model очищується, інакше повтори
+# читали б з пам'яті, а не з бази (і AsyncModel, що кешу не має, програвала б).
+def timed_uncached(model, call, *args):
+    model.results.clear()
+    return timed(call, *args)
+
+
+async def timed_async(limit, call, *args):
+    async with limit:
+        started = time.perf_counter()
+        await call(*args)
+        return time.perf_counter() - started
+
+
+async def gather_timed(limit, calls):
+    started = time.perf_counter()
+    latencies = await asyncio.gather(*(timed_async(limit, *call) for call in calls))
+    return latencies, time.perf_counter() - started
+
+
+async def run_async(args):
+    random.seed(args.seed)
+    reset_schema(args)
+    model = await load_async_model_class().connect(
+        **connection_kwargs(args), pool_size=args.pool_size, value_seed=args.seed
+    )
+    limit = asyncio.Semaphore(args.concurrency)
+    backend, rows = args.backend, args.rows
+    calls = min(args.calls, rows)
+    extra = {'concurrency': args.concurrency, 'pool_size': args.pool_size}
+    results = []
+
+    try:
+        for table_name in GENERATED_TABLES:
+            latencies, wall = await gather_timed(limit, [(model.generate_data, table_name, rows, 'bulk')])
+            results.append(record(backend, rows, 'generate_data', latencies, rows, 'rows/s', wall,
+                                  table=table_name, mode='bulk', **extra))
+
+        latencies, wall = await gather_timed(
+            limit, [(model.view_table_data, 'researcher') for _ in range(VIEW_REPEATS)]
+        )
+        results.append(record(backend, rows, 'view_table_data', latencies, rows * VIEW_REPEATS, 'rows/s', wall,
+                              table='researcher', **extra))
+
+        columns = ['researcher_id', 'first_name', 'last_name', 'specialization', 'email']
+        new_ids = range(rows + 1, rows + calls + 1)
+        latencies, wall = await gather_timed(limit, [
+            (model.insert_data, 'researcher', columns,
+             [str(row_id), 'Bench', 'Researcher', 'Benchmarks', f'bench{row_id}@example.com'])
+            for row_id in new_ids
+        ])
+        results.append(record(backend, rows, 'insert_data', latencies, calls, 'ops/s', wall,
+                              table='researcher', **extra))
+
+        latencies, wall = await gather_timed(limit, [
+            (model.update_data, 'researcher', 'email', str(random.randint(1, rows)), f'updated{index}@example.com')
+            for index in range(calls)
+        ])
+        results.append(record(backend, rows, 'update_data', latencies, calls, 'ops/s', wall,
+                              table='researcher', **extra))
+
+        latencies, wall = await gather_timed(
+            limit, [(model.delete_data, 'researcher', str(row_id)) for row_id in new_ids]
+        )
+        results.append(record(backend, rows, 'delete_data', latencies, calls, 'ops/s', wall,
+                              table='researcher', **extra))
+    finally:
+        await model.close_connection()
+
+    return results
+
+
+def statement_count(model):
+    return sum(histogram['calls'] for histogram in model.latency_histograms().values())
+
+
+# Звіти є лише в lab2. Для кожного звіту фіксується і кількість SQL-запитів:
+# лінивий портфель (N+1) порівнюється з selectinload.
+def run_reports(model, backend, rows, mode):
+    results = []
+    for table_name in REPORT_TABLES:
+        elapsed = timed(model.generate_data, table_name, rows, mode)
+        results.append(record(backend, rows, 'generate_data', [elapsed], rows, 'rows/s',
+                              table=table_name, mode=mode))
+
+    reports = [
+        ('researcher_portfolio_lazy', VIEW_REPEATS, model.researcher_portfolio, (None, REPORT_RESEARCHERS, False)),
+        ('researcher_portfolio', VIEW_REPEATS, model.researcher_portfolio, (None, REPORT_RESEARCHERS, True)),
+        ('project_output_counts', VIEW_REPEATS, model.project_output_counts, (False,)),
+        ('publications_per_year', VIEW_REPEATS, model.publications_per_year, (False,)),
+        ('create_report_views', 1, model.create_report_views, ()),
+        ('refresh_report_views', VIEW_REPEATS, model.refresh_report_views, ()),
+        ('project_output_counts_view', VIEW_REPEATS, model.project_output_counts, (True,)),
+        ('publications_per_year_view', VIEW_REPEATS, model.publications_per_year, (True,)),
+    ]
+    for operation, repeats, call, call_args in reports:
+        statements = statement_count(model)
+        latencies = [timed(call, *call_args) for _ in range(repeats)]
+        results.append(record(backend, rows, operation, latencies, repeats, 'reports/s',
+                              statements_per_call=(statement_count(model) - statements) / repeats))
+    return results
+
+
+def run(args):
+    if args.backend == 'rgr_async':
+        return asyncio.run(run_async(args))
+
+    random.seed(args.seed)
+    reset_schema(args)
+    model = load_model_class(args.backend)(**connection_kwargs(args), value_seed=args.seed)
+    backend, rows = args.backend, args.rows
+    calls = min(args.calls, rows)
+    results = []
+
+    try:
+        for table_name in GENERATED_TABLES:
+            elapsed = timed(model.generate_data, table_name, rows, args.mode)
+            results.append(record(backend, rows, 'generate_data', [elapsed], rows, 'rows/s',
+                                  table=table_name, mode=args.mode))
+
+        latencies = [timed_uncached(model, model.view_table_data, 'researcher') for _ in range(VIEW_REPEATS)]
+        results.append(record(backend, rows, 'view_table_data', latencies, rows * VIEW_REPEATS, 'rows/s',
+                              table='researcher'))
+
+        columns = ['researcher_id', 'first_name', 'last_name', 'specialization', 'email']
+        new_ids = range(rows + 1, rows + calls + 1)
+        latencies = [
+            timed(model.insert_data, 'researcher', columns,
+                  [str(row_id), 'Bench', 'Researcher', 'Benchmarks', f'bench{row_id}@example.com'])
+            for row_id in new_ids
+        ]
+        results.append(record(backend, rows, 'insert_data', latencies, calls, 'ops/s', table='researcher'))
+
+        latencies = [
+            timed(model.update_data, 'researcher', 'email', str(random.randint(1, rows)),
+                  f'updated{index}@example.com')
+            for index in range(calls)
+        ]
+        results.append(record(backend, rows, 'update_data', latencies, calls, 'ops/s', table='researcher'))
+
+        # Видаляються лише щойно вставлені рядки: на них ніхто не посилається.
+        latencies = [timed(model.delete_data, 'researcher', str(row_id)) for row_id in new_ids]
+        results.append(record(backend, rows, 'delete_data', latencies, calls, 'ops/s', table='researcher'))
+
+        if backend == 'lab2':
+            results.extend(run_reports(model, backend, rows, args.mode))
+    finally:
+        model.close_connection()
+
+    return results
+
+
+def add_async_arguments(parser):
+    parser.add_argument('--concurrency', type=int, default=ASYNC_CONCURRENCY,
+                        help="кількість одночасних операцій для бекенду rgr_async")
+    parser.add_argument('--pool-size', type=int, default=ASYNC_POOL_SIZE,
+                        help="розмір пулу з'єднань для бекенду rgr_async")
+
+
+def add_connection_arguments(parser):
+    parser.add_argument('--db-name', default='research_benchmark',
+                        help="окрема база даних: таблиці схеми в ній видаляються і створюються заново")
+    parser.add_argument('--user', default='postgres')
+    parser.add_argument('--password', default='root')
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', default='5432')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Один прогін бенчмарку для одного бекенду і розміру.")
+    parser.add_argument('--backend', choices=BACKENDS, required=True)
+    parser.add_argument('--rows', type=int, required=True)
+    parser.add_argument('--calls', type=int, default=1000)
+    parser.add_argument('--mode', default='bulk')
+    parser.add_argument('--seed', type=int, default=0)
+    add_async_arguments(parser)
+    add_connection_arguments(parser)
+    args = parser.parse_args()
+    json.dump(run(args), sys.stdout)
+
+
+if __name__ == '__main__':
+    main()
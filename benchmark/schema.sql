@@ -0,0 +1,57 @@
+DROP TABLE IF EXISTS researcher_publication, researcher_experiment, researcher_project,
+    publication, experiment, research_project, researcher CASCADE;
+-- Послідовності блоків id (див. common/id_allocator.py) інакше пережили б
+-- таблиці, і нові id почалися б не з 1.
+DROP SEQUENCE IF EXISTS researcher_publication_id_block, researcher_experiment_id_block,
+    researcher_project_id_block, publication_id_block, experiment_id_block,
+    research_project_id_block, researcher_id_block;
+
+CREATE TABLE researcher (
+    researcher_id integer PRIMARY KEY,
+    first_name varchar(50) NOT NULL,
+    last_name varchar(50) NOT NULL,
+    specialization varchar(50) NOT NULL,
+    email varchar(50) NOT NULL
+);
+
+CREATE TABLE research_project (
+    research_project_id integer PRIMARY KEY,
+    title varchar(100) NOT NULL,
+    description varchar(500) NOT NULL,
+    start_date timestamp with time zone NOT NULL,
+    end_date timestamp with time zone
+);
+
+CREATE TABLE experiment (
+    experiment_id integer PRIMARY KEY,
+    description varchar(500) NOT NULL,
+    start_date timestamp with time zone NOT NULL,
+    end_date timestamp with time zone,
+    research_project_id integer NOT NULL REFERENCES research_project (research_project_id)
+);
+
+CREATE TABLE publication (
+    publication_id integer PRIMARY KEY,
+    title varchar(100) NOT NULL,
+    year integer NOT NULL,
+    journal varchar(100) NOT NULL,
+    research_project_id integer NOT NULL REFERENCES research_project (research_project_id)
+);
+
+CREATE TABLE researcher_project (
+    tab_id integer PRIMARY KEY,
+    researcher_id integer NOT NULL REFERENCES researcher (researcher_id),
+    research_project_id integer NOT NULL REFERENCES research_project (research_project_id)
+);
+
+CREATE TABLE researcher_experiment (
+    tab_id integer PRIMARY KEY,
+    researcher_id integer NOT NULL REFERENCES researcher (researcher_id),
+    experiment_id integer NOT NULL REFERENCES experiment (experiment_id)
+);
+
+CREATE TABLE researcher_publication (
+    tab_id integer PRIMARY KEY,
+    researcher_id integer NOT NULL REFERENCES researcher (researcher_id),
+    publication_id integer NOT NULL REFERENCES publication (publication_id)
+);
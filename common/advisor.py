@@ -0,0 +1,94 @@
+import json
+
+EXPLAIN_OPTIONS = 'ANALYZE, BUFFERS, FORMAT JSON'
+
+
+def index_name(table_name, column):
+    return f'{table_name}_{column}_idx'
+
+
+# Повертає (таблиця, стовпець, причина) для стовпців без індексу, що
+# починається з них: зовнішніх ключів (оголошених чи вгаданих за назвою) та
+# додаткових стовпців фільтрації filter_columns [(таблиця, стовпець)].
+# Первинний ключ, за яким Model оновлює і видаляє рядки, індексований завжди.
+# Подання і зовнішні таблиці не індексуються.
+def missing_indexes(catalog, filter_columns=None):
+    candidates = {}
+    for table in filter(catalog.is_table, catalog.tables()):
+        for column, _ in catalog.table_columns(table):
+            if column == catalog.primary_key(table):
+                continue
+            reference = catalog.reference(table, column)
+            if reference is not None:
+                candidates.setdefault((table, column), f'FK -> {reference[0]}.{reference[1]}')
+
+    for table, column in filter_columns or []:
+        table = table.lower()
+        if column not in [name for name, _ in catalog.table_columns(table)]:
+            raise ValueError(f"Таблиця {table} не має стовпця {column}.")
+        candidates.setdefault((table, column), 'фільтр')
+
+    return [
+        (table, column, reason) for (table, column), reason in sorted(candidates.items())
+        if not catalog.is_indexed(table, column)
+    ]
+
+
+def create_index_query(table_name, column, concurrently=False):
+    mode = 'CONCURRENTLY ' if concurrently else ''
+    return f"CREATE INDEX {mode}IF NOT EXISTS {index_name(table_name, column)} ON {table_name} ({column})"
+
+
+# Запити, на які впливають індекси зі списку: для зовнішнього ключа - саме та
+# перевірка, яку виконує тригер FOREIGN KEY при видаленні чи зміні id у
+# батьківській таблиці, для інших стовпців - вибірка за рівністю. Значення
+# береться з наявних даних, щоб план відповідав реальному виконанню.
+def explain_targets(catalog, columns):
+    targets = []
+    for table, column, _ in columns:
+        reference = catalog.reference(table, column)
+        if reference is not None:
+            ref_table, ref_column, declared = reference
+            lock = ' FOR KEY SHARE OF x' if declared else ''
+            label = f'delete_data({ref_table}) -> {table}.{column}'
+            query = (
+                f"SELECT 1 FROM ONLY {table} x "
+                f"WHERE {column} = (SELECT {ref_column} FROM {ref_table} LIMIT 1){lock}"
+            )
+        else:
+            label = f'{table}.{column} = ?'
+            query = f"SELECT * FROM {table} WHERE {column} = (SELECT {column} FROM {table} LIMIT 1)"
+        targets.append((label, table, f"EXPLAIN ({EXPLAIN_OPTIONS}) {query}"))
+    return targets
+
+
+def _scan_node(plan, table_name):
+    if plan.get('Relation Name') == table_name:
+        return plan
+    for child in plan.get('Plans', []):
+        node = _scan_node(child, table_name)
+        if node is not None:
+            return node
+    return None
+
+
+# Стискає JSON-план EXPLAIN до основних показників: тип доступу до таблиці,
+# час планування і виконання, прочитані з кешу та з диска сторінки.
+def plan_summary(label, table_name, explained):
+    # psycopg2 розбирає тип json сам, але рядок теж приймається.
+    if isinstance(explained, str):
+        explained = json.loads(explained)
+    result = explained[0]
+    plan = result['Plan']
+    scan = _scan_node(plan, table_name) or plan
+    access = scan['Node Type']
+    if scan.get('Index Name'):
+        access = f"{access} ({scan['Index Name']})"
+    return {
+        'query': label,
+        'access': access,
+        'planning_ms': result.get('Planning Time', 0.0),
+        'execution_ms': result.get('Execution Time', 0.0),
+        'shared_hit': plan.get('Shared Hit Blocks', 0),
+        'shared_read': plan.get('Shared Read Blocks', 0),
+    }
@@ -0,0 +1,119 @@
+CATALOG_QUERY = """
+    SELECT c.relname, a.attname, format_type(a.atttypid, NULL),
+           pk.conname IS NOT NULL, ref_table.relname, ref_column.attname,
+           EXISTS (SELECT 1 FROM pg_index i
+                   WHERE i.indrelid = c.oid AND i.indisvalid AND i.indkey[0] = a.attnum),
+           c.relkind
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    JOIN pg_attribute a ON a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+    LEFT JOIN pg_constraint pk
+        ON pk.conrelid = c.oid AND pk.contype = 'p' AND a.attnum = ANY (pk.conkey)
+    LEFT JOIN pg_constraint fk
+        ON fk.conrelid = c.oid AND fk.contype = 'f' AND fk.conkey = ARRAY[a.attnum]
+    LEFT JOIN pg_class ref_table ON ref_table.oid = fk.confrelid
+    LEFT JOIN pg_attribute ref_column
+        ON ref_column.attrelid = fk.confrelid AND ref_column.attnum = fk.confkey[1]
+    WHERE n.nspname = 'public' AND c.relkind IN ('r', 'p', 'v', 'f')
+    ORDER BY c.relname, a.attnum
+"""
+# Звичайні і секціоновані таблиці. Подання ('v') і зовнішні таблиці ('f')
+# лише переглядаються: дані для них не генеруються і id не резервуються.
+TABLE_RELKINDS = ('r', 'p')
+
+
+class SchemaCatalog:
+    def __init__(self):
+        self.columns = {}
+        self.primary_keys = {}
+        self.foreign_keys = {}
+        self.indexed_columns = {}
+        self.relkinds = {}
+
+    def refresh(self, cursor):
+        cursor.execute(CATALOG_QUERY)
+        self.load(cursor.fetchall())
+
+    def load(self, rows):
+        columns = {}
+        primary_keys = {}
+        foreign_keys = {}
+        indexed_columns = {}
+        relkinds = {}
+        for table, column, data_type, is_primary, ref_table, ref_column, indexed, relkind in rows:
+            relkinds[table] = relkind
+            table_columns = columns.setdefault(table, [])
+            # Стовпець з кількома зовнішніми ключами дає кілька рядків результату.
+            if not table_columns or table_columns[-1][0] != column:
+                table_columns.append((column, data_type))
+            if is_primary:
+                primary_keys.setdefault(table, column)
+            if ref_table is not None:
+                foreign_keys.setdefault(table, {}).setdefault(column, (ref_table, ref_column))
+            if indexed:
+                indexed_columns.setdefault(table, set()).add(column)
+
+        self.columns = columns
+        self.primary_keys = primary_keys
+        self.foreign_keys = foreign_keys
+        self.indexed_columns = indexed_columns
+        self.relkinds = relkinds
+
+    def tables(self):
+        return sorted(self.columns)
+
+    def table_columns(self, table_name):
+        return self.columns.get(table_name.lower(), [])
+
+    def primary_key(self, table_name):
+        return self.primary_keys.get(table_name.lower())
+
+    # Невідома таблиця вважається таблицею, щоб помилку дала сама операція.
+    def is_table(self, table_name):
+        return self.relkinds.get(table_name.lower(), 'r') in TABLE_RELKINDS
+
+    # Чи є індекс, що починається з цього стовпця (лише такий індекс
+    # допомагає пошуку за рівністю по стовпцю).
+    def is_indexed(self, table_name, column):
+        return column in self.indexed_columns.get(table_name.lower(), set())
+
+    # Повертає (таблиця, стовпець, оголошений) для зовнішнього ключа. Якщо
+    # обмеження FOREIGN KEY немає, ціль вгадується за назвою стовпця
+    # (<таблиця>_id) і позначається як неоголошена.
+    def reference(self, table_name, column):
+        table_name = table_name.lower()
+        declared = self.foreign_keys.get(table_name, {}).get(column)
+        if declared is not None:
+            return declared[0], declared[1], True
+
+        if column.endswith('_id') and column != self.primary_key(table_name):
+            guessed_table = column[:-3]
+            if guessed_table in self.columns:
+                return guessed_table, f'{guessed_table}_id', False
+        return None
+
+    # Розбиває таблиці на рівні так, що кожна таблиця йде після всіх таблиць,
+    # на які посилається. Таблиці одного рівня не залежать одна від одної.
+    # Подання і зовнішні таблиці пропускаються.
+    def dependency_levels(self, tables):
+        tables = {table.lower() for table in tables if self.is_table(table)}
+        remaining = {}
+        for table in tables:
+            parents = set()
+            for column, _ in self.table_columns(table):
+                reference = self.reference(table, column)
+                if reference is not None and reference[0] != table and reference[0] in tables:
+                    parents.add(reference[0])
+            remaining[table] = parents
+
+        levels = []
+        done = set()
+        while remaining:
+            level = sorted(table for table, parents in remaining.items() if parents <= done)
+            if not level:
+                raise ValueError(f"Циклічні залежності між таблицями: {', '.join(sorted(remaining))}.")
+            for table in level:
+                del remaining[table]
+            done.update(level)
+            levels.append(level)
+        return levels
@@ -0,0 +1,51 @@
+import bz2
+import csv
+import gzip
+import io
+import json
+import lzma
+
+EXPORT_FORMATS = ('csv', 'jsonl')
+EXPORT_BUFFER_SIZE = 1 << 20
+COMPRESSORS = {'gzip': gzip.open, 'bz2': bz2.open, 'xz': lzma.open}
+COMPRESSION_SUFFIXES = {'.gz': 'gzip', '.bz2': 'bz2', '.xz': 'xz'}
+
+
+# Відкриває файл для експорту як бінарний потік. Якщо стиснення не вказано,
+# воно визначається за розширенням файлу (.gz, .bz2, .xz).
+def open_export(file_path, compression=None):
+    if compression is None:
+        compression = next(
+            (name for suffix, name in COMPRESSION_SUFFIXES.items() if file_path.endswith(suffix)), None
+        )
+    if compression is None:
+        # COPY TO віддає дані порядково, тож великий буфер зменшує кількість записів на диск.
+        return open(file_path, 'wb', buffering=EXPORT_BUFFER_SIZE)
+    if compression not in COMPRESSORS:
+        raise ValueError(f"Непідтримуваний формат стиснення {compression}.")
+    return COMPRESSORS[compression](file_path, 'wb')
+
+
+def json_value(value):
+    return value.isoformat() if hasattr(value, 'isoformat') else str(value)
+
+
+# Записує порції рядків (напр. Result.partitions) у бінарний потік як CSV
+# із заголовком або як JSON Lines. У пам'яті одночасно лише одна порція.
+def write_rows(output, file_format, columns, chunks):
+    count = 0
+    with io.TextIOWrapper(output, encoding='utf-8', newline='') as text:
+        if file_format == 'jsonl':
+            for chunk in chunks:
+                text.write(''.join(
+                    json.dumps(dict(zip(columns, row)), ensure_ascii=False, default=json_value) + '\n'
+                    for row in chunk
+                ))
+                count += len(chunk)
+        else:
+            writer = csv.writer(text, lineterminator='\n')
+            writer.writerow(columns)
+            for chunk in chunks:
+                writer.writerows(chunk)
+                count += len(chunk)
+    return count
@@ -0,0 +1,56 @@
+# SQL-вирази для серверної генерації даних. Спільні для синхронних Model
+# (rgr і lab2) і асинхронної AsyncModel.
+
+
+# base_date фіксує точку відліку дат замість поточного дня (генерація з seed).
+def value_expression(column_name, column_type, base_date=None):
+    today = f"DATE '{base_date.isoformat()}'" if base_date else 'current_date'
+    now = f"TIMESTAMPTZ '{base_date.isoformat()} 00:00:00+00'" if base_date else 'NOW()'
+    if column_type == 'integer':
+        if column_name.lower() == 'year':
+            return '(2000 + FLOOR(RANDOM() * 100))'
+        return 'FLOOR(RANDOM() * 100 + 1)'
+    if column_type in ['character varying', 'varchar']:
+        return f"'Random {column_name} ' || substr(md5(random()::text), 1, 5)"
+    if column_type == 'date':
+        if column_name == 'end_date':
+            return f"{today} + (FLOOR(RANDOM() * 365))::int"
+        return f"{today} - (FLOOR(RANDOM() * 365))::int"
+    if column_type == 'timestamp with time zone':
+        if column_name == 'end_date':
+            return f"{now} + (FLOOR(RANDOM() * 365) || ' days')::interval"
+        return f"{now} - (FLOOR(RANDOM() * 365) || ' days')::interval"
+    return 'NULL'
+
+
+# Якщо задано base_date, результат відтворюваний після setseed(): дати
+# рахуються від неї, а ключі батьківських таблиць упорядковуються, тож
+# вибір не залежить від порядку рядків на сервері.
+def bulk_insert_query(catalog, table_name, count, columns_info, id_column, first_id, base_date=None):
+    column_names = []
+    expressions = []
+    key_sets = []
+    for column_name, column_type in columns_info:
+        reference = catalog.reference(table_name, column_name)
+        if column_name == id_column:
+            expressions.append(f'{int(first_id)} + g')
+        elif reference is not None:
+            related_table_name, related_column, _ = reference
+            # Ключі батьківської таблиці збираються в масив один раз, а кожен
+            # рядок бере випадковий елемент - без сортування таблиці на рядок.
+            key_set = f'fk_{len(key_sets)}'
+            order = f' ORDER BY {related_column}' if base_date else ''
+            key_sets.append(
+                f"{key_set} AS (SELECT array_agg({related_column}{order}) AS keys FROM {related_table_name})"
+            )
+            expressions.append(f"{key_set}.keys[1 + FLOOR(RANDOM() * cardinality({key_set}.keys))::int]")
+        else:
+            expressions.append(value_expression(column_name, column_type, base_date))
+        column_names.append(column_name)
+
+    with_clause = f"WITH {', '.join(key_sets)} " if key_sets else ''
+    joins = ''.join(f' CROSS JOIN fk_{index}' for index in range(len(key_sets)))
+    return (
+        f"INSERT INTO {table_name} ({', '.join(column_names)}) "
+        f"{with_clause}SELECT {', '.join(expressions)} FROM generate_series(1, {int(count)}) AS g{joins}"
+    )
@@ -0,0 +1,130 @@
+import threading
+
+ID_BLOCK_SIZE = 1000
+
+
+# Видає ідентифікатори для таблиць без автоінкременту за схемою hi-lo:
+# послідовність <таблиця>_id_block рахує блоки по block_size id, тож один
+# nextval резервує цілий блок, а паралельні записувачі (також з інших
+# процесів) отримують блоки, що не перетинаються. Невикористаний залишок
+# блоку зберігається і видається наступним викликам.
+# Діапазони повертаються як (first_id, count): id від first_id + 1 до
+# first_id + count, як і first_id у generate_data.
+class IdAllocator:
+    def __init__(self, block_size=ID_BLOCK_SIZE):
+        self.block_size = block_size
+        self.lock = threading.Lock()
+        self.prepared = set()
+        self.spare = {}
+
+    @staticmethod
+    def sequence_name(table_name):
+        return f'{table_name.lower()}_id_block'
+
+    def is_prepared(self, table_name):
+        return table_name.lower() in self.prepared
+
+    # Створює послідовність і підтягує її за MAX(id), щоб нові блоки
+    # починались після наявних рядків. Значення лише збільшується, тож
+    # повторна підготовка не видасть уже зарезервований блок вдруге.
+    def prepare(self, cursor, table_name, id_column):
+        lock, create, state = self.prepare_queries(table_name, id_column)
+        cursor.execute(lock)
+        cursor.execute(create)
+        cursor.execute(state)
+        value = self.sync_value(*cursor.fetchone())
+        if value is not None:
+            cursor.execute(self.setval_query(table_name, value))
+
+    # Запити prepare без параметрів, тож їх виконує і AsyncModel через asyncpg.
+    # Останній повертає (MAX(id), last_value, is_called).
+    def prepare_queries(self, table_name, id_column):
+        sequence = self.sequence_name(table_name)
+        return (
+            f"SELECT pg_advisory_xact_lock(hashtext('{sequence}'))",
+            f'CREATE SEQUENCE IF NOT EXISTS {sequence} MINVALUE 0 START 0',
+            f'SELECT (SELECT COALESCE(MAX({id_column}), 0) FROM {table_name}), last_value, is_called FROM {sequence}',
+        )
+
+    # Значення для setval (з is_called = true), після якого nextval видасть
+    # перший блок за MAX(id), або None, якщо послідовність уже не позаду.
+    # Свіжа послідовність (is_called = false) ще видасть сам last_value.
+    def sync_value(self, max_id, last_value, is_called):
+        block = first_free_block(max_id, self.block_size)
+        if block > last_value + int(is_called):
+            return block - 1
+        return None
+
+    def setval_query(self, table_name, value):
+        return f"SELECT setval('{self.sequence_name(table_name)}', {int(value)})"
+
+    def nextval_query(self, table_name, blocks):
+        return f"SELECT nextval('{self.sequence_name(table_name)}') FROM generate_series(1, {int(blocks)}) ORDER BY 1"
+
+    # Викликається після фіксації prepare: далі блоки беруться без звернення до MAX.
+    def mark_prepared(self, tables):
+        with self.lock:
+            self.prepared.update(table_name.lower() for table_name in tables)
+
+    def reserve(self, cursor, table_name, count):
+        with self.lock:
+            blocks = []
+            missing = self.missing_blocks(table_name, count)
+            if missing:
+                cursor.execute(self.nextval_query(table_name, missing))
+                blocks = [block for (block,) in cursor.fetchall()]
+            return self.take(table_name, count, blocks)
+
+    # Скільки нових блоків потрібно понад відкладений залишок.
+    def missing_blocks(self, table_name, count):
+        _, spare_count = self.spare.get(table_name.lower(), (0, 0))
+        return max(0, -(-(count - spare_count) // self.block_size))
+
+    # Складає count id із залишку і щойно отриманих блоків, надлишок
+    # останнього діапазону відкладається для наступного виклику.
+    def take(self, table_name, count, blocks):
+        table_name = table_name.lower()
+        ranges = []
+        spare_first, spare_count = self.spare.pop(table_name, (0, 0))
+        if spare_count:
+            ranges.append((spare_first, spare_count))
+        for block in blocks:
+            first_id = block * self.block_size
+            if ranges and sum(ranges[-1]) == first_id:
+                ranges[-1] = (ranges[-1][0], ranges[-1][1] + self.block_size)
+            else:
+                ranges.append((first_id, self.block_size))
+
+        reserved = []
+        for first_id, size in ranges:
+            taken = min(size, count)
+            if taken:
+                reserved.append((first_id, taken))
+                count -= taken
+            if size > taken:
+                self.spare[table_name] = (first_id + taken, size - taken)
+        if count:
+            raise ValueError(f"Недостатньо зарезервованих ідентифікаторів для таблиці {table_name}.")
+        return reserved
+
+    # Явно вставлені чи змінені id могли вийти за межі послідовності, тож
+    # таблиця буде підготовлена заново перед наступним резервуванням.
+    def forget(self, table_name):
+        with self.lock:
+            self.prepared.discard(table_name.lower())
+            self.spare.pop(table_name.lower(), None)
+
+    def clear(self):
+        with self.lock:
+            self.prepared.clear()
+            self.spare.clear()
+
+
+# Номер першого блоку, усі id якого більші за max_id.
+def first_free_block(max_id, block_size=ID_BLOCK_SIZE):
+    return -(-max_id // block_size)
+
+
+def identifiers(ranges):
+    for first_id, count in ranges:
+        yield from range(first_id + 1, first_id + count + 1)
@@ -0,0 +1,146 @@
+import json
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from psycopg2.extensions import cursor
+
+LATENCY_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+SLOW_STATEMENTS_LIMIT = 10
+
+# Відбиток запиту: літерали і числа замінюються на ?, списки значень
+# згортаються, тож запити, що відрізняються лише параметрами, збігаються.
+FINGERPRINT_PATTERNS = (
+    (re.compile(r"'(?:[^']|'')*'"), '?'),
+    (re.compile(r'(?<![\w$])-?\d+(?:\.\d+)?\b'), '?'),
+    (re.compile(r'%s|%\(\w+\)s'), '?'),
+    (re.compile(r'\s+'), ' '),
+    (re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)'), '(...)'),
+    (re.compile(r'\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+'), '(...)'),
+)
+
+
+def fingerprint(statement):
+    if isinstance(statement, bytes):
+        statement = statement.decode('utf-8', 'replace')
+    for pattern, replacement in FINGERPRINT_PATTERNS:
+        statement = pattern.sub(replacement, statement)
+    return statement.strip()
+
+
+def bucket_label(index):
+    if index < len(LATENCY_BUCKETS_MS):
+        return f'<={LATENCY_BUCKETS_MS[index]}ms'
+    return f'>{LATENCY_BUCKETS_MS[-1]}ms'
+
+
+# Збирає тривалість, кількість рядків і помилки кожного запиту. Операція
+# (метод Model) визначається для потоку, тож паралельні виклики не змішуються.
+class QueryRecorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.statements = {}
+        self.histograms = {}
+
+    @contextmanager
+    def operation(self, name):
+        previous = getattr(self.local, 'operation', None)
+        self.local.operation = name
+        try:
+            yield
+        finally:
+            self.local.operation = previous
+
+    def record(self, statement, duration, rows=None, error=None):
+        operation = getattr(self.local, 'operation', None) or 'other'
+        duration_ms = duration * 1000
+        bucket = len(LATENCY_BUCKETS_MS)
+        for index, bound in enumerate(LATENCY_BUCKETS_MS):
+            if duration_ms <= bound:
+                bucket = index
+                break
+
+        key = (operation, fingerprint(statement))
+        with self.lock:
+            stats = self.statements.get(key)
+            if stats is None:
+                stats = self.statements[key] = {
+                    'operation': operation, 'statement': key[1], 'calls': 0, 'total_ms': 0.0,
+                    'max_ms': 0.0, 'rows': 0, 'errors': 0, 'last_error': None,
+                }
+            stats['calls'] += 1
+            stats['total_ms'] += duration_ms
+            stats['max_ms'] = max(stats['max_ms'], duration_ms)
+            if rows is not None and rows >= 0:
+                stats['rows'] += rows
+            if error is not None:
+                stats['errors'] += 1
+                stats['last_error'] = error
+
+            histogram = self.histograms.get(operation)
+            if histogram is None:
+                histogram = self.histograms[operation] = {
+                    'calls': 0, 'total_ms': 0.0, 'buckets': [0] * (len(LATENCY_BUCKETS_MS) + 1),
+                }
+            histogram['calls'] += 1
+            histogram['total_ms'] += duration_ms
+            histogram['buckets'][bucket] += 1
+
+    def slowest(self, limit=SLOW_STATEMENTS_LIMIT):
+        with self.lock:
+            statements = [dict(stats) for stats in self.statements.values()]
+        statements.sort(key=lambda stats: stats['total_ms'], reverse=True)
+        for stats in statements:
+            stats['mean_ms'] = stats['total_ms'] / stats['calls']
+        return statements[:limit]
+
+    def latency_histograms(self):
+        with self.lock:
+            return {
+                operation: {
+                    'calls': histogram['calls'],
+                    'total_ms': histogram['total_ms'],
+                    'buckets': {bucket_label(index): count for index, count in enumerate(histogram['buckets'])},
+                }
+                for operation, histogram in sorted(self.histograms.items())
+            }
+
+    def export_json(self, file_path):
+        report = {
+            'exported_at': datetime.now(timezone.utc).isoformat(),
+            'histograms': self.latency_histograms(),
+            'statements': self.slowest(limit=None),
+        }
+        with open(file_path, 'w', encoding='utf-8') as output_file:
+            json.dump(report, output_file, ensure_ascii=False, indent=2)
+        return len(report['statements'])
+
+
+# Курсор, що передає кожен execute/executemany/copy_expert у recorder
+# з'єднання. Без recorder курсор поводиться як звичайний.
+class InstrumentedCursor(cursor):
+    def execute(self, query, vars=None, statement=None):
+        return self._timed(statement or query, super().execute, query, vars)
+
+    def executemany(self, query, vars_list):
+        return self._timed(query, super().executemany, query, vars_list)
+
+    def copy_expert(self, sql, file, size=8192):
+        return self._timed(sql, super().copy_expert, sql, file, size)
+
+    def _timed(self, statement, call, *args):
+        recorder = getattr(self.connection, 'recorder', None)
+        if recorder is None:
+            return call(*args)
+
+        started = time.perf_counter()
+        try:
+            result = call(*args)
+        except Exception as e:
+            recorder.record(statement, time.perf_counter() - started, error=f'{type(e).__name__}: {e}'.strip())
+            raise
+        recorder.record(statement, time.perf_counter() - started, self.rowcount)
+        return result
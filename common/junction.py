@@ -0,0 +1,132 @@
+import io
+import itertools
+import random
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .sampler import ForeignKeySampler
+
+PAIR_DISTRIBUTIONS = ('uniform', 'zipf')
+ZIPF_SKEW = 1.1
+PAIR_OVERSAMPLING = 1.25
+PAIR_ROUNDS = 50
+
+
+# Таблиця зв'язку багато-до-багатьох: крім первинного ключа має рівно два
+# стовпці, і обидва - зовнішні ключі. Повертає [(стовпець, таблиця, ключ)].
+def junction_references(catalog, table_name):
+    id_column = catalog.primary_key(table_name)
+    references = []
+    for column, _ in catalog.table_columns(table_name):
+        if column == id_column:
+            continue
+        reference = catalog.reference(table_name, column)
+        if reference is None:
+            return None
+        references.append((column, reference[0], reference[1]))
+    return references if len(references) == 2 else None
+
+
+# Генерує унікальні пари (ліва, права) для таблиці зв'язку. Пара кодується
+# одним числом left_index * len(right) + right_index, тож кандидати
+# тягнуться масивами, дублікати і вже наявні в таблиці пари відкидаються
+# одним np.unique/np.isin на порцію. При розподілі zipf імовірність ключа
+# спадає як 1 / ранг^skew (ранги перемішані), тож кілька дослідників мають
+# багато зв'язків, а кілька проєктів - багато учасників.
+class PairGenerator:
+    def __init__(self, cursor, table_name, references, distribution='uniform', skew=ZIPF_SKEW, seed=None):
+        if distribution not in PAIR_DISTRIBUTIONS:
+            raise ValueError(f"Непідтримуваний розподіл {distribution}.")
+        (left_column, left_table, left_key), (right_column, right_table, right_key) = references
+        self.columns = (left_column, right_column)
+        self.generator = np.random.default_rng(seed) if np is not None else random.Random(seed)
+        self.left = self._keys(cursor, left_table, left_key, seed)
+        self.right = self._keys(cursor, right_table, right_key, seed)
+        self.left_weights = self._weights(len(self.left), distribution, skew)
+        self.right_weights = self._weights(len(self.right), distribution, skew)
+        self.taken = self._existing_codes(cursor, table_name, left_column, right_column)
+
+    # Ключі впорядковані і без повторів: індекс ключа - його позиція.
+    def _keys(self, cursor, table_name, column, seed):
+        keys = ForeignKeySampler(cursor, table_name, column, seed=seed).keys
+        if np is not None:
+            return np.unique(keys)
+        return sorted(set(keys))
+
+    def _weights(self, size, distribution, skew):
+        if distribution == 'uniform':
+            return None
+        if np is not None:
+            weights = (self.generator.permutation(size) + 1.0) ** -skew
+            return weights / weights.sum()
+        ranks = list(range(1, size + 1))
+        self.generator.shuffle(ranks)
+        return list(itertools.accumulate(rank ** -skew for rank in ranks))
+
+    def _existing_codes(self, cursor, table_name, left_column, right_column):
+        buffer = io.BytesIO()
+        cursor.copy_expert(f"COPY (SELECT {left_column}, {right_column} FROM {table_name}) TO STDOUT", buffer)
+        values = list(map(int, buffer.getvalue().split()))
+        lefts, rights = values[0::2], values[1::2]
+        if np is None:
+            left_index = {key: index for index, key in enumerate(self.left)}
+            right_index = {key: index for index, key in enumerate(self.right)}
+            return {
+                left_index[left] * len(self.right) + right_index[right]
+                for left, right in zip(lefts, rights) if left in left_index and right in right_index
+            }
+
+        lefts = np.asarray(lefts, dtype=np.int64)
+        rights = np.asarray(rights, dtype=np.int64)
+        left_positions = np.searchsorted(self.left, lefts).clip(max=len(self.left) - 1)
+        right_positions = np.searchsorted(self.right, rights).clip(max=len(self.right) - 1)
+        known = (self.left[left_positions] == lefts) & (self.right[right_positions] == rights)
+        return np.unique(left_positions[known] * len(self.right) + right_positions[known])
+
+    def capacity(self):
+        return len(self.left) * len(self.right) - len(self.taken)
+
+    # Повертає (ліві ключі, праві ключі) для count нових різних пар.
+    def draw(self, count):
+        if count > self.capacity():
+            raise ValueError(f"Можна згенерувати лише {self.capacity()} нових унікальних пар.")
+        if count <= 0:
+            return [], []
+        codes = self._draw_codes(count)
+        width = len(self.right)
+        if np is not None:
+            return self.left[codes // width].tolist(), self.right[codes % width].tolist()
+        return [self.left[code // width] for code in codes], [self.right[code % width] for code in codes]
+
+    def _draw_codes(self, count):
+        width = len(self.right)
+        drawn = []
+        rounds = 0
+        while count > 0:
+            rounds += 1
+            if rounds > PAIR_ROUNDS:
+                raise ValueError("Не вдалося набрати потрібну кількість унікальних пар за заданого розподілу.")
+            size = int(count * PAIR_OVERSAMPLING) + 16
+            if np is not None:
+                lefts = self.generator.choice(len(self.left), size=size, p=self.left_weights)
+                rights = self.generator.choice(width, size=size, p=self.right_weights)
+                candidates = np.unique(lefts * width + rights)
+                candidates = candidates[~np.isin(candidates, self.taken, assume_unique=True)]
+                # Перемішування перед обрізанням, щоб не віддавати перевагу малим кодам.
+                candidates = self.generator.permutation(candidates)[:count]
+                self.taken = np.union1d(self.taken, candidates)
+                drawn.append(candidates)
+            else:
+                lefts = self.generator.choices(range(len(self.left)), cum_weights=self.left_weights, k=size)
+                rights = self.generator.choices(range(width), cum_weights=self.right_weights, k=size)
+                candidates = []
+                for code in (left * width + right for left, right in zip(lefts, rights)):
+                    if code not in self.taken and len(candidates) < count:
+                        self.taken.add(code)
+                        candidates.append(code)
+                drawn.extend(candidates)
+            count -= len(candidates)
+        return np.concatenate(drawn) if np is not None else drawn
@@ -0,0 +1,41 @@
+import csv
+import io
+
+ROWS_PER_CHUNK = 1000
+
+
+# Файлоподібний об'єкт для copy_expert: рядки генератора кодуються у CSV
+# порціями, тож у пам'яті одночасно тримається лише одна порція.
+class CopyStream(io.TextIOBase):
+    def __init__(self, rows):
+        self.rows = iter(rows)
+        self.count = 0
+        self.pending = ''
+        self.encoded = io.StringIO()
+        self.writer = csv.writer(self.encoded, lineterminator='\n')
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        while size < 0 or len(self.pending) < size:
+            chunk = self._next_chunk()
+            if not chunk:
+                break
+            self.pending += chunk
+
+        if size < 0:
+            size = len(self.pending)
+        data, self.pending = self.pending[:size], self.pending[size:]
+        return data
+
+    def _next_chunk(self):
+        self.encoded.seek(0)
+        self.encoded.truncate()
+        for _ in range(ROWS_PER_CHUNK):
+            row = next(self.rows, None)
+            if row is None:
+                break
+            self.writer.writerow(row)
+            self.count += 1
+        return self.encoded.getvalue()
@@ -0,0 +1,102 @@
+import itertools
+import os
+import shlex
+import subprocess
+import sys
+from datetime import date, datetime
+from decimal import Decimal
+
+SAMPLE_ROWS = 200
+MAX_COLUMN_WIDTH = 60
+RENDER_CHUNK_SIZE = 1 << 16
+COLUMN_SEPARATOR = ' | '
+NULL_TEXT = 'NULL'
+DEFAULT_PAGER = 'less -SRFX'
+
+
+def format_value(value):
+    if value is None:
+        return NULL_TEXT
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ')
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+# Виводить рядки таблицею з вирівняними стовпцями. Ширини рахуються за
+# першими sample_rows рядками (не більше max_width), тож результат не
+# накопичується в пам'яті: рядки форматуються по мірі надходження і
+# записуються порціями по chunk_size символів. Довші за ширину значення
+# не обрізаються, а лише зсувають решту рядка.
+class TableRenderer:
+    def __init__(self, output, sample_rows=SAMPLE_ROWS, max_width=MAX_COLUMN_WIDTH, chunk_size=RENDER_CHUNK_SIZE):
+        self.output = output
+        self.sample_rows = sample_rows
+        self.max_width = max_width
+        self.chunk_size = chunk_size
+
+    # Повертає кількість виведених рядків.
+    def render(self, rows):
+        rows = iter(rows)
+        sample = [tuple(row) for row in itertools.islice(rows, self.sample_rows)]
+        if not sample:
+            return 0
+
+        width_count = max(len(row) for row in sample)
+        widths = [0] * width_count
+        numeric = [True] * width_count
+        for row in sample:
+            for index, value in enumerate(row):
+                widths[index] = max(widths[index], len(format_value(value)))
+                if value is not None and not isinstance(value, (int, float, Decimal)):
+                    numeric[index] = False
+        widths = [min(width, self.max_width) for width in widths]
+
+        count = 0
+        buffered = 0
+        chunk = []
+        for row in itertools.chain(sample, rows):
+            cells = []
+            for index, value in enumerate(row):
+                text = format_value(value)
+                if index < width_count:
+                    text = text.rjust(widths[index]) if numeric[index] else text.ljust(widths[index])
+                cells.append(text)
+            line = COLUMN_SEPARATOR.join(cells).rstrip() + '\n'
+            chunk.append(line)
+            buffered += len(line)
+            count += 1
+            if buffered >= self.chunk_size:
+                self.output.write(''.join(chunk))
+                chunk, buffered = [], 0
+        self.output.write(''.join(chunk))
+        self.output.flush()
+        return count
+
+
+# Відкриває пейджер ($PAGER, інакше less), у stdin якого пишеться таблиця.
+def open_pager():
+    command = shlex.split(os.environ.get('PAGER') or DEFAULT_PAGER)
+    return subprocess.Popen(command, stdin=subprocess.PIPE, text=True, encoding='utf-8')
+
+
+# Виводить рядки через пейджер і повертає їх кількість (None, якщо пейджер
+# закрили раніше). Пейджер закривається і очікується й тоді, коли читання
+# рядків впало з помилкою, щоб не лишати less, який тримає термінал.
+def page(rows):
+    pager = open_pager()
+    try:
+        return TableRenderer(pager.stdin).render(rows)
+    except BrokenPipeError:
+        return None
+    finally:
+        try:
+            pager.stdin.close()
+        except BrokenPipeError:
+            pass
+        pager.wait()
+
+
+def pager_available():
+    return sys.stdout.isatty()
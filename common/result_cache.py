@@ -0,0 +1,80 @@
+import threading
+import time
+from collections import OrderedDict
+
+RESULT_CACHE_ROWS = 200000
+RESULT_CACHE_TTL = 60.0
+
+
+# LRU-кеш результатів читання, обмежений сумарною кількістю рядків і часом
+# життя запису. Записи прив'язані до таблиці і скидаються при її зміні.
+# Версія таблиці фіксується до читання: якщо за час читання таблицю змінили,
+# застарілий результат у кеш не потрапляє.
+class ResultCache:
+    def __init__(self, max_rows=RESULT_CACHE_ROWS, ttl=RESULT_CACHE_TTL):
+        self.max_rows = max_rows
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.versions = {}
+        self.generation = 0
+        self.rows = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def version(self, table_name):
+        with self.lock:
+            return self.generation, self.versions.get(table_name.lower(), 0)
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and time.monotonic() - entry[3] > self.ttl:
+                self._discard(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    # size - кількість рядків у value, за нею рахується обмеження кешу.
+    def put(self, key, table_name, value, version, size):
+        if size > self.max_rows:
+            return
+        table_name = table_name.lower()
+        with self.lock:
+            if (self.generation, self.versions.get(table_name, 0)) != version:
+                return
+            if key in self.entries:
+                self._discard(key)
+            self.entries[key] = (table_name, value, size, time.monotonic())
+            self.rows += size
+            while self.rows > self.max_rows:
+                self._discard(next(iter(self.entries)))
+                self.evictions += 1
+
+    def invalidate(self, table_name):
+        table_name = table_name.lower()
+        with self.lock:
+            self.versions[table_name] = self.versions.get(table_name, 0) + 1
+            for key in [key for key, entry in self.entries.items() if entry[0] == table_name]:
+                self._discard(key)
+
+    def clear(self):
+        with self.lock:
+            self.generation += 1
+            self.entries.clear()
+            self.rows = 0
+
+    def _discard(self, key):
+        self.rows -= self.entries.pop(key)[2]
+
+    def stats(self):
+        with self.lock:
+            return {
+                'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'entries': len(self.entries), 'rows': self.rows,
+            }
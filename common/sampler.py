@@ -0,0 +1,50 @@
+import io
+import zlib
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+TABLESAMPLE_THRESHOLD = 1000000
+TABLESAMPLE_KEYS = 200000
+
+
+# Ключі батьківської таблиці для вибору значень зовнішнього ключа: читаються
+# одним COPY на виклик, а самі значення для рядків тягнуть ValueEngine і
+# PairGenerator. Для дуже великих таблиць читається лише TABLESAMPLE-підмножина.
+# При заданому seed вибірка береться з REPEATABLE, а ключі сортуються, тож
+# набір і порядок ключів не залежать від запуску (поки таблиця не змінилась).
+class ForeignKeySampler:
+    def __init__(self, cursor, table_name, column,
+                 sample_threshold=TABLESAMPLE_THRESHOLD, sample_keys=TABLESAMPLE_KEYS, seed=None):
+        self.table_name = table_name
+        self.column = column
+
+        cursor.execute("SELECT reltuples FROM pg_class WHERE oid = %s::regclass", (table_name,))
+        estimated_rows = cursor.fetchone()[0]
+        keys = []
+        if estimated_rows > sample_threshold:
+            percent = min(100.0, 100.0 * sample_keys / estimated_rows)
+            sample = f"TABLESAMPLE SYSTEM ({percent})"
+            if seed is not None:
+                sample += f" REPEATABLE ({zlib.crc32(f'{seed}:{table_name.lower()}'.encode())})"
+            keys = self._load_keys(cursor, f"SELECT {column} FROM {table_name} {sample}")
+        if not keys:
+            keys = self._load_keys(cursor, f"SELECT {column} FROM {table_name}")
+        if not keys:
+            raise ValueError(f"Таблиця {table_name} не містить записів для зовнішнього ключа.")
+        if seed is not None:
+            keys.sort()
+
+        self.keys = np.asarray(keys, dtype=np.int64) if np is not None else keys
+
+    def _load_keys(self, cursor, query):
+        buffer = io.BytesIO()
+        cursor.copy_expert(f"COPY ({query}) TO STDOUT", buffer)
+        return list(map(int, buffer.getvalue().split()))
+
+    def sorted_keys(self):
+        if np is not None:
+            return np.sort(self.keys)
+        return sorted(self.keys)
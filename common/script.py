@@ -0,0 +1,126 @@
+import json
+import sys
+import time
+
+SCRIPT_BATCH_SIZE = 500
+
+
+# Виконує файл операцій без діалогу: кожен непорожній рядок - JSON-об'єкт
+# з полем "op" (insert, update, delete, generate, view), напр.
+#   {"op": "insert", "table": "researcher", "columns": ["researcher_id", "email"], "values": ["7", "a@b.c"]}
+#   {"op": "update", "table": "researcher", "column": "email", "id": 7, "value": "x@y.z"}
+#   {"op": "delete", "table": "researcher", "id": 7}
+#   {"op": "generate", "table": "experiment", "count": 1000, "mode": "bulk"}
+#   {"op": "view", "table": "research_project"}
+# Операції групуються в транзакції по batch_size, кожна операція - у власній
+# точці збереження, тож помилкова операція не скасовує решту пакета.
+class ScriptRunner:
+    def __init__(self, model, output, batch_size=SCRIPT_BATCH_SIZE):
+        self.model = model
+        self.output = output
+        self.batch_size = batch_size
+        self.operations = {
+            'insert': self.insert,
+            'update': self.update,
+            'delete': self.delete,
+            'generate': self.generate,
+            'view': self.view,
+        }
+
+    def run(self, lines):
+        started = time.perf_counter()
+        succeeded = failed = 0
+        batch = []
+        for line_number, line in enumerate(lines, start=1):
+            if line.strip():
+                batch.append((line_number, line))
+            if len(batch) == self.batch_size:
+                ok, errors = self.run_batch(batch)
+                succeeded, failed, batch = succeeded + ok, failed + errors, []
+        if batch:
+            ok, errors = self.run_batch(batch)
+            succeeded, failed = succeeded + ok, failed + errors
+        return succeeded, failed, time.perf_counter() - started
+
+    # Статуси операцій виводяться лише після фіксації пакета: якщо COMMIT не
+    # вдався, жодна операція пакета не збереглася і всі вони - помилкові.
+    # Рядки view виводяться одразу, щоб не накопичувати їх у пам'яті.
+    def run_batch(self, batch):
+        records = []
+        try:
+            with self.model.transaction():
+                for line_number, line in batch:
+                    try:
+                        result = self.execute(line_number, line)
+                        records.append({'line': line_number, 'status': 'ok', **result})
+                    except Exception as e:
+                        records.append({'line': line_number, 'status': 'error', 'error': str(e)})
+        except Exception as e:
+            errors = {record['line']: record for record in records if record['status'] == 'error'}
+            records = [
+                errors.get(line_number, {'line': line_number, 'status': 'error',
+                                         'error': f"Пакет операцій не зафіксовано: {e}"})
+                for line_number, _ in batch
+            ]
+
+        for record in records:
+            self.emit(record)
+        succeeded = sum(1 for record in records if record['status'] == 'ok')
+        return succeeded, len(records) - succeeded
+
+    def execute(self, line_number, line):
+        try:
+            operation = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Рядок не є коректним JSON: {e}")
+
+        action = self.operations.get(operation.get('op'))
+        if action is None:
+            raise ValueError(f"Невідома операція {operation.get('op')}.")
+        try:
+            return action(line_number, operation)
+        except KeyError as e:
+            raise ValueError(f"Для операції {operation['op']} не вказано поле {e}.")
+
+    def insert(self, line_number, operation):
+        self.model.insert_data(operation['table'], operation['columns'], operation['values'])
+        return {'op': 'insert'}
+
+    def update(self, line_number, operation):
+        self.model.update_data(operation['table'], operation['column'], operation['id'], operation['value'])
+        return {'op': 'update'}
+
+    def delete(self, line_number, operation):
+        self.model.delete_data(operation['table'], operation['id'])
+        return {'op': 'delete'}
+
+    def generate(self, line_number, operation):
+        rate = self.model.generate_data(operation['table'], int(operation['count']), operation.get('mode', 'bulk'))
+        return {'op': 'generate', 'count': int(operation['count']), 'rate': round(rate)}
+
+    # Рядки таблиці виводяться по одному, не накопичуючись у пам'яті.
+    def view(self, line_number, operation):
+        count = 0
+        for row in self.model.iter_table_data(operation['table']):
+            self.emit({'line': line_number, 'row': list(row)})
+            count += 1
+        return {'op': 'view', 'rows': count}
+
+    def emit(self, record):
+        self.output.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+
+
+def run_script(model, script_path, output_path=None, batch_size=SCRIPT_BATCH_SIZE):
+    output = open(output_path, 'w', encoding='utf-8') if output_path else sys.stdout
+    try:
+        with open(script_path, encoding='utf-8') as script_file:
+            succeeded, failed, elapsed = ScriptRunner(model, output, batch_size).run(script_file)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    print(
+        f"Виконано {succeeded + failed} операцій ({succeeded} успішно, {failed} з помилками) "
+        f"за {elapsed:.2f} с ({(succeeded + failed) / max(elapsed, 1e-9):.0f} операцій/с).",
+        file=sys.stderr
+    )
+    return failed == 0
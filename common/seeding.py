@@ -0,0 +1,157 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .generation import bulk_insert_query
+from .id_allocator import identifiers
+from .junction import PAIR_DISTRIBUTIONS, ZIPF_SKEW, PairGenerator, junction_references
+from .loader import CopyStream
+from .sampler import ForeignKeySampler
+
+SEED_WORKERS = 4
+
+
+# Генерація даних, спільна для Model у rgr і lab2. Модель має надати catalog,
+# ids, values, results, _prepare_identifiers, _commit, _rollback і
+# _raw_connection(operation) - контекст із psycopg2-з'єднанням.
+class SeedingMixin:
+    def generate_data(self, table_name, count, mode='row', first_id=None):
+        if not self.catalog.is_table(table_name):
+            raise ValueError(f"{table_name} не є таблицею, дані для неї не генеруються.")
+        # Для таблиць зв'язку незалежний вибір двох батьків дає повторні пари.
+        if mode != 'row' and first_id is None and junction_references(self.catalog, table_name) is not None:
+            return self.generate_pairs(table_name, count)
+        if first_id is None:
+            self._prepare_identifiers([table_name])
+
+        with self._raw_connection('generate_data') as connection:
+            cursor = connection.cursor()
+            try:
+                columns_info = self.catalog.table_columns(table_name)
+                if not columns_info:
+                    raise ValueError(f"Таблиця {table_name} не має стовпців або неправильна назва таблиці.")
+
+                id_column = self.catalog.primary_key(table_name)
+                if id_column is None:
+                    raise ValueError(f"Таблиця {table_name} не має первинного ключа.")
+
+                started = time.perf_counter()
+                if first_id is None:
+                    id_ranges = self.ids.reserve(cursor, table_name, count)
+                else:
+                    id_ranges = [(first_id, count)]
+                if mode == 'bulk':
+                    self._generate_bulk(cursor, table_name, columns_info, id_column, id_ranges)
+                elif mode == 'copy':
+                    self._generate_copy(cursor, table_name, columns_info, id_column, id_ranges)
+                else:
+                    self._generate_rows(cursor, table_name, columns_info, id_column, id_ranges)
+
+                self._commit(connection)
+                self.results.invalidate(table_name)
+                return count / max(time.perf_counter() - started, 1e-9)
+            except Exception as e:
+                self._rollback(connection)
+                raise e
+
+    # Значення рядків рахує ValueEngine на клієнті, тож при заданому seed
+    # вміст таблиці відтворюється від запуску до запуску.
+    def _generate_rows(self, cursor, table_name, columns_info, id_column, id_ranges):
+        foreign_keys = self._foreign_key_sets(cursor, table_name, columns_info, id_column)
+        column_names = [column_name for column_name, _ in columns_info]
+        query = (
+            f"INSERT INTO {table_name} ({', '.join(column_names)}) "
+            f"VALUES ({', '.join(['%s'] * len(column_names))})"
+        )
+        for row in self.values.rows(table_name, columns_info, id_column, id_ranges, foreign_keys):
+            cursor.execute(query, row)
+
+    # Ключі батьківських таблиць відсортовані, щоб вибір за seed не залежав
+    # від порядку, у якому сервер віддав рядки.
+    def _foreign_key_sets(self, cursor, table_name, columns_info, id_column):
+        foreign_keys = {}
+        for column_name, _ in columns_info:
+            reference = self.catalog.reference(table_name, column_name)
+            if column_name != id_column and reference is not None:
+                related_table_name, related_column, _ = reference
+                sampler = ForeignKeySampler(cursor, related_table_name, related_column, seed=self.values.seed)
+                foreign_keys[column_name] = sampler.sorted_keys()
+        return foreign_keys
+
+    # Зарезервовані блоки зазвичай суміжні, тож це один INSERT.
+    def _generate_bulk(self, cursor, table_name, columns_info, id_column, id_ranges):
+        base_date = self.values.server_base_date()
+        for first_id, count in id_ranges:
+            seed = self.values.server_seed(table_name, first_id)
+            if seed is not None:
+                cursor.execute('SELECT setseed(%s)', (seed,))
+            cursor.execute(
+                bulk_insert_query(self.catalog, table_name, count, columns_info, id_column, first_id, base_date)
+            )
+
+    def _generate_copy(self, cursor, table_name, columns_info, id_column, id_ranges):
+        foreign_keys = self._foreign_key_sets(cursor, table_name, columns_info, id_column)
+        rows = self.values.rows(table_name, columns_info, id_column, id_ranges, foreign_keys)
+        self._copy(cursor, table_name, [column_name for column_name, _ in columns_info], CopyStream(rows))
+
+    # Заповнює таблицю зв'язку count новими парами, яких ще немає в таблиці.
+    # Пари тягнуться масивами на клієнті і завантажуються одним COPY.
+    def generate_pairs(self, table_name, count, distribution='uniform', skew=ZIPF_SKEW, seed=None):
+        if distribution not in PAIR_DISTRIBUTIONS:
+            raise ValueError(f"Непідтримуваний розподіл {distribution}.")
+        references = junction_references(self.catalog, table_name)
+        if references is None:
+            raise ValueError(f"Таблиця {table_name} не є таблицею зв'язку багато-до-багатьох.")
+        id_column = self.catalog.primary_key(table_name)
+        self._prepare_identifiers([table_name])
+
+        with self._raw_connection('generate_pairs') as connection:
+            cursor = connection.cursor()
+            try:
+                started = time.perf_counter()
+                if seed is None:
+                    seed = self.values.seed
+                pairs = PairGenerator(cursor, table_name, references, distribution, skew, seed)
+                lefts, rights = pairs.draw(count)
+                row_ids = identifiers(self.ids.reserve(cursor, table_name, len(lefts)))
+                self._copy(cursor, table_name, [id_column, *pairs.columns], CopyStream(zip(row_ids, lefts, rights)))
+                self._commit(connection)
+                self.results.invalidate(table_name)
+                return count / max(time.perf_counter() - started, 1e-9)
+            except Exception as e:
+                self._rollback(connection)
+                raise e
+
+    def seed_schema(self, counts, mode='bulk', workers=SEED_WORKERS):
+        counts = {table.lower(): count for table, count in counts.items() if count > 0}
+        started = time.perf_counter()
+        total = 0
+        # Рівні виконуються по черзі, щоб батьківські ключі вже існували;
+        # таблиці одного рівня і частини однієї таблиці генеруються паралельно,
+        # кожна частина резервує власні блоки id.
+        for level in self.catalog.dependency_levels(counts):
+            self._prepare_identifiers(level)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = []
+                for table_name in level:
+                    count = counts[table_name]
+                    # Унікальність пар перевіряється в межах одного виклику, тож
+                    # таблиця зв'язку генерується однією частиною.
+                    if junction_references(self.catalog, table_name) is not None:
+                        chunk_size = count
+                    else:
+                        chunk_size = -(-count // workers)
+                    for offset in range(0, count, chunk_size):
+                        futures.append(executor.submit(
+                            self.generate_data, table_name, min(chunk_size, count - offset), mode
+                        ))
+                for future in futures:
+                    future.result()
+            total += sum(counts[table_name] for table_name in level)
+
+        return total, total / max(time.perf_counter() - started, 1e-9)
+
+    def _copy(self, cursor, table_name, columns, stream, header=False):
+        options = 'FORMAT csv, HEADER true' if header else 'FORMAT csv'
+        cursor.copy_expert(
+            f"COPY {table_name} ({', '.join(columns)}) FROM STDIN WITH ({options})", stream
+        )
@@ -0,0 +1,152 @@
+import random
+import zlib
+from datetime import date, datetime, time, timedelta, timezone
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+VALUE_CHUNK_ROWS = 1000
+SEEDED_BASE_DATE = date(2024, 1, 1)
+DATE_SPAN_DAYS = 365
+
+
+# Клієнтська генерація значень стовпців за тими ж правилами, що й
+# value_expression: year - 2000..2099, інші integer - 1..100, varchar -
+# "Random <стовпець> <5 hex>", date і timestamptz - до року до базової дати
+# (end_date - після неї). Значення рахуються порціями по VALUE_CHUNK_ROWS
+# рядків, прив'язаними до id: генератор порції k таблиці t створюється з
+# SeedSequence(seed, spawn_key=(t, k)), тож при тому самому seed кожен рядок
+# отримує ті самі значення незалежно від того, який потік чи процес і в
+# якому порядку його генерує. Без seed базова дата - сьогодні, як і раніше.
+# overrides: {'стовпець' або 'таблиця.стовпець': значення}, де значення -
+# функція (generator, count) -> масив, список варіантів для вибору або константа.
+class ValueEngine:
+    def __init__(self, seed=None, base_date=None, overrides=None, chunk_rows=VALUE_CHUNK_ROWS):
+        self.seed = seed
+        self.base_date = base_date or (SEEDED_BASE_DATE if seed is not None else date.today())
+        self.overrides = dict(overrides or {})
+        self.chunk_rows = chunk_rows
+        if np is not None:
+            self.entropy = np.random.SeedSequence(seed).entropy
+
+    # Для серверної генерації (bulk), де значення дає RANDOM(): аргумент
+    # setseed() для діапазону id після first_id, у межах [-1, 1]. Той самий
+    # seed і ті самі діапазони дають ті самі рядки, хоч і не ті, що в
+    # режимах row і copy. Без seed повертає None.
+    def server_seed(self, table_name, first_id):
+        if self.seed is None:
+            return None
+        key = zlib.crc32(f'{self.seed}:{table_name.lower()}:{first_id}'.encode())
+        return key / 0xFFFFFFFF * 2 - 1
+
+    # Базова дата для серверної генерації: лише при seed, інакше сервер
+    # бере поточний день.
+    def server_base_date(self):
+        return self.base_date if self.seed is not None else None
+
+    def override(self, column, value, table_name=None):
+        self.overrides[f'{table_name.lower()}.{column}' if table_name else column] = value
+
+    def _generator(self, table_name, chunk):
+        table_key = zlib.crc32(table_name.lower().encode())
+        if np is not None:
+            return np.random.default_rng(np.random.SeedSequence(self.entropy, spawn_key=(table_key, chunk)))
+        if self.seed is None:
+            return random.Random()
+        return random.Random(f'{self.seed}:{table_key}:{chunk}')
+
+    # Повертає {стовпець: масив значень} для рядків з id first_id + 1 ..
+    # first_id + count. foreign_keys - {стовпець: ключі батьківської таблиці}.
+    def columns(self, table_name, columns_info, first_id, count, foreign_keys=None):
+        foreign_keys = foreign_keys or {}
+        batches = {column_name: [] for column_name, _ in columns_info}
+        position, last = first_id, first_id + count
+        while position < last:
+            chunk = position // self.chunk_rows
+            chunk_start = chunk * self.chunk_rows
+            take = slice(position - chunk_start, min(last, chunk_start + self.chunk_rows) - chunk_start)
+            generator = self._generator(table_name, chunk)
+            for column_name, column_type in columns_info:
+                if column_name in foreign_keys:
+                    values = self._choice(generator, foreign_keys[column_name], self.chunk_rows)
+                else:
+                    values = self._values(generator, table_name, column_name, column_type, self.chunk_rows)
+                batches[column_name].append(values[take])
+            position = chunk_start + take.stop
+
+        if np is not None:
+            return {
+                column_name: np.concatenate(parts) if parts else np.empty(0)
+                for column_name, parts in batches.items()
+            }
+        return {column_name: [value for part in parts for value in part] for column_name, parts in batches.items()}
+
+    # Рядки для COPY: кортежі (id, значення...) у порядку columns_info.
+    def rows(self, table_name, columns_info, id_column, id_ranges, foreign_keys=None):
+        for first_id, count in id_ranges:
+            for offset in range(0, count, self.chunk_rows):
+                size = min(self.chunk_rows, count - offset)
+                batch = self.columns(
+                    table_name, [column for column in columns_info if column[0] != id_column],
+                    first_id + offset, size, foreign_keys
+                )
+                row_ids = range(first_id + offset + 1, first_id + offset + size + 1)
+                values = [
+                    row_ids if column_name == id_column else self._plain(batch[column_name])
+                    for column_name, _ in columns_info
+                ]
+                yield from zip(*values)
+
+    def _plain(self, values):
+        return values.tolist() if np is not None else values
+
+    def _values(self, generator, table_name, column_name, column_type, count):
+        override = self.overrides.get(f'{table_name.lower()}.{column_name}', self.overrides.get(column_name))
+        if override is not None:
+            return self._override(generator, override, count)
+
+        if column_type == 'integer':
+            if column_name.lower() == 'year':
+                return self._integers(generator, 2000, 2100, count)
+            return self._integers(generator, 1, 101, count)
+        if column_type in ['character varying', 'varchar']:
+            suffixes = self._integers(generator, 0, 1 << 20, count)
+            if np is not None:
+                return np.char.add(f'Random {column_name} ', np.char.mod('%05x', suffixes))
+            return [f'Random {column_name} {suffix:05x}' for suffix in suffixes]
+        if column_type in ['date', 'timestamp with time zone']:
+            sign = 1 if column_name == 'end_date' else -1
+            days = self._integers(generator, 0, DATE_SPAN_DAYS, count)
+            if column_type == 'date':
+                if np is not None:
+                    return np.datetime64(self.base_date, 'D') + sign * days
+                return [self.base_date + timedelta(days=sign * day) for day in days]
+            base = datetime.combine(self.base_date, time(), tzinfo=timezone.utc)
+            if np is not None:
+                # Рядки з явним UTC, щоб COPY не залежав від часового поясу сесії.
+                moments = np.datetime64(base.replace(tzinfo=None), 's') + (sign * days).astype('timedelta64[D]')
+                return np.datetime_as_string(moments, timezone='UTC')
+            return [base + timedelta(days=sign * day) for day in days]
+        return np.full(count, None, dtype=object) if np is not None else [None] * count
+
+    def _override(self, generator, override, count):
+        if callable(override):
+            values = override(generator, count)
+        elif isinstance(override, (list, tuple)):
+            values = self._choice(generator, override, count)
+        else:
+            values = [override] * count
+        return np.asarray(values) if np is not None else list(values)
+
+    def _integers(self, generator, low, high, count):
+        if np is not None:
+            return generator.integers(low, high, size=count)
+        return [generator.randrange(low, high) for _ in range(count)]
+
+    def _choice(self, generator, options, count):
+        if np is not None:
+            options = np.asarray(options)
+            return options[generator.integers(0, len(options), size=count)]
+        return generator.choices(options, k=count)
@@ -1,10 +1,15 @@
-from model import Model
+import csv
+
 from view import View
 
+GENERATION_MODES = {'1': 'row', '2': 'bulk', '3': 'copy'}
+EXPORT_FORMATS = {'1': 'csv', '2': 'jsonl'}
+PAIR_DISTRIBUTIONS = {'1': 'uniform', '2': 'zipf'}
+
 class Controller:
-    def __init__(self):
-        self.model = Model(db_name="postgres", user="postgres", password="root")
-        self.view = View()
+    def __init__(self, output=None, pager=False):
+        self._model = None
+        self.view = View(output, pager)
         self.actions = {
             '1': self.view_tables,
             '2': self.view_columns,
@@ -13,9 +18,32 @@ class Controller:
             '5': self.update_data,
             '6': self.delete_data,
             '7': self.generate_data,
-            '8': self.exit_program
+            '8': self.import_csv,
+            '9': self.add_data_from_file,
+            '10': self.view_table_pages,
+            '11': self.refresh_catalog,
+            '12': self.seed_schema,
+            '13': self.update_many,
+            '14': self.delete_many,
+            '15': self.view_slow_statements,
+            '16': self.export_query_stats,
+            '17': self.view_cache_stats,
+            '18': self.export_table,
+            '19': self.view_reports,
+            '20': self.advise_indexes,
+            '21': self.generate_pairs,
+            '0': self.exit_program
         }
 
+    # Модуль моделі тягне SQLAlchemy, psycopg2 і NumPy, тож імпортується і
+    # створюється лише при першій операції з базою, а не до появи меню.
+    @property
+    def model(self):
+        if self._model is None:
+            from model import Model
+            self._model = Model(db_name="postgres", user="postgres", password="root")
+        return self._model
+
     def run(self):
         while True:
             choice = self.view.display_menu()
@@ -41,10 +69,40 @@ class Controller:
             self.view.display_message(f"Помилка при отриманні стовпців таблиці {table_name}: {e}")
 
     def view_table_data(self):
-        table_name = self.view.get_table_name()
+        table_name, columns = self.view.get_view_params()
+        try:
+            self.view.display_result(self.model.iter_table_data(table_name, columns=columns))
+        except Exception as e:
+            self.view.display_message(f"Помилка при перегляді даних таблиці {table_name}: {e}")
+
+    def view_table_pages(self):
+        table_name, page_size_input = self.view.get_page_params()
+        try:
+            page_size = int(page_size_input)
+        except ValueError:
+            self.view.display_message("Неправильний формат числа. Будь ласка, введіть ціле число.")
+            return
+
         try:
-            data = self.model.view_table_data(table_name)
-            self.view.display_result(data)
+            rows, first_id, last_id = self.model.view_table_page(table_name, page_size)
+            self.view.display_result(rows)
+            while True:
+                command = self.view.get_page_command()
+                if command == 'n':
+                    page = self.model.view_table_page(table_name, page_size, after_id=last_id)
+                elif command == 'p':
+                    page = self.model.view_table_page(table_name, page_size, before_id=first_id)
+                elif command == 'q':
+                    break
+                else:
+                    self.view.display_message("Невірний вибір. Спробуйте ще раз.")
+                    continue
+
+                if not page[0]:
+                    self.view.display_message("Більше сторінок немає.")
+                    continue
+                rows, first_id, last_id = page
+                self.view.display_result(rows)
         except Exception as e:
             self.view.display_message(f"Помилка при перегляді даних таблиці {table_name}: {e}")
 
@@ -56,6 +114,21 @@ class Controller:
         except Exception as e:
             self.view.display_message(f"Помилка додавання даних: {e}")
 
+    def add_data_from_file(self):
+        table_name, file_path = self.view.get_import_params()
+        try:
+            with open(file_path, newline='', encoding='utf-8') as csv_file:
+                reader = csv.reader(csv_file)
+                columns = [column.strip() for column in next(reader, [])]
+                if not columns:
+                    raise ValueError(f"Файл {file_path} порожній.")
+                inserted, errors = self.model.insert_many(table_name, columns, reader)
+            self.view.display_message(f"Додано {inserted} записів, відхилено {len(errors)}.")
+            # Нумерація рядків даних у моделі починається з 1, а в файлі перший рядок - заголовок.
+            self.view.display_row_errors([(index + 1, message) for index, message in errors])
+        except Exception as e:
+            self.view.display_message(f"Помилка пакетного додавання даних: {e}")
+
     def update_data(self):
         table_name, column, row_id, new_value = self.view.get_update_data()
         try:
@@ -64,6 +137,24 @@ class Controller:
         except Exception as e:
             self.view.display_message(f"Помилка оновлення даних: {e}")
 
+    def update_many(self):
+        table_name, column, new_value = self.view.get_update_many_data()
+        try:
+            selection = self.view.get_row_selection()
+            count = self.model.update_many(table_name, column, new_value, **selection)
+            self.view.display_message(f"Оновлено {count} записів.")
+        except Exception as e:
+            self.view.display_message(f"Помилка оновлення даних: {e}")
+
+    def delete_many(self):
+        table_name = self.view.get_table_name()
+        try:
+            selection = self.view.get_row_selection()
+            count = self.model.delete_many(table_name, **selection)
+            self.view.display_message(f"Видалено {count} записів.")
+        except Exception as e:
+            self.view.display_message(f"Помилка видалення даних: {e}")
+
     def delete_data(self):
         table_name, row_id = self.view.get_delete_data()
         try:
@@ -73,19 +164,144 @@ class Controller:
             self.view.display_message(f"Помилка видалення даних: {e}")
 
     def generate_data(self):
-        table_name, count_input = self.view.get_generate_data_params()
+        table_name, count_input, mode_input = self.view.get_generate_data_params()
         try:
             count = int(count_input)
         except ValueError:
             self.view.display_message("Неправильний формат числа. Будь ласка, введіть ціле число.")
             return
 
+        mode = GENERATION_MODES.get(mode_input, 'row')
         try:
-            self.model.generate_data(table_name, count)
-            self.view.display_message(f"Успішно згенеровано {count} записів для таблиці {table_name}.")
+            rate = self.model.generate_data(table_name, count, mode)
+            self.view.display_message(
+                f"Успішно згенеровано {count} записів для таблиці {table_name} ({rate:.0f} записів/с)."
+            )
         except Exception as e:
             self.view.display_message(f"Помилка генерації даних для таблиці {table_name}: {e}")
 
+    def generate_pairs(self):
+        table_name, count_input, distribution_input, skew_input = self.view.get_pairs_params()
+        try:
+            count = int(count_input)
+            options = {'skew': float(skew_input)} if skew_input else {}
+        except ValueError:
+            self.view.display_message("Неправильний формат числа.")
+            return
+
+        distribution = PAIR_DISTRIBUTIONS.get(distribution_input, 'uniform')
+        try:
+            rate = self.model.generate_pairs(table_name, count, distribution, **options)
+            self.view.display_message(
+                f"Успішно згенеровано {count} унікальних пар для таблиці {table_name} ({rate:.0f} записів/с)."
+            )
+        except Exception as e:
+            self.view.display_message(f"Помилка генерації зв'язків для таблиці {table_name}: {e}")
+
+    def seed_schema(self):
+        count_input, mode_input, workers_input = self.view.get_seed_params()
+        try:
+            count = int(count_input)
+            workers = int(workers_input)
+        except ValueError:
+            self.view.display_message("Неправильний формат числа. Будь ласка, введіть ціле число.")
+            return
+
+        mode = GENERATION_MODES.get(mode_input, 'bulk')
+        try:
+            counts = {table: count for (table,) in self.model.list_tables()}
+            total, rate = self.model.seed_schema(counts, mode, max(workers, 1))
+            self.view.display_message(
+                f"Успішно згенеровано {total} записів для {len(counts)} таблиць ({rate:.0f} записів/с)."
+            )
+        except Exception as e:
+            self.view.display_message(f"Помилка генерації даних для схеми: {e}")
+
+    def import_csv(self):
+        table_name, file_path = self.view.get_import_params()
+        try:
+            count = self.model.import_csv(table_name, file_path)
+            self.view.display_message(f"Імпортовано {count} записів у таблицю {table_name}.")
+        except Exception as e:
+            self.view.display_message(f"Помилка імпорту даних у таблицю {table_name}: {e}")
+
+    def refresh_catalog(self):
+        try:
+            self.model.refresh_catalog()
+            self.view.display_message("Схему бази даних оновлено.")
+        except Exception as e:
+            self.view.display_message(f"Помилка оновлення схеми бази даних: {e}")
+
+    def view_slow_statements(self):
+        limit_input = self.view.get_slow_statements_limit()
+        try:
+            limit = int(limit_input)
+        except ValueError:
+            self.view.display_message("Неправильний формат числа. Будь ласка, введіть ціле число.")
+            return
+
+        self.view.display_slow_statements(self.model.slow_statements(limit))
+        self.view.display_latency_histograms(self.model.latency_histograms())
+
+    def export_query_stats(self):
+        file_path = self.view.get_export_path()
+        try:
+            count = self.model.export_query_stats(file_path)
+            self.view.display_message(f"Статистику {count} запитів збережено у файл {file_path}.")
+        except Exception as e:
+            self.view.display_message(f"Помилка експорту статистики запитів: {e}")
+
+    def view_cache_stats(self):
+        self.view.display_cache_stats("Кеш результатів читання", self.model.result_cache_stats())
+
+    def export_table(self):
+        try:
+            table_name, file_path, format_input, columns, predicate = self.view.get_export_params()
+            count = self.model.export_table(
+                table_name, file_path, EXPORT_FORMATS.get(format_input, 'csv'), columns, predicate
+            )
+            self.view.display_message(f"Експортовано {count} записів у файл {file_path}.")
+        except Exception as e:
+            self.view.display_message(f"Помилка експорту даних: {e}")
+
+    def view_reports(self):
+        choice, use_view = self.view.get_report_params()
+        try:
+            if choice == '1':
+                researcher_id = self.view.get_report_researcher_id()
+                self.view.display_portfolio(self.model.researcher_portfolio(researcher_id or None))
+            elif choice == '2':
+                self.view.display_result(self.model.project_output_counts(use_view))
+            elif choice == '3':
+                self.view.display_result(self.model.publications_per_year(use_view))
+            elif choice == '4':
+                self.model.create_report_views()
+                self.model.refresh_report_views()
+                self.view.display_message("Матеріалізовані подання звітів оновлено.")
+            else:
+                self.view.display_message("Невірний вибір. Спробуйте ще раз.")
+        except Exception as e:
+            self.view.display_message(f"Помилка побудови звіту: {e}")
+
+    def advise_indexes(self):
+        try:
+            filter_columns = self.view.get_index_params()
+            missing = self.model.missing_indexes(filter_columns)
+            self.view.display_missing_indexes(missing)
+            if not missing:
+                return
+            create, concurrently = self.view.get_index_confirmation()
+            if not create:
+                return
+            created, before, after = self.model.create_missing_indexes(concurrently, filter_columns)
+            self.view.display_message(f"Створено індексів: {len(created)} ({', '.join(created)}).")
+            self.view.display_plan_comparison(before, after)
+        except Exception as e:
+            self.view.display_message(f"Помилка створення індексів: {e}")
+
     def exit_program(self):
+        if self._model is not None:
+            self._model.close_connection()
+        self.view.close()
         self.view.display_message("Вихід з програми.")
         exit(0)
@@ -0,0 +1,37 @@
+import time
+
+from psycopg2.extensions import connection
+from sqlalchemy import event
+
+from common.instrumentation import InstrumentedCursor
+
+
+# Для прямих psycopg2-операцій (COPY, генерація), які оминають події
+# SQLAlchemy. recorder задається лише на час _raw_connection, тож запити
+# самого SQLAlchemy через цей курсор не записуються вдруге.
+class RecordingConnection(connection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.recorder = None
+        self.cursor_factory = InstrumentedCursor
+
+
+def instrument_engine(engine, recorder):
+    @event.listens_for(engine, 'before_cursor_execute')
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info['query_started'].pop()
+        recorder.record(statement, time.perf_counter() - started, cursor.rowcount)
+
+    @event.listens_for(engine, 'handle_error')
+    def handle_error(exception_context):
+        conn = exception_context.connection
+        if conn is None or exception_context.statement is None or not conn.info.get('query_started'):
+            return
+        started = conn.info['query_started'].pop()
+        error = exception_context.original_exception
+        recorder.record(exception_context.statement, time.perf_counter() - started,
+                        error=f'{type(error).__name__}: {error}'.strip())
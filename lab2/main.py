@@ -1,5 +1,43 @@
+import time
+
+# Відлік часу запуску - до решти імпортів, щоб врахувати і їх.
+STARTED = time.perf_counter()
+
+import argparse
+import os
+import sys
+
+# Модулі, спільні для rgr і lab2, лежать у пакеті common на рівень вище.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.script import SCRIPT_BATCH_SIZE, run_script
+
 from controller import Controller
 
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Додаток бази даних наукових досліджень.")
+    parser.add_argument('--script', help="файл операцій (JSON у кожному рядку) для виконання без діалогу")
+    parser.add_argument('--batch-size', type=int, default=SCRIPT_BATCH_SIZE,
+                        help="кількість операцій в одній транзакції")
+    parser.add_argument('--output', help="файл для результатів сценарію або таблиць у діалоговому режимі "
+                                         "(за замовчуванням stdout)")
+    parser.add_argument('--pager', action='store_true', help="переглядати таблиці через пейджер ($PAGER або less)")
+    parser.add_argument('--startup-time', action='store_true',
+                        help="вивести у stderr час від запуску до готовності меню чи сценарію")
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    controller = Controller()
-    controller.run()
\ No newline at end of file
+    arguments = parse_arguments()
+    controller = Controller(output=None if arguments.script else arguments.output, pager=arguments.pager)
+    if arguments.startup_time:
+        print(f"Час запуску: {(time.perf_counter() - STARTED) * 1000:.1f} мс.", file=sys.stderr)
+    if arguments.script:
+        try:
+            succeeded = run_script(controller.model, arguments.script, arguments.output,
+                                   max(arguments.batch_size, 1))
+        finally:
+            controller.model.close_connection()
+        sys.exit(0 if succeeded else 1)
+    controller.run()
@@ -1,8 +1,43 @@
-from sqlalchemy import (create_engine, Column, Integer, String, DateTime, ForeignKey, inspect)
+from sqlalchemy import (create_engine, Column, Integer, String, DateTime, ForeignKey, insert, select,
+                        update, delete, any_, bindparam, func, text)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, relationship, selectinload
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 import psycopg2
+import csv
+import operator
+import threading
+from contextlib import contextmanager
+
+from common.advisor import create_index_query, explain_targets, index_name, missing_indexes, plan_summary
+from common.catalog import SchemaCatalog
+from common.export import EXPORT_FORMATS, open_export, write_rows
+from common.id_allocator import IdAllocator, identifiers
+from common.instrumentation import QueryRecorder, SLOW_STATEMENTS_LIMIT
+from common.loader import CopyStream
+from common.result_cache import ResultCache
+from common.seeding import SeedingMixin
+from common.values import ValueEngine
+
+from instrumentation import RecordingConnection, instrument_engine
+
+INSERT_PAGE_SIZE = 1000
+VIEW_PAGE_SIZE = 20
+STREAM_BATCH_SIZE = 2000
+POOL_SIZE = 5
+REPORT_LIMIT = 100
+# Матеріалізовані подання звітів: назва -> стовпці унікального індексу,
+# потрібного для REFRESH ... CONCURRENTLY.
+REPORT_VIEWS = {
+    'report_project_outputs': 'research_project_id',
+    'report_publications_per_year': 'year, journal',
+}
+PREDICATE_OPERATORS = {
+    '=': operator.eq, '!=': operator.ne, '<': operator.lt,
+    '<=': operator.le, '>': operator.gt, '>=': operator.ge,
+}
 
 Base = declarative_base()
 
@@ -38,7 +73,7 @@ class Experiment(Base):
     description = Column(String(500), nullable=False)
     start_date = Column(DateTime, nullable=False)
     end_date = Column(DateTime)
-    research_project_id = Column(Integer, ForeignKey('research_project.research_project_id'), nullable=False)
+    research_project_id = Column(Integer, ForeignKey('research_project.research_project_id'), nullable=False, index=True)
 
     project = relationship('ResearchProject', back_populates='experiments')
     researchers = relationship('Researcher', secondary='researcher_experiment', back_populates='experiments')
@@ -50,7 +85,7 @@ class Publication(Base):
     title = Column(String(100), nullable=False)
     year = Column(Integer, nullable=False)
     journal = Column(String(100), nullable=False)
-    research_project_id = Column(Integer, ForeignKey('research_project.research_project_id'), nullable=False)
+    research_project_id = Column(Integer, ForeignKey('research_project.research_project_id'), nullable=False, index=True)
 
     project = relationship('ResearchProject', back_populates='publications')
     researchers = relationship('Researcher', secondary='researcher_publication', back_populates='publications')
@@ -59,65 +94,272 @@ class Publication(Base):
 class ResearcherProject(Base):
     __tablename__ = 'researcher_project'
     tab_id = Column(Integer, primary_key=True, autoincrement=False)
-    researcher_id = Column(Integer, ForeignKey('researcher.researcher_id'), nullable=False)
-    research_project_id = Column(Integer, ForeignKey('research_project.research_project_id'), nullable=False)
+    researcher_id = Column(Integer, ForeignKey('researcher.researcher_id'), nullable=False, index=True)
+    research_project_id = Column(Integer, ForeignKey('research_project.research_project_id'), nullable=False, index=True)
 
 
 class ResearcherExperiment(Base):
     __tablename__ = 'researcher_experiment'
     tab_id = Column(Integer, primary_key=True, autoincrement=False)
-    researcher_id = Column(Integer, ForeignKey('researcher.researcher_id'), nullable=False)
-    experiment_id = Column(Integer, ForeignKey('experiment.experiment_id'), nullable=False)
+    researcher_id = Column(Integer, ForeignKey('researcher.researcher_id'), nullable=False, index=True)
+    experiment_id = Column(Integer, ForeignKey('experiment.experiment_id'), nullable=False, index=True)
 
 
 class ResearcherPublication(Base):
     __tablename__ = 'researcher_publication'
     tab_id = Column(Integer, primary_key=True, autoincrement=False)
-    researcher_id = Column(Integer, ForeignKey('researcher.researcher_id'), nullable=False)
-    publication_id = Column(Integer, ForeignKey('publication.publication_id'), nullable=False)
-
-
-class Model:
-    def __init__(self, db_name, user, password, host='localhost', port='5432'):
-        connection_string = f"postgresql://{user}:{password}@{host}:{port}/{db_name}"
-        self.engine = create_engine(connection_string)
-        self.Session = sessionmaker(bind=self.engine)
-        self.inspector = inspect(self.engine)
-
-        self.class_map = {}
-        for mapper in Base.registry.mappers:
-            mapped_cls = mapper.class_
-            if hasattr(mapped_cls, '__tablename__'):
-                self.class_map[mapped_cls.__tablename__] = mapped_cls
-        
-        self.connection = psycopg2.connect(
-                dbname=db_name, user=user, password=password, host=host, port=port
-            )
-        self.cursor = self.connection.cursor()
+    researcher_id = Column(Integer, ForeignKey('researcher.researcher_id'), nullable=False, index=True)
+    publication_id = Column(Integer, ForeignKey('publication.publication_id'), nullable=False, index=True)
+
+
+class Model(SeedingMixin):
+    def __init__(self, db_name, user, password, host='localhost', port='5432',
+                 pool_size=POOL_SIZE, pre_ping=True, value_seed=None):
+        self.connection_string = f"postgresql://{user}:{password}@{host}:{port}/{db_name}"
+        self.pool_size = pool_size
+        self.pre_ping = pre_ping
+        self.recorder = QueryRecorder()
+        self.results = ResultCache()
+        self.ids = IdAllocator()
+        self.values = ValueEngine(value_seed)
+        self.pinned = threading.local()
+        # Рушій, карта класів і схема створюються при першому зверненні, тож
+        # конструктор не відкриває з'єднань і не читає каталог бази.
+        self.lock = threading.Lock()
+        self._engine = None
+        self._class_map = None
+        self._catalog = SchemaCatalog()
+        self.catalog_loaded = False
+
+    # ORM-сесії та прямі psycopg2-операції (COPY, генерація) беруть
+    # з'єднання з одного пулу рушія, тож процес не тримає зайвих підключень.
+    @property
+    def engine(self):
+        if self._engine is None:
+            with self.lock:
+                if self._engine is None:
+                    engine = create_engine(
+                        self.connection_string, pool_size=self.pool_size, max_overflow=0,
+                        pool_pre_ping=self.pre_ping, connect_args={'connection_factory': RecordingConnection}
+                    )
+                    instrument_engine(engine, self.recorder)
+                    self._engine = engine
+        return self._engine
+
+    @property
+    def class_map(self):
+        if self._class_map is None:
+            self._class_map = {
+                mapper.class_.__tablename__: mapper.class_
+                for mapper in Base.registry.mappers if hasattr(mapper.class_, '__tablename__')
+            }
+        return self._class_map
+
+    @property
+    def catalog(self):
+        if not self.catalog_loaded:
+            self.refresh_catalog()
+        return self._catalog
+
+    # Закріплює за потоком одне з'єднання: усі виклики Model до виходу з
+    # блоку стають однією транзакцією, а кожна операція виконується у власній
+    # точці збереження. Кеш результатів скидається, бо в ньому могли
+    # опинитися незафіксовані дані.
+    @contextmanager
+    def transaction(self):
+        with self.recorder.operation('transaction'), self.engine.connect() as connection:
+            with connection.begin():
+                self.pinned.connection = connection
+                try:
+                    yield
+                except BaseException:
+                    # Відкат міг прибрати створені в транзакції послідовності id.
+                    self.ids.clear()
+                    raise
+                finally:
+                    self.pinned.connection = None
+                    self.results.clear()
+
+    @contextmanager
+    def _connect(self, operation):
+        pinned = getattr(self.pinned, 'connection', None)
+        with self.recorder.operation(operation):
+            if pinned is not None:
+                with pinned.begin_nested():
+                    yield pinned
+            else:
+                with self.engine.begin() as connection:
+                    yield connection
+
+    def _session(self):
+        pinned = getattr(self.pinned, 'connection', None)
+        if pinned is None:
+            return Session(bind=self.engine)
+        # commit/rollback такої сесії звільняють/відкочують лише її точку збереження.
+        return Session(bind=pinned, join_transaction_mode='create_savepoint')
+
+    @contextmanager
+    def _raw_connection(self, operation):
+        pinned = getattr(self.pinned, 'connection', None)
+        with self.recorder.operation(operation):
+            if pinned is not None:
+                with pinned.begin_nested():
+                    connection = pinned.connection
+                    connection.dbapi_connection.recorder = self.recorder
+                    try:
+                        yield connection
+                    finally:
+                        connection.dbapi_connection.recorder = None
+                return
+
+            connection = self.engine.raw_connection()
+            connection.dbapi_connection.recorder = self.recorder
+            try:
+                yield connection
+            finally:
+                if connection.dbapi_connection is not None:
+                    connection.dbapi_connection.recorder = None
+                connection.close()
+
+    def _commit(self, connection):
+        pinned = getattr(self.pinned, 'connection', None)
+        if pinned is None or connection is not pinned.connection:
+            connection.commit()
+
+    def _rollback(self, connection):
+        pinned = getattr(self.pinned, 'connection', None)
+        if pinned is None or connection is not pinned.connection:
+            connection.rollback()
+
+    # Готує послідовності id коротким окремим запитом, до того як операція
+    # візьме своє з'єднання з пулу. У межах transaction() підготовка не
+    # запам'ятовується, бо транзакцію ще можуть відкотити.
+    def _prepare_identifiers(self, tables):
+        pending = [table_name for table_name in tables if not self.ids.is_prepared(table_name)]
+        if not pending:
+            return
+        with self._raw_connection('prepare_identifiers') as connection:
+            cursor = connection.cursor()
+            try:
+                for table_name in pending:
+                    id_column = self.catalog.primary_key(table_name)
+                    if id_column is None:
+                        raise ValueError(f"Таблиця {table_name} не має первинного ключа.")
+                    self.ids.prepare(cursor, table_name, id_column)
+                self._commit(connection)
+            except psycopg2.Error as e:
+                self._rollback(connection)
+                raise Exception(f"Помилка підготовки послідовності ідентифікаторів: {e}")
+            except Exception as e:
+                self._rollback(connection)
+                raise e
+        if getattr(self.pinned, 'connection', None) is None:
+            self.ids.mark_prepared(pending)
+
+    # Id резервуються на з'єднанні сесії, у її ж транзакції.
+    def _reserve_identifiers(self, session, table_name, count):
+        cursor = session.connection().connection.cursor()
+        return identifiers(self.ids.reserve(cursor, table_name, count))
+
+    def refresh_catalog(self):
+        with self._raw_connection('refresh_catalog') as connection:
+            try:
+                self._catalog.refresh(connection.cursor())
+                self._commit(connection)
+                self.catalog_loaded = True
+                self.results.clear()
+            except Exception as e:
+                self._rollback(connection)
+                raise Exception(f"Помилка завантаження схеми бази даних: {e}")
 
     def list_tables(self):
-        return [(table,) for table in self.inspector.get_table_names(schema='public')]
+        return [(table,) for table in self.catalog.tables()]
 
     def list_columns(self, table_name):
-        columns = self.inspector.get_columns(table_name, schema='public')
-        return [(col['name'],) for col in columns]
-
-    def view_table_data(self, table_name):
+        return [(column,) for column, _ in self.catalog.table_columns(table_name)]
+
+    def view_table_data(self, table_name, columns=None):
+        table, selected = self._table_projection(table_name, columns)
+        cache_key = ('view_table_data', table.name, tuple(column.name for column in selected))
+        rows = self.results.get(cache_key)
+        if rows is not None:
+            return rows
+
+        version = self.results.version(table.name)
+        with self._connect('view_table_data') as connection:
+            result = connection.execute(select(*selected).order_by(*table.primary_key.columns))
+            rows = [tuple(row) for row in result]
+        self.results.put(cache_key, table.name, rows, version, len(rows))
+        return rows
+
+    def iter_table_data(self, table_name, batch_size=STREAM_BATCH_SIZE, columns=None):
+        table, selected = self._table_projection(table_name, columns)
+        cache_key = ('view_table_data', table.name, tuple(column.name for column in selected))
+        rows = self.results.get(cache_key)
+        if rows is not None:
+            yield from rows
+            return
+
+        # Прочитані рядки запам'ятовуються для кешу, лише поки їх не більше
+        # за ліміт кешу, тож для великих таблиць пам'ять не зростає.
+        collected = []
+        version = self.results.version(table.name)
+        with self._connect('iter_table_data') as connection:
+            # stream_results відкриває серверний курсор, а yield_per забирає
+            # з нього рядки порціями - без ORM-об'єктів і карти ідентичності.
+            result = connection.execution_options(stream_results=True).execute(
+                select(*selected).order_by(*table.primary_key.columns)
+            )
+            for row in result.yield_per(batch_size):
+                row = tuple(row)
+                if collected is not None:
+                    collected.append(row)
+                    if len(collected) > self.results.max_rows:
+                        collected = None
+                yield row
+
+        if collected is not None:
+            self.results.put(cache_key, table.name, collected, version, len(collected))
+
+    def view_table_page(self, table_name, page_size=VIEW_PAGE_SIZE, after_id=None, before_id=None):
+        table, selected = self._table_projection(table_name, None)
+        cache_key = ('view_table_page', table.name, page_size, after_id, before_id)
+        page = self.results.get(cache_key)
+        if page is not None:
+            return page
+
+        version = self.results.version(table.name)
+        key = list(table.primary_key.columns)[0]
+        query = select(*selected)
+        if before_id is not None:
+            query = query.where(key < before_id).order_by(key.desc())
+        elif after_id is not None:
+            query = query.where(key > after_id).order_by(key)
+        else:
+            query = query.order_by(key)
+
+        with self._connect('view_table_page') as connection:
+            rows = [tuple(row) for row in connection.execute(query.limit(page_size))]
+        if before_id is not None:
+            rows.reverse()
+
+        key_index = selected.index(key)
+        page = (rows, rows[0][key_index], rows[-1][key_index]) if rows else (rows, None, None)
+        self.results.put(cache_key, table.name, page, version, len(rows))
+        return page
+
+    def _table_projection(self, table_name, columns):
         table_class = self.class_map.get(table_name.lower())
         if table_class is None:
             raise ValueError(f"Таблиця {table_name} не знайдена.")
 
-        session = self.Session()
-        try:
-            data = session.query(table_class).all()
-            columns = [c.name for c in table_class.__table__.columns]
-            result = []
-            for obj in data:
-                row = tuple(getattr(obj, col) for col in columns)
-                result.append(row)
-            return result
-        finally:
-            session.close()
+        table = table_class.__table__
+        if not columns:
+            return table, list(table.columns)
+        unknown = [column for column in columns if column not in table.columns]
+        if unknown:
+            raise ValueError(f"Таблиця {table_name} не має стовпців: {', '.join(unknown)}.")
+        return table, [table.columns[column] for column in columns]
 
     def insert_data(self, table_name, columns, values):
         if len(columns) != len(values):
@@ -128,128 +370,449 @@ class Model:
             raise ValueError(f"Невідома таблиця {table_name}")
 
         data_dict = {col: val for col, val in zip(columns, values)}
+        # Якщо id не вказано, він береться з зарезервованого блоку.
+        id_column = list(table_class.__table__.primary_key.columns)[0].name
+        assign_id = id_column not in data_dict
+        if assign_id:
+            self._prepare_identifiers([table_name])
+
+        with self.recorder.operation('insert_data'):
+            session = self._session()
+            try:
+                if assign_id:
+                    data_dict[id_column] = next(self._reserve_identifiers(session, table_name, 1))
+                new_obj = table_class(**data_dict)
+                session.add(new_obj)
+                session.commit()
+                self.results.invalidate(table_name)
+                if not assign_id:
+                    self.ids.forget(table_name)
+            except IntegrityError as e:
+                session.rollback()
+                raise ValueError(f"Помилка вставки даних: {e}")
+            finally:
+                session.close()
+
+    def insert_many(self, table_name, columns, rows, page_size=INSERT_PAGE_SIZE):
+        table_class = self.class_map.get(table_name.lower())
+        if table_class is None:
+            raise ValueError(f"Невідома таблиця {table_name}")
 
-        session = self.Session()
+        table = table_class.__table__
+        id_column = list(table.primary_key.columns)[0].name
+        assign_ids = id_column not in columns
+        if assign_ids:
+            self._prepare_identifiers([table_name])
+
+        inserted = 0
+        errors = []
+        page = []
+        with self.recorder.operation('insert_many'):
+            session = self._session()
+            try:
+                for index, values in enumerate(rows, start=1):
+                    if len(values) != len(columns):
+                        errors.append((index, "Кількість стовпців не відповідає кількості значень."))
+                        continue
+                    page.append((index, dict(zip(columns, values))))
+                    if len(page) == page_size:
+                        if assign_ids:
+                            self._assign_identifiers(session, table_name, id_column, page)
+                        inserted += self._insert_page(session, table, page, errors)
+                        page = []
+                if page:
+                    if assign_ids:
+                        self._assign_identifiers(session, table_name, id_column, page)
+                    inserted += self._insert_page(session, table, page, errors)
+
+                session.commit()
+                self.results.invalidate(table_name)
+                if not assign_ids:
+                    self.ids.forget(table_name)
+                return inserted, errors
+            except Exception:
+                session.rollback()
+                raise
+            finally:
+                session.close()
+
+    # Один запит резервує id для всієї сторінки.
+    def _assign_identifiers(self, session, table_name, id_column, page):
+        for (_, params), row_id in zip(page, self._reserve_identifiers(session, table_name, len(page))):
+            params[id_column] = row_id
+
+    def _insert_page(self, session, table, page, errors):
         try:
-            new_obj = table_class(**data_dict)
-            session.add(new_obj)
-            session.commit()
-        except IntegrityError as e:
-            session.rollback()
-            raise ValueError(f"Помилка вставки даних: {e}")
-        finally:
-            session.close()
+            with session.begin_nested():
+                session.execute(insert(table), [params for _, params in page])
+            return len(page)
+        except SQLAlchemyError:
+            pass
+
+        # Сторінка не пройшла цілком - вставляємо її рядки по одному, щоб
+        # відкинути лише помилкові і повідомити, які саме.
+        inserted = 0
+        for index, params in page:
+            try:
+                with session.begin_nested():
+                    session.execute(insert(table), params)
+                inserted += 1
+            except SQLAlchemyError as e:
+                errors.append((index, f"Помилка вставки даних: {getattr(e, 'orig', e)}".strip()))
+        return inserted
 
     def update_data(self, table_name, column, row_id, new_value):
         table_class = self.class_map.get(table_name.lower())
         if table_class is None:
             raise ValueError(f"Невідома таблиця {table_name}")
 
-        session = self.Session()
-        try:
-            obj = session.query(table_class).get(row_id)
-            if not obj:
-                raise ValueError(f"Рядок з id {row_id} не знайдено в таблиці {table_name}.")
+        with self.recorder.operation('update_data'):
+            session = self._session()
+            try:
+                obj = session.query(table_class).get(row_id)
+                if not obj:
+                    raise ValueError(f"Рядок з id {row_id} не знайдено в таблиці {table_name}.")
+
+                setattr(obj, column, new_value)
+                session.commit()
+                self.results.invalidate(table_name)
+                if column in table_class.__table__.primary_key.columns:
+                    self.ids.forget(table_name)
+            except IntegrityError as e:
+                session.rollback()
+                raise ValueError(f"Помилка оновлення даних: {e}")
+            finally:
+                session.close()
+
+    def update_many(self, table_name, column, new_value, ids=None, id_range=None, predicate=None):
+        table, condition = self._row_selection(table_name, ids, id_range, predicate)
+        if column not in table.columns:
+            raise ValueError(f"Таблиця {table_name} не має стовпця {column}.")
+        if table.columns[column].primary_key:
+            raise ValueError("Ідентифікатор не можна змінювати для кількох рядків одночасно.")
 
-            setattr(obj, column, new_value)
-            session.commit()
+        try:
+            with self._connect('update_many') as connection:
+                result = connection.execute(update(table).where(condition).values({column: new_value}))
+                updated = result.rowcount
         except IntegrityError as e:
-            session.rollback()
             raise ValueError(f"Помилка оновлення даних: {e}")
-        finally:
-            session.close()
+        self.results.invalidate(table.name)
+        return updated
+
+    def delete_many(self, table_name, ids=None, id_range=None, predicate=None):
+        table, condition = self._row_selection(table_name, ids, id_range, predicate)
+        try:
+            with self._connect('delete_many') as connection:
+                deleted = connection.execute(delete(table).where(condition)).rowcount
+        except IntegrityError as e:
+            raise ValueError(f"Помилка видалення даних: {e}")
+        self.results.invalidate(table.name)
+        return deleted
+
+    def _row_selection(self, table_name, ids, id_range, predicate):
+        if sum(selector is not None for selector in (ids, id_range, predicate)) != 1:
+            raise ValueError("Потрібно вказати рівно один спосіб вибору рядків: список id, діапазон id або умову.")
 
-    def delete_data(self, table_name, row_id):
         table_class = self.class_map.get(table_name.lower())
         if table_class is None:
             raise ValueError(f"Невідома таблиця {table_name}")
+        table = table_class.__table__
+        key = list(table.primary_key.columns)[0]
 
-        session = self.Session()
         try:
-            obj = session.query(table_class).get(row_id)
-            if not obj:
-                raise ValueError(f"Рядок з id {row_id} не знайдено в таблиці {table_name}.")
-            session.delete(obj)
-            session.commit()
-        except IntegrityError as e:
-            session.rollback()
-            raise ValueError(f"Помилка видалення даних: {e}")
-        finally:
-            session.close()
+            if ids is not None:
+                # Один масив-параметр замість IN зі списком із тисяч параметрів.
+                ids_param = bindparam('ids', [int(row_id) for row_id in ids], type_=ARRAY(Integer))
+                return table, key == any_(ids_param)
+            if id_range is not None:
+                low, high = id_range
+                return table, key.between(int(low), int(high))
+        except ValueError:
+            raise ValueError("Значення ідентифікатора повинно бути цілим числом.")
+
+        column, operator_name, value = predicate
+        if operator_name not in PREDICATE_OPERATORS:
+            raise ValueError(f"Непідтримуваний оператор {operator_name}.")
+        if column not in table.columns:
+            raise ValueError(f"Таблиця {table_name} не має стовпця {column}.")
+        return table, PREDICATE_OPERATORS[operator_name](table.columns[column], value)
+
+    def delete_data(self, table_name, row_id):
+        table_class = self.class_map.get(table_name.lower())
+        if table_class is None:
+            raise ValueError(f"Невідома таблиця {table_name}")
+
+        with self.recorder.operation('delete_data'):
+            session = self._session()
+            try:
+                obj = session.query(table_class).get(row_id)
+                if not obj:
+                    raise ValueError(f"Рядок з id {row_id} не знайдено в таблиці {table_name}.")
+                session.delete(obj)
+                session.commit()
+                self.results.invalidate(table_name)
+            except IntegrityError as e:
+                session.rollback()
+                raise ValueError(f"Помилка видалення даних: {e}")
+            finally:
+                session.close()
+
+    def copy_rows(self, table_name, columns, rows):
+        with self._raw_connection('copy_rows') as connection:
+            cursor = connection.cursor()
+            stream = CopyStream(rows)
+            try:
+                self._copy(cursor, table_name, columns, stream)
+                self._commit(connection)
+                self.results.invalidate(table_name)
+                self.ids.forget(table_name)
+                return stream.count
+            except psycopg2.IntegrityError as e:
+                self._rollback(connection)
+                raise ValueError(f"Помилка завантаження даних (можливо, порушення обмежень цілісності): {e}")
+            except Exception as e:
+                self._rollback(connection)
+                raise e
+
+    def import_csv(self, table_name, file_path):
+        with self._raw_connection('import_csv') as connection:
+            cursor = connection.cursor()
+            try:
+                with open(file_path, newline='', encoding='utf-8') as csv_file:
+                    header = next(csv.reader(csv_file), None)
+                    if not header:
+                        raise ValueError(f"Файл {file_path} порожній.")
+                    csv_file.seek(0)
+                    columns = [column.strip() for column in header]
+                    self._copy(cursor, table_name, columns, csv_file, header=True)
+                self._commit(connection)
+                self.results.invalidate(table_name)
+                self.ids.forget(table_name)
+                return cursor.rowcount
+            except psycopg2.IntegrityError as e:
+                self._rollback(connection)
+                raise ValueError(f"Помилка імпорту даних (можливо, порушення обмежень цілісності): {e}")
+            except Exception as e:
+                self._rollback(connection)
+                raise e
+
+    def export_table(self, table_name, file_path, file_format='csv', columns=None, predicate=None,
+                     compression=None, batch_size=STREAM_BATCH_SIZE):
+        if file_format not in EXPORT_FORMATS:
+            raise ValueError(f"Непідтримуваний формат експорту {file_format}.")
+        _, selected = self._table_projection(table_name, columns)
+        query = select(*selected)
+        if predicate is not None:
+            _, condition = self._row_selection(table_name, None, None, predicate)
+            query = query.where(condition)
 
-    def generate_data(self, table_name, count):
         try:
-            self.cursor.execute(
-                """
-                SELECT column_name, data_type 
-                FROM information_schema.columns 
-                WHERE table_name = %s AND table_schema = 'public'
-                """,
-                (table_name.lower(),)
+            # Серверний курсор віддає рядки порціями по batch_size, і кожна
+            # порція одразу записується у файл.
+            with self._connect('export_table') as connection, open_export(file_path, compression) as output:
+                result = connection.execution_options(stream_results=True, max_row_buffer=batch_size).execute(query)
+                return write_rows(output, file_format, [column.name for column in selected],
+                                  result.partitions(batch_size))
+        except SQLAlchemyError as e:
+            raise Exception(f"Помилка експорту даних таблиці: {e}")
+
+    # Портфель дослідника: проєкти, експерименти і публікації. selectinload
+    # завантажує кожен зв'язок одним запитом WHERE ... IN (...) для всіх
+    # дослідників вибірки; з eager=False зв'язки вантажаться ліниво - по
+    # запиту на кожного дослідника і зв'язок (N+1), це лише для порівняння.
+    def researcher_portfolio(self, researcher_id=None, limit=REPORT_LIMIT, eager=True):
+        query = select(Researcher).order_by(Researcher.researcher_id)
+        if eager:
+            query = query.options(
+                selectinload(Researcher.projects),
+                selectinload(Researcher.experiments),
+                selectinload(Researcher.publications),
             )
-            columns_info = self.cursor.fetchall()
-
-            if not columns_info:
-                raise ValueError(f"Таблиця {table_name} не має стовпців або неправильна назва таблиці.")
-
-            self.cursor.execute(
-                """
-                SELECT kcu.column_name
-                FROM information_schema.table_constraints tc
-                JOIN information_schema.key_column_usage kcu
-                ON tc.constraint_name = kcu.constraint_name
-                AND tc.table_schema = kcu.table_schema
-                WHERE tc.constraint_type = 'PRIMARY KEY'
-                AND tc.table_name = %s
-                AND tc.table_schema = 'public'
-                """,
-                (table_name.lower(),)
+        if researcher_id is not None:
+            query = query.where(Researcher.researcher_id == int(researcher_id))
+        elif limit is not None:
+            query = query.limit(limit)
+
+        with self.recorder.operation('researcher_portfolio'):
+            session = self._session()
+            try:
+                return [
+                    (
+                        researcher.researcher_id,
+                        f"{researcher.first_name} {researcher.last_name}",
+                        researcher.specialization,
+                        [project.title for project in researcher.projects],
+                        [experiment.experiment_id for experiment in researcher.experiments],
+                        [(publication.title, publication.year, publication.journal)
+                         for publication in researcher.publications],
+                    )
+                    for researcher in session.scalars(query)
+                ]
+            except SQLAlchemyError as e:
+                raise Exception(f"Помилка побудови звіту: {e}")
+            finally:
+                session.close()
+
+    def _project_outputs_query(self):
+        researchers = (
+            select(ResearcherProject.research_project_id,
+                   func.count(ResearcherProject.researcher_id.distinct()).label('researchers'))
+            .group_by(ResearcherProject.research_project_id)
+            .subquery()
+        )
+        experiments = (
+            select(Experiment.research_project_id, func.count().label('experiments'))
+            .group_by(Experiment.research_project_id)
+            .subquery()
+        )
+        publications = (
+            select(Publication.research_project_id, func.count().label('publications'))
+            .group_by(Publication.research_project_id)
+            .subquery()
+        )
+        # Кожна таблиця агрегується окремо і лише потім з'єднується з проєктами,
+        # тож рядки junction-таблиць не перемножуються між собою.
+        return (
+            select(
+                ResearchProject.research_project_id,
+                ResearchProject.title,
+                func.coalesce(researchers.c.researchers, 0).label('researchers'),
+                func.coalesce(experiments.c.experiments, 0).label('experiments'),
+                func.coalesce(publications.c.publications, 0).label('publications'),
             )
-            pk_info = self.cursor.fetchone()
-            if pk_info:
-                id_column = pk_info[0]
-            else:
-                raise ValueError(f"Таблиця {table_name} не має первинного ключа.")
-
-            for _ in range(count):
-                insert_query = f'INSERT INTO {table_name} ('
-                select_subquery = ""
-
-                for column_info in columns_info:
-                    column_name = column_info[0]
-                    column_type = column_info[1]
-
-                    if column_name == id_column:
-                        select_subquery += f"(SELECT COALESCE(MAX({id_column}), 0) + 1 FROM {table_name}),"
-                    elif column_name.endswith('_id') and column_name != id_column:
-                        related_table_name = column_name[:-3]
-                        select_subquery += f"(SELECT {related_table_name}_id FROM {related_table_name} ORDER BY RANDOM() LIMIT 1),"
-                    elif column_type == 'integer':
-                        if column_name.lower() == 'year':
-                            select_subquery += '(2000 + FLOOR(RANDOM() * 100)),' 
-                        else:
-                            select_subquery += 'FLOOR(RANDOM() * 100 + 1),'
-                    elif column_type in ['character varying', 'varchar']:
-                        select_subquery += f"'Random {column_name} ' || substr(md5(random()::text), 1, 5),"
-                    elif column_type == 'date':
-                        if column_name == 'end_date':
-                            select_subquery += "current_date + (FLOOR(RANDOM() * 365))::int,"
-                        else:
-                            select_subquery += "current_date - (FLOOR(RANDOM() * 365))::int,"
-                    elif column_type == 'timestamp with time zone':
-                        if column_name == 'end_date':
-                            select_subquery += "NOW() + (FLOOR(RANDOM() * 365) || ' days')::interval,"
-                        else:
-                            select_subquery += "NOW() - (FLOOR(RANDOM() * 365) || ' days')::interval,"
-                    else:
-                        select_subquery += 'NULL,'
-
-                    insert_query += f'{column_name},'
-
-                insert_query = insert_query.rstrip(',') + f') VALUES ({select_subquery.rstrip(",")})'
-                self.cursor.execute(insert_query)
-
-            self.connection.commit()
+            .outerjoin(researchers, researchers.c.research_project_id == ResearchProject.research_project_id)
+            .outerjoin(experiments, experiments.c.research_project_id == ResearchProject.research_project_id)
+            .outerjoin(publications, publications.c.research_project_id == ResearchProject.research_project_id)
+        )
+
+    def _publications_per_year_query(self):
+        return (
+            select(Publication.year, Publication.journal, func.count().label('publications'))
+            .group_by(Publication.year, Publication.journal)
+        )
+
+    def project_output_counts(self, use_view=False):
+        return self._report('report_project_outputs', self._project_outputs_query(), use_view)
+
+    def publications_per_year(self, use_view=False):
+        return self._report('report_publications_per_year', self._publications_per_year_query(), use_view)
+
+    def _report(self, view_name, query, use_view):
+        order = REPORT_VIEWS[view_name]
+        try:
+            with self._connect(view_name) as connection:
+                if use_view:
+                    result = connection.exec_driver_sql(f"SELECT * FROM {view_name} ORDER BY {order}")
+                else:
+                    result = connection.execute(query.order_by(text(order)))
+                return [tuple(row) for row in result]
+        except SQLAlchemyError as e:
+            raise Exception(f"Помилка побудови звіту: {e}")
+
+    def create_report_views(self):
+        queries = {
+            'report_project_outputs': self._project_outputs_query(),
+            'report_publications_per_year': self._publications_per_year_query(),
+        }
+        try:
+            with self._connect('create_report_views') as connection:
+                for view_name, key in REPORT_VIEWS.items():
+                    definition = queries[view_name].compile(
+                        dialect=postgresql.dialect(), compile_kwargs={'literal_binds': True}
+                    )
+                    connection.exec_driver_sql(f"CREATE MATERIALIZED VIEW IF NOT EXISTS {view_name} AS {definition}")
+                    connection.exec_driver_sql(
+                        f"CREATE UNIQUE INDEX IF NOT EXISTS {view_name}_key ON {view_name} ({key})"
+                    )
+        except SQLAlchemyError as e:
+            raise Exception(f"Помилка створення подань звітів: {e}")
+
+    # CONCURRENTLY не блокує читання звітів, поки подання перераховується.
+    def refresh_report_views(self):
+        try:
+            with self._connect('refresh_report_views') as connection:
+                for view_name in REPORT_VIEWS:
+                    connection.exec_driver_sql(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view_name}")
+        except SQLAlchemyError as e:
+            raise Exception(f"Помилка оновлення подань звітів: {e}")
+
+    def missing_indexes(self, filter_columns=None):
+        return missing_indexes(self.catalog, filter_columns)
+
+    # Створює відсутні індекси і повертає (створені індекси, плани до, плани
+    # після). CREATE INDEX CONCURRENTLY не блокує запис у таблицю, але не може
+    # виконуватись у транзакції, тож з'єднання на цей час переходить в autocommit.
+    def create_missing_indexes(self, concurrently=False, filter_columns=None, explain=True):
+        if concurrently and getattr(self.pinned, 'connection', None) is not None:
+            raise ValueError("CREATE INDEX CONCURRENTLY не можна виконати всередині транзакції.")
+        columns = missing_indexes(self.catalog, filter_columns)
+        before = self.explain_queries(columns) if explain else []
+
+        created = []
+        with self._raw_connection('create_missing_indexes') as connection:
+            if concurrently:
+                connection.dbapi_connection.autocommit = True
+            try:
+                cursor = connection.cursor()
+                for table, column, _ in columns:
+                    cursor.execute(create_index_query(table, column, concurrently))
+                    created.append(index_name(table, column))
+                self._commit(connection)
+            except psycopg2.Error as e:
+                self._rollback(connection)
+                if concurrently:
+                    # Перерваний CREATE INDEX CONCURRENTLY залишає невалідний
+                    # індекс, який IF NOT EXISTS далі пропускав би.
+                    connection.cursor().execute(
+                        f"DROP INDEX CONCURRENTLY IF EXISTS {index_name(table, column)}"
+                    )
+                raise Exception(f"Помилка створення індексів: {e}")
+            finally:
+                if concurrently:
+                    connection.dbapi_connection.autocommit = False
+
+        self.refresh_catalog()
+        after = self.explain_queries(columns) if explain else []
+        return created, before, after
+
+    # EXPLAIN ANALYZE виконує запит насправді, тож після замірів транзакція
+    # відкочується і блокування FOR KEY SHARE знімаються.
+    def explain_queries(self, columns=None):
+        if columns is None:
+            columns = missing_indexes(self.catalog)
+        plans = []
+        with self._raw_connection('explain_queries') as connection:
+            cursor = connection.cursor()
+            try:
+                for label, table, query in explain_targets(self.catalog, columns):
+                    cursor.execute(query)
+                    plans.append(plan_summary(label, table, cursor.fetchone()[0]))
+            except psycopg2.Error as e:
+                raise Exception(f"Помилка отримання плану запиту: {e}")
+            finally:
+                self._rollback(connection)
+        return plans
+
+    def result_cache_stats(self):
+        return self.results.stats()
+
+    def slow_statements(self, limit=SLOW_STATEMENTS_LIMIT):
+        return self.recorder.slowest(limit)
+
+    def latency_histograms(self):
+        return self.recorder.latency_histograms()
+
+    def export_query_stats(self, file_path):
+        try:
+            return self.recorder.export_json(file_path)
+        except OSError as e:
+            raise Exception(f"Помилка експорту статистики запитів: {e}")
+
+    def close_connection(self):
+        if self._engine is None:
+            return
+        try:
+            self._engine.dispose()
         except Exception as e:
-            self.connection.rollback()
-            raise e
+            raise Exception(f"Помилка закриття підключення: {e}")
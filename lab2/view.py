@@ -1,4 +1,15 @@
+import sys
+
+from common.render import RENDER_CHUNK_SIZE, TableRenderer, page, pager_available
+
+STATEMENT_PREVIEW_LENGTH = 120
+
+
 class View:
+    def __init__(self, output=None, pager=False):
+        self.output = open(output, 'w', encoding='utf-8', buffering=RENDER_CHUNK_SIZE) if output else None
+        self.pager = pager
+
     def display_menu(self):
         print("\nМеню:")
         print("1. Вивід назв таблиць")
@@ -8,19 +19,79 @@ class View:
         print("5. Оновлення даних в таблиці")
         print("6. Видалення даних в таблиці")
         print("7. Генерування даних в таблицю")
-        print("8. Вихід")
+        print("8. Імпорт даних з CSV-файлу")
+        print("9. Пакетне додавання даних з CSV-файлу (з пропуском помилкових рядків)")
+        print("10. Посторінковий перегляд даних у таблиці")
+        print("11. Оновлення кешу схеми бази даних")
+        print("12. Генерування даних для всієї схеми")
+        print("13. Масове оновлення даних (за списком id, діапазоном id або умовою)")
+        print("14. Масове видалення даних (за списком id, діапазоном id або умовою)")
+        print("15. Найповільніші запити та гістограми затримок")
+        print("16. Експорт статистики запитів у JSON")
+        print("17. Статистика кешу результатів читання")
+        print("18. Експорт даних таблиці у файл (CSV або JSON Lines)")
+        print("19. Звіти (портфель дослідника, результати проєктів, публікації за роками)")
+        print("20. Порадник індексів (відсутні індекси та EXPLAIN ANALYZE до і після)")
+        print("21. Генерування зв'язків багато-до-багатьох (унікальні пари, рівномірний або Zipf-розподіл)")
+        print("0. Вихід")
         return input("Оберіть опцію: ").strip()
 
+    # Таблиця пишеться у файл --output, у пейджер (--pager, лише в
+    # терміналі) або в stdout. Якщо користувач вийшов з пейджера раніше,
+    # решта рядків не читається.
     def display_result(self, result):
-        if not result:
-            print("Немає даних для відображення.")
+        if self.output is not None:
+            count = TableRenderer(self.output).render(result)
+            print(f"Виведено {count} рядків у файл {self.output.name}." if count else "Немає даних для відображення.")
+            return
+
+        if self.pager and pager_available():
+            count = page(result)
         else:
-            for row in result:
-                print(row)
+            count = TableRenderer(sys.stdout).render(result)
+        if count == 0:
+            print("Немає даних для відображення.")
+
+    def close(self):
+        if self.output is not None:
+            self.output.close()
 
     def display_message(self, message):
         print(message)
 
+    def display_row_errors(self, errors):
+        for index, message in errors:
+            print(f"Рядок {index}: {message}")
+
+    def display_slow_statements(self, statements):
+        if not statements:
+            print("Запити ще не виконувались.")
+            return
+        for stats in statements:
+            print(f"[{stats['operation']}] {stats['statement'][:STATEMENT_PREVIEW_LENGTH]}")
+            print(f"    викликів: {stats['calls']}, разом: {stats['total_ms']:.1f} мс, "
+                  f"середнє: {stats['mean_ms']:.2f} мс, макс.: {stats['max_ms']:.2f} мс, "
+                  f"рядків: {stats['rows']}, помилок: {stats['errors']}")
+
+    def display_latency_histograms(self, histograms):
+        for operation, histogram in histograms.items():
+            buckets = ', '.join(f"{label}: {count}" for label, count in histogram['buckets'].items() if count)
+            print(f"{operation} ({histogram['calls']} запитів, {histogram['total_ms']:.1f} мс): {buckets}")
+
+    def display_cache_stats(self, title, stats):
+        print(f"{title}: " + ', '.join(f"{name}: {value}" for name, value in stats.items()))
+
+    def display_portfolio(self, portfolio):
+        if not portfolio:
+            print("Немає даних для відображення.")
+        for researcher_id, name, specialization, projects, experiments, publications in portfolio:
+            print(f"{researcher_id}. {name} ({specialization})")
+            print(f"    проєкти ({len(projects)}): {', '.join(projects)}")
+            print(f"    експерименти ({len(experiments)}): {', '.join(map(str, experiments))}")
+            print(f"    публікації ({len(publications)}):")
+            for title, year, journal in publications:
+                print(f"        {title}, {journal}, {year}")
+
     def get_table_name(self):
         return input("Введіть назву таблиці: ").strip()
 
@@ -47,4 +118,128 @@ class View:
     def get_generate_data_params(self):
         table_name = self.get_table_name()
         count_input = input("Введіть кількість записів для генерації: ").strip()
-        return table_name, count_input
+        mode_input = input("Режим генерації (1 - по одному рядку, 2 - пакетний, 3 - COPY): ").strip()
+        return table_name, count_input, mode_input
+
+    def get_pairs_params(self):
+        table_name = self.get_table_name()
+        count_input = input("Введіть кількість пар для генерації: ").strip()
+        distribution_input = input("Розподіл зв'язків (1 - рівномірний, 2 - Zipf): ").strip()
+        skew_input = ''
+        if distribution_input == '2':
+            skew_input = input("Параметр перекосу Zipf (порожньо - 1.1): ").strip()
+        return table_name, count_input, distribution_input, skew_input
+
+    def get_import_params(self):
+        table_name = self.get_table_name()
+        file_path = input("Введіть шлях до CSV-файлу (перший рядок - назви стовпців): ").strip()
+        return table_name, file_path
+
+    def get_page_params(self):
+        table_name = self.get_table_name()
+        page_size_input = input("Введіть кількість рядків на сторінці: ").strip()
+        return table_name, page_size_input
+
+    def get_page_command(self):
+        return input("n - наступна сторінка, p - попередня, q - вихід: ").strip().lower()
+
+    def get_seed_params(self):
+        count_input = input("Введіть кількість записів для кожної таблиці: ").strip()
+        mode_input = input("Режим генерації (1 - по одному рядку, 2 - пакетний, 3 - COPY): ").strip()
+        workers_input = input("Введіть кількість паралельних потоків: ").strip()
+        return count_input, mode_input, workers_input
+
+    def get_view_params(self):
+        table_name = self.get_table_name()
+        columns_input = input("Введіть назви стовпців через кому (порожньо - усі стовпці): ").strip()
+        columns = [col.strip() for col in columns_input.split(',') if col.strip()]
+        return table_name, columns
+
+    def get_row_selection(self):
+        choice = input("Спосіб вибору рядків (1 - список id, 2 - діапазон id, 3 - умова): ").strip()
+        if choice == '1':
+            ids_input = input("Введіть id через кому: ")
+            return {'ids': [row_id.strip() for row_id in ids_input.split(',') if row_id.strip()]}
+        if choice == '2':
+            low = input("Введіть початковий id: ").strip()
+            high = input("Введіть кінцевий id: ").strip()
+            return {'id_range': (low, high)}
+        if choice == '3':
+            condition = input("Введіть умову (<стовпець> <оператор> <значення>, напр. year < 2005): ")
+            parts = condition.split(maxsplit=2)
+            if len(parts) != 3:
+                raise ValueError("Умова повинна мати формат: <стовпець> <оператор> <значення>.")
+            return {'predicate': tuple(parts)}
+        raise ValueError("Невірний спосіб вибору рядків.")
+
+    def get_update_many_data(self):
+        table_name = self.get_table_name()
+        column = input("Введіть назву стовпчика для оновлення: ").strip()
+        new_value = input("Введіть нове значення: ").strip()
+        return table_name, column, new_value
+
+    def get_slow_statements_limit(self):
+        return input("Введіть кількість запитів для відображення: ").strip()
+
+    def get_export_path(self):
+        return input("Введіть шлях до JSON-файлу: ").strip()
+
+    def get_export_params(self):
+        table_name = self.get_table_name()
+        file_path = input("Введіть шлях до файлу (.gz, .bz2, .xz - зі стисненням): ").strip()
+        format_input = input("Формат (1 - CSV, 2 - JSON Lines): ").strip()
+        columns_input = input("Введіть назви стовпців через кому (порожньо - усі стовпці): ").strip()
+        columns = [col.strip() for col in columns_input.split(',') if col.strip()]
+        condition = input("Введіть умову (<стовпець> <оператор> <значення>, порожньо - усі рядки): ").strip()
+        predicate = None
+        if condition:
+            parts = condition.split(maxsplit=2)
+            if len(parts) != 3:
+                raise ValueError("Умова повинна мати формат: <стовпець> <оператор> <значення>.")
+            predicate = tuple(parts)
+        return table_name, file_path, format_input, columns, predicate
+
+    def get_report_params(self):
+        print("1. Портфель дослідника")
+        print("2. Кількість дослідників, експериментів і публікацій за проєктами")
+        print("3. Кількість публікацій за роками і журналами")
+        print("4. Створити або оновити матеріалізовані подання звітів")
+        choice = input("Оберіть звіт: ").strip()
+        use_view = False
+        if choice in ('2', '3'):
+            use_view = input("Читати з матеріалізованого подання? (y/n): ").strip().lower() == 'y'
+        return choice, use_view
+
+    def get_report_researcher_id(self):
+        return input("Введіть id дослідника (порожньо - перші 100 дослідників): ").strip()
+
+    def get_index_params(self):
+        columns_input = input("Додаткові стовпці фільтрації через кому (<таблиця>.<стовпець>, порожньо - немає): ")
+        filter_columns = []
+        for item in columns_input.split(','):
+            if item.strip():
+                parts = item.strip().split('.')
+                if len(parts) != 2:
+                    raise ValueError("Стовпець повинен мати формат: <таблиця>.<стовпець>.")
+                filter_columns.append(tuple(parts))
+        return filter_columns
+
+    def get_index_confirmation(self):
+        create = input("Створити відсутні індекси? (y/n): ").strip().lower() == 'y'
+        concurrently = create and input("Створювати без блокування запису (CONCURRENTLY)? (y/n): ").strip().lower() == 'y'
+        return create, concurrently
+
+    def display_missing_indexes(self, columns):
+        if not columns:
+            print("Усі зовнішні ключі та стовпці фільтрації вже мають індекси.")
+            return
+        for table, column, reason in columns:
+            print(f"{table}.{column} ({reason})")
+
+    def display_plan_comparison(self, before, after):
+        for old, new in zip(before, after):
+            print(old['query'])
+            for title, plan in (("до", old), ("після", new)):
+                print(f"    {title}: {plan['access']}, планування: {plan['planning_ms']:.2f} мс, "
+                      f"виконання: {plan['execution_ms']:.2f} мс, "
+                      f"сторінок з кешу: {plan['shared_hit']}, з диска: {plan['shared_read']}")
@@ -0,0 +1,252 @@
+import asyncio
+import time
+
+import asyncpg
+
+from common.catalog import CATALOG_QUERY, SchemaCatalog
+from common.generation import bulk_insert_query
+from common.id_allocator import IdAllocator
+from common.junction import junction_references
+from common.values import ValueEngine
+
+POOL_MIN_SIZE = 1
+POOL_MAX_SIZE = 20
+
+
+# Асинхронний варіант Model на asyncpg: кожна операція бере з'єднання з пулу
+# лише на час виконання, тож з одного циклу подій можна запускати сотні
+# незалежних операцій одночасно (asyncio.gather).
+class AsyncModel:
+    def __init__(self, pool, value_seed=None):
+        self.pool = pool
+        self.catalog = SchemaCatalog()
+        self.values = ValueEngine(value_seed)
+        self.ids = IdAllocator()
+        self.ids_lock = asyncio.Lock()
+
+    @classmethod
+    async def connect(cls, db_name, user, password, host='localhost', port='5432', pool_size=POOL_MAX_SIZE,
+                      value_seed=None):
+        try:
+            pool = await asyncpg.create_pool(
+                database=db_name, user=user, password=password, host=host, port=int(port),
+                min_size=min(POOL_MIN_SIZE, pool_size), max_size=pool_size
+            )
+        except (OSError, asyncpg.PostgresError) as e:
+            raise ConnectionError(f"Помилка підключення до бази даних: {e}")
+
+        model = cls(pool, value_seed)
+        await model.refresh_catalog()
+        return model
+
+    async def refresh_catalog(self):
+        try:
+            async with self.pool.acquire() as connection:
+                self.catalog.load(await connection.fetch(CATALOG_QUERY))
+        except asyncpg.PostgresError as e:
+            raise Exception(f"Помилка завантаження схеми бази даних: {e}")
+
+    async def list_tables(self):
+        return [(table,) for table in self.catalog.tables()]
+
+    async def list_columns(self, table_name):
+        return [(column,) for column, _ in self.catalog.table_columns(table_name)]
+
+    async def view_table_data(self, table_name):
+        identifier_column = self.catalog.primary_key(table_name) or f'{table_name.lower()}_id'
+        try:
+            async with self.pool.acquire() as connection:
+                rows = await connection.fetch(f"SELECT * FROM {table_name} ORDER BY {identifier_column}")
+            return [tuple(row) for row in rows]
+        except asyncpg.PostgresError as e:
+            raise Exception(f"Помилка перегляду даних таблиці: {e}")
+
+    async def insert_data(self, table_name, columns, values):
+        if len(columns) != len(values):
+            raise ValueError("Кількість стовпців не відповідає кількості значень.")
+
+        placeholders = ', '.join(
+            self._placeholder(table_name, column, position) for position, column in enumerate(columns, start=1)
+        )
+        query = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})"
+        id_column = self.catalog.primary_key(table_name) or f'{table_name.lower()}_id'
+        try:
+            async with self.pool.acquire() as connection:
+                async with connection.transaction():
+                    for column, value in zip(columns, values):
+                        if column == id_column:
+                            try:
+                                value = int(value)
+                            except ValueError:
+                                raise ValueError(
+                                    f"Значення ідентифікатора повинно бути цілим числом для стовпця {column}."
+                                )
+
+                            if await self._value_exists(connection, table_name, column, value):
+                                raise ValueError("Ідентифікатор вже існує.")
+                        elif self.catalog.reference(table_name, column) is not None:
+                            try:
+                                value = int(value)
+                            except ValueError:
+                                raise ValueError(f"Значення для {column} повинно бути цілим числом.")
+
+                            referenced_table, referenced_column, _ = self.catalog.reference(table_name, column)
+                            if not await self._value_exists(connection, referenced_table, referenced_column, value):
+                                raise ValueError(f"Значення зовнішнього ключа для {column} не існує.")
+
+                    await connection.execute(query, *[self._text(value) for value in values])
+            if id_column in columns:
+                self.ids.forget(table_name)
+        except asyncpg.IntegrityConstraintViolationError as e:
+            raise ValueError(f"Помилка вставки даних (можливо, порушення обмежень цілісності): {e}")
+
+    async def update_data(self, table_name, column, row_id, new_value):
+        identifier_column = self.catalog.primary_key(table_name) or f'{table_name.lower()}_id'
+        try:
+            row_id = int(row_id)
+        except ValueError:
+            raise ValueError("Значення ідентифікатора повинно бути цілим числом.")
+
+        query = (
+            f"UPDATE {table_name} SET {column} = {self._placeholder(table_name, column, 1)} "
+            f"WHERE {identifier_column} = $2"
+        )
+        try:
+            async with self.pool.acquire() as connection:
+                async with connection.transaction():
+                    if column == identifier_column:
+                        try:
+                            val_id = int(new_value)
+                        except ValueError:
+                            raise ValueError("Значення ідентифікатора повинно бути цілим числом.")
+
+                        if await self._value_exists(connection, table_name, identifier_column, val_id):
+                            raise ValueError("Ідентифікатор вже існує.")
+                    elif self.catalog.reference(table_name, column) is not None:
+                        try:
+                            val_id = int(new_value)
+                        except ValueError:
+                            raise ValueError(f"Значення для {column} повинно бути цілим числом.")
+
+                        referenced_table, referenced_column, _ = self.catalog.reference(table_name, column)
+                        if not await self._value_exists(connection, referenced_table, referenced_column, val_id):
+                            raise ValueError(f"Значення зовнішнього ключа для {column} не існує.")
+
+                    status = await connection.execute(query, self._text(new_value), row_id)
+                    if self._affected_rows(status) == 0:
+                        raise ValueError(f"Рядок з id {row_id} не знайдено в таблиці {table_name}.")
+            if column == identifier_column:
+                self.ids.forget(table_name)
+        except asyncpg.IntegrityConstraintViolationError as e:
+            raise ValueError(f"Помилка оновлення даних (можливо, порушення обмежень цілісності): {e}")
+
+    async def delete_data(self, table_name, row_id):
+        identifier_column = self.catalog.primary_key(table_name) or f'{table_name.lower()}_id'
+        try:
+            row_id = int(row_id)
+        except ValueError:
+            raise ValueError("Значення ідентифікатора повинно бути цілим числом.")
+
+        try:
+            async with self.pool.acquire() as connection:
+                status = await connection.execute(
+                    f"DELETE FROM {table_name} WHERE {identifier_column} = $1", row_id
+                )
+        except asyncpg.IntegrityConstraintViolationError as e:
+            raise ValueError(f"Помилка видалення даних (можливо, є залежні записи): {e}")
+        if self._affected_rows(status) == 0:
+            raise ValueError(f"Рядок з id {row_id} не знайдено в таблиці {table_name}.")
+
+    # На відміну від Model, підтримується лише режим bulk (він і за
+    # замовчуванням): режими row і copy читають ключі батьківських таблиць
+    # через psycopg2-курсор ForeignKeySampler. Таблиці зв'язку відхиляються:
+    # незалежний вибір двох батьків дає повторні пари, а унікальні пари
+    # генерує лише Model.generate_pairs.
+    async def generate_data(self, table_name, count, mode='bulk', first_id=None):
+        if mode != 'bulk':
+            raise ValueError(f"Режим генерації {mode} не підтримується асинхронною моделлю.")
+        if not self.catalog.is_table(table_name):
+            raise ValueError(f"{table_name} не є таблицею, дані для неї не генеруються.")
+        if junction_references(self.catalog, table_name) is not None:
+            raise ValueError(
+                f"Таблиця {table_name} є таблицею зв'язку: пари для неї генерує лише синхронна модель."
+            )
+
+        columns_info = self.catalog.table_columns(table_name)
+        if not columns_info:
+            raise ValueError(f"Таблиця {table_name} не має стовпців або неправильна назва таблиці.")
+
+        id_column = self.catalog.primary_key(table_name)
+        if id_column is None:
+            raise ValueError(f"Таблиця {table_name} не має первинного ключа.")
+
+        started = time.perf_counter()
+        async with self.pool.acquire() as connection:
+            if first_id is None:
+                id_ranges = await self._reserve_identifiers(connection, table_name, id_column, count)
+            else:
+                id_ranges = [(first_id, count)]
+            async with connection.transaction():
+                # Зарезервовані блоки зазвичай суміжні, тож це один INSERT.
+                base_date = self.values.server_base_date()
+                for range_first, range_count in id_ranges:
+                    seed = self.values.server_seed(table_name, range_first)
+                    if seed is not None:
+                        await connection.execute('SELECT setseed($1)', seed)
+                    await connection.execute(bulk_insert_query(
+                        self.catalog, table_name, range_count, columns_info, id_column, range_first, base_date
+                    ))
+        if first_id is not None:
+            self.ids.forget(table_name)
+        return count / max(time.perf_counter() - started, 1e-9)
+
+    # Блоки id беруться з тієї ж послідовності <таблиця>_id_block, що й у
+    # синхронної Model, тож записувачі обох моделей не отримають однакових id.
+    # asyncio.Lock замість блокування потоків: між запитами цикл подій
+    # перемикається на інші операції, що теж резервують id.
+    async def _reserve_identifiers(self, connection, table_name, id_column, count):
+        async with self.ids_lock:
+            try:
+                if not self.ids.is_prepared(table_name):
+                    lock, create, state = self.ids.prepare_queries(table_name, id_column)
+                    async with connection.transaction():
+                        await connection.execute(lock)
+                        await connection.execute(create)
+                        value = self.ids.sync_value(*await connection.fetchrow(state))
+                        if value is not None:
+                            await connection.execute(self.ids.setval_query(table_name, value))
+                    self.ids.mark_prepared([table_name])
+
+                blocks = []
+                missing = self.ids.missing_blocks(table_name, count)
+                if missing:
+                    blocks = [row[0] for row in await connection.fetch(self.ids.nextval_query(table_name, missing))]
+            except asyncpg.PostgresError as e:
+                raise Exception(f"Помилка резервування ідентифікаторів: {e}")
+            return self.ids.take(table_name, count, blocks)
+
+    async def _value_exists(self, connection, table_name, column, value):
+        return await connection.fetchval(
+            f'SELECT EXISTS (SELECT 1 FROM {table_name} WHERE {column} = $1)', value
+        )
+
+    # asyncpg передає параметри в бінарному вигляді і не перетворює рядки в
+    # числа чи дати, тому значення передаються як text і приводяться до типу
+    # стовпця на сервері - так само, як це відбувається з рядками в psycopg2.
+    def _placeholder(self, table_name, column, position):
+        column_types = dict(self.catalog.table_columns(table_name))
+        if column not in column_types:
+            raise ValueError(f"Таблиця {table_name} не має стовпця {column}.")
+        return f'${position}::text::{column_types[column]}'
+
+    def _text(self, value):
+        return None if value is None else str(value)
+
+    def _affected_rows(self, status):
+        return int(status.split()[-1])
+
+    async def close_connection(self):
+        try:
+            await self.pool.close()
+        except Exception as e:
+            raise Exception(f"Помилка закриття підключення: {e}")
@@ -1,10 +1,18 @@
+import csv
+
+from common.junction import ZIPF_SKEW
+
 from model import Model
 from view import View
 
+GENERATION_MODES = {'1': 'row', '2': 'bulk', '3': 'copy'}
+EXPORT_FORMATS = {'1': 'csv', '2': 'jsonl'}
+PAIR_DISTRIBUTIONS = {'1': 'uniform', '2': 'zipf'}
+
 class Controller:
-    def __init__(self):
+    def __init__(self, output=None, pager=False):
         self.model = Model(db_name="postgres", user="postgres", password="root")
-        self.view = View()
+        self.view = View(output, pager)
 
     def run(self):
         while True:
@@ -24,7 +32,34 @@ class Controller:
             elif choice == '7':
                 self.generate_data()
             elif choice == '8':
+                self.import_csv()
+            elif choice == '9':
+                self.add_data_from_file()
+            elif choice == '10':
+                self.view_table_pages()
+            elif choice == '11':
+                self.refresh_catalog()
+            elif choice == '12':
+                self.seed_schema()
+            elif choice == '13':
+                self.update_many()
+            elif choice == '14':
+                self.delete_many()
+            elif choice == '15':
+                self.view_slow_statements()
+            elif choice == '16':
+                self.export_query_stats()
+            elif choice == '17':
+                self.view_cache_stats()
+            elif choice == '18':
+                self.export_table()
+            elif choice == '19':
+                self.advise_indexes()
+            elif choice == '20':
+                self.generate_pairs()
+            elif choice == '0':
                 self.model.close_connection()
+                self.view.close()
                 self.view.display_message("Вихід з програми.")
                 break
             else:
@@ -48,8 +83,40 @@ class Controller:
     def view_table_data(self):
         table_name = self.view.prompt("Введіть назву таблиці: ")
         try:
-            data = self.model.view_table_data(table_name)
-            self.view.display_result(data)
+            self.view.display_result(self.model.iter_table_data(table_name))
+        except Exception as e:
+            self.view.display_message(f"Помилка при перегляді даних таблиці {table_name}: {e}")
+
+    def view_table_pages(self):
+        table_name = self.view.prompt("Введіть назву таблиці: ")
+        page_size_input = self.view.prompt("Введіть кількість рядків на сторінці: ")
+
+        try:
+            page_size = int(page_size_input)
+        except ValueError:
+            self.view.display_message("Неправильний формат числа. Будь ласка, введіть ціле число.")
+            return
+
+        try:
+            rows, first_id, last_id = self.model.view_table_page(table_name, page_size)
+            self.view.display_result(rows)
+            while True:
+                command = self.view.prompt("n - наступна сторінка, p - попередня, q - вихід: ").strip().lower()
+                if command == 'n':
+                    page = self.model.view_table_page(table_name, page_size, after_id=last_id)
+                elif command == 'p':
+                    page = self.model.view_table_page(table_name, page_size, before_id=first_id)
+                elif command == 'q':
+                    break
+                else:
+                    self.view.display_message("Невірний вибір. Спробуйте ще раз.")
+                    continue
+
+                if not page[0]:
+                    self.view.display_message("Більше сторінок немає.")
+                    continue
+                rows, first_id, last_id = page
+                self.view.display_result(rows)
         except Exception as e:
             self.view.display_message(f"Помилка при перегляді даних таблиці {table_name}: {e}")
 
@@ -67,6 +134,23 @@ class Controller:
         except Exception as e:
             self.view.display_message(f"Помилка додавання даних: {e}")
 
+    def add_data_from_file(self):
+        table_name = self.view.prompt("Введіть назву таблиці: ")
+        file_path = self.view.prompt("Введіть шлях до CSV-файлу (перший рядок - назви стовпців): ").strip()
+
+        try:
+            with open(file_path, newline='', encoding='utf-8') as csv_file:
+                reader = csv.reader(csv_file)
+                columns = [column.strip() for column in next(reader, [])]
+                if not columns:
+                    raise ValueError(f"Файл {file_path} порожній.")
+                inserted, errors = self.model.insert_many(table_name, columns, reader)
+            self.view.display_message(f"Додано {inserted} записів, відхилено {len(errors)}.")
+            # Нумерація рядків даних у моделі починається з 1, а в файлі перший рядок - заголовок.
+            self.view.display_row_errors([(index + 1, message) for index, message in errors])
+        except Exception as e:
+            self.view.display_message(f"Помилка пакетного додавання даних: {e}")
+
     def update_data(self):
         table_name = self.view.prompt("Введіть назву таблиці: ")
         column = self.view.prompt("Введіть назву стовпчика для оновлення: ")
@@ -79,6 +163,45 @@ class Controller:
         except Exception as e:
             self.view.display_message(f"Помилка оновлення даних: {e}")
 
+    def update_many(self):
+        table_name = self.view.prompt("Введіть назву таблиці: ")
+        column = self.view.prompt("Введіть назву стовпчика для оновлення: ").strip()
+        new_value = self.view.prompt("Введіть нове значення: ")
+
+        try:
+            selection = self.prompt_row_selection()
+            count = self.model.update_many(table_name, column, new_value, **selection)
+            self.view.display_message(f"Оновлено {count} записів.")
+        except Exception as e:
+            self.view.display_message(f"Помилка оновлення даних: {e}")
+
+    def delete_many(self):
+        table_name = self.view.prompt("Введіть назву таблиці: ")
+
+        try:
+            selection = self.prompt_row_selection()
+            count = self.model.delete_many(table_name, **selection)
+            self.view.display_message(f"Видалено {count} записів.")
+        except Exception as e:
+            self.view.display_message(f"Помилка видалення даних: {e}")
+
+    def prompt_row_selection(self):
+        choice = self.view.prompt("Спосіб вибору рядків (1 - список id, 2 - діапазон id, 3 - умова): ").strip()
+        if choice == '1':
+            ids_input = self.view.prompt("Введіть id через кому: ")
+            return {'ids': [row_id.strip() for row_id in ids_input.split(',') if row_id.strip()]}
+        if choice == '2':
+            low = self.view.prompt("Введіть початковий id: ").strip()
+            high = self.view.prompt("Введіть кінцевий id: ").strip()
+            return {'id_range': (low, high)}
+        if choice == '3':
+            condition = self.view.prompt("Введіть умову (<стовпець> <оператор> <значення>, напр. year < 2005): ")
+            parts = condition.split(maxsplit=2)
+            if len(parts) != 3:
+                raise ValueError("Умова повинна мати формат: <стовпець> <оператор> <значення>.")
+            return {'predicate': tuple(parts)}
+        raise ValueError("Невірний спосіб вибору рядків.")
+
     def delete_data(self):
         table_name = self.view.prompt("Введіть назву таблиці: ")
         row_id = self.view.prompt("Введіть номер рядка для видалення: ")
@@ -92,6 +215,7 @@ class Controller:
     def generate_data(self):
         table_name = self.view.prompt("Введіть назву таблиці для генерації даних: ")
         count_input = self.view.prompt("Введіть кількість записів для генерації: ")
+        mode_input = self.view.prompt("Режим генерації (1 - по одному рядку, 2 - пакетний, 3 - COPY): ")
 
         try:
             count = int(count_input)
@@ -99,8 +223,150 @@ class Controller:
             self.view.display_message("Неправильний формат числа. Будь ласка, введіть ціле число.")
             return
 
+        mode = GENERATION_MODES.get(mode_input.strip(), 'row')
         try:
-            self.model.generate_data(table_name, count)
-            self.view.display_message(f"Успішно згенеровано {count} записів для таблиці {table_name}.")
+            rate = self.model.generate_data(table_name, count, mode)
+            self.view.display_message(
+                f"Успішно згенеровано {count} записів для таблиці {table_name} ({rate:.0f} записів/с)."
+            )
         except Exception as e:
             self.view.display_message(f"Помилка генерації даних для таблиці {table_name}: {e}")
+
+    def generate_pairs(self):
+        table_name = self.view.prompt("Введіть назву таблиці зв'язку: ")
+        count_input = self.view.prompt("Введіть кількість пар для генерації: ")
+        distribution = PAIR_DISTRIBUTIONS.get(
+            self.view.prompt("Розподіл зв'язків (1 - рівномірний, 2 - Zipf): ").strip(), 'uniform'
+        )
+        skew_input = ''
+        if distribution == 'zipf':
+            skew_input = self.view.prompt("Параметр перекосу Zipf (порожньо - 1.1): ").strip()
+
+        try:
+            count = int(count_input)
+            skew = float(skew_input) if skew_input else ZIPF_SKEW
+        except ValueError:
+            self.view.display_message("Неправильний формат числа.")
+            return
+
+        try:
+            rate = self.model.generate_pairs(table_name, count, distribution, skew)
+            self.view.display_message(
+                f"Успішно згенеровано {count} унікальних пар для таблиці {table_name} ({rate:.0f} записів/с)."
+            )
+        except Exception as e:
+            self.view.display_message(f"Помилка генерації зв'язків для таблиці {table_name}: {e}")
+
+    def seed_schema(self):
+        count_input = self.view.prompt("Введіть кількість записів для кожної таблиці: ")
+        mode_input = self.view.prompt("Режим генерації (1 - по одному рядку, 2 - пакетний, 3 - COPY): ").strip()
+        workers_input = self.view.prompt("Введіть кількість паралельних потоків: ")
+
+        try:
+            count = int(count_input)
+            workers = int(workers_input)
+        except ValueError:
+            self.view.display_message("Неправильний формат числа. Будь ласка, введіть ціле число.")
+            return
+
+        mode = GENERATION_MODES.get(mode_input, 'bulk')
+        try:
+            counts = {table: count for (table,) in self.model.list_tables()}
+            total, rate = self.model.seed_schema(counts, mode, max(workers, 1))
+            self.view.display_message(
+                f"Успішно згенеровано {total} записів для {len(counts)} таблиць ({rate:.0f} записів/с)."
+            )
+        except Exception as e:
+            self.view.display_message(f"Помилка генерації даних для схеми: {e}")
+
+    def import_csv(self):
+        table_name = self.view.prompt("Введіть назву таблиці: ")
+        file_path = self.view.prompt("Введіть шлях до CSV-файлу (перший рядок - назви стовпців): ")
+
+        try:
+            count = self.model.import_csv(table_name, file_path.strip())
+            self.view.display_message(f"Імпортовано {count} записів у таблицю {table_name}.")
+        except Exception as e:
+            self.view.display_message(f"Помилка імпорту даних у таблицю {table_name}: {e}")
+
+    def refresh_catalog(self):
+        try:
+            self.model.refresh_catalog()
+            self.view.display_message("Схему бази даних оновлено.")
+        except Exception as e:
+            self.view.display_message(f"Помилка оновлення схеми бази даних: {e}")
+
+    def view_slow_statements(self):
+        limit_input = self.view.prompt("Введіть кількість запитів для відображення: ")
+
+        try:
+            limit = int(limit_input)
+        except ValueError:
+            self.view.display_message("Неправильний формат числа. Будь ласка, введіть ціле число.")
+            return
+
+        self.view.display_slow_statements(self.model.slow_statements(limit))
+        self.view.display_latency_histograms(self.model.latency_histograms())
+
+    def export_query_stats(self):
+        file_path = self.view.prompt("Введіть шлях до JSON-файлу: ").strip()
+
+        try:
+            count = self.model.export_query_stats(file_path)
+            self.view.display_message(f"Статистику {count} запитів збережено у файл {file_path}.")
+        except Exception as e:
+            self.view.display_message(f"Помилка експорту статистики запитів: {e}")
+
+    def view_cache_stats(self):
+        self.view.display_cache_stats("Кеш результатів читання", self.model.result_cache_stats())
+        self.view.display_cache_stats("Кеш підготовлених операторів", self.model.prepared_statement_stats())
+
+    def export_table(self):
+        table_name = self.view.prompt("Введіть назву таблиці: ")
+        file_path = self.view.prompt("Введіть шлях до файлу (.gz, .bz2, .xz - зі стисненням): ").strip()
+        format_input = self.view.prompt("Формат (1 - CSV, 2 - JSON Lines): ").strip()
+        columns_input = self.view.prompt("Введіть назви стовпців через кому (порожньо - усі стовпці): ")
+        condition = self.view.prompt("Введіть умову (<стовпець> <оператор> <значення>, порожньо - усі рядки): ")
+
+        columns = [column.strip() for column in columns_input.split(',') if column.strip()]
+        predicate = None
+        if condition.strip():
+            parts = condition.split(maxsplit=2)
+            if len(parts) != 3:
+                self.view.display_message("Умова повинна мати формат: <стовпець> <оператор> <значення>.")
+                return
+            predicate = tuple(parts)
+
+        try:
+            count = self.model.export_table(
+                table_name, file_path, EXPORT_FORMATS.get(format_input, 'csv'), columns, predicate
+            )
+            self.view.display_message(f"Експортовано {count} записів у файл {file_path}.")
+        except Exception as e:
+            self.view.display_message(f"Помилка експорту даних таблиці {table_name}: {e}")
+
+    def advise_indexes(self):
+        columns_input = self.view.prompt("Додаткові стовпці фільтрації через кому (<таблиця>.<стовпець>, порожньо - немає): ")
+
+        filter_columns = []
+        for item in columns_input.split(','):
+            if item.strip():
+                parts = item.strip().split('.')
+                if len(parts) != 2:
+                    self.view.display_message("Стовпець повинен мати формат: <таблиця>.<стовпець>.")
+                    return
+                filter_columns.append(tuple(parts))
+
+        try:
+            missing = self.model.missing_indexes(filter_columns)
+            self.view.display_missing_indexes(missing)
+            if not missing or self.view.prompt("Створити відсутні індекси? (y/n): ").strip().lower() != 'y':
+                return
+            concurrently = self.view.prompt(
+                "Створювати без блокування запису (CONCURRENTLY)? (y/n): "
+            ).strip().lower() == 'y'
+            created, before, after = self.model.create_missing_indexes(concurrently, filter_columns)
+            self.view.display_message(f"Створено індексів: {len(created)} ({', '.join(created)}).")
+            self.view.display_plan_comparison(before, after)
+        except Exception as e:
+            self.view.display_message(f"Помилка створення індексів: {e}")
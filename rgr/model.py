@@ -1,222 +1,704 @@
 import psycopg2
 from psycopg2 import OperationalError, IntegrityError
-import random
+from psycopg2.extensions import STATUS_READY
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
+import csv
+import itertools
+import threading
+from contextlib import contextmanager
 
-class Model:
-    def __init__(self, db_name, user, password, host='localhost', port='5432'):
+from common.advisor import create_index_query, explain_targets, index_name, missing_indexes, plan_summary
+from common.catalog import SchemaCatalog
+from common.export import EXPORT_FORMATS, open_export
+from common.id_allocator import IdAllocator, identifiers
+from common.instrumentation import QueryRecorder, SLOW_STATEMENTS_LIMIT
+from common.loader import CopyStream
+from common.result_cache import ResultCache
+from common.seeding import SeedingMixin
+from common.values import ValueEngine
+
+from statements import PreparedStatementCache, PreparingConnection
+
+INSERT_PAGE_SIZE = 1000
+VIEW_PAGE_SIZE = 20
+STREAM_BATCH_SIZE = 2000
+PREDICATE_OPERATORS = ('=', '!=', '<', '<=', '>', '>=')
+POOL_MIN_SIZE = 1
+POOL_MAX_SIZE = 10
+
+class Model(SeedingMixin):
+    def __init__(self, db_name, user, password, host='localhost', port='5432',
+                 pool_size=POOL_MAX_SIZE, pre_ping=True, value_seed=None):
         try:
-            self.connection = psycopg2.connect(
-                dbname=db_name, user=user, password=password, host=host, port=port
+            self.pool = ThreadedConnectionPool(
+                min(POOL_MIN_SIZE, pool_size), pool_size,
+                dbname=db_name, user=user, password=password, host=host, port=port,
+                connection_factory=PreparingConnection
             )
-            self.cursor = self.connection.cursor()
         except OperationalError as e:
             raise OperationalError(f"Помилка підключення до бази даних: {e}")
 
-    def list_tables(self):
+        # ThreadedConnectionPool не чекає на вільне з'єднання, а кидає PoolError,
+        # тому зайві паралельні виклики притримуються семафором.
+        self.slots = threading.BoundedSemaphore(pool_size)
+        self.pre_ping = pre_ping
+        self.cursor_names = itertools.count(1)
+        self.pinned = threading.local()
+        self.statements = PreparedStatementCache()
+        self.recorder = QueryRecorder()
+        self.results = ResultCache()
+        self.ids = IdAllocator()
+        self.values = ValueEngine(value_seed)
+        self.catalog = SchemaCatalog()
+        self.refresh_catalog()
+
+    @contextmanager
+    def _connection(self, operation):
+        pinned = getattr(self.pinned, 'connection', None)
+        if pinned is not None:
+            with self.recorder.operation(operation), self._savepoint(pinned):
+                yield pinned
+            return
+
+        with self.recorder.operation(operation), self.slots:
+            connection = self.pool.getconn()
+            if self.pre_ping:
+                connection = self._ping(connection)
+            connection.recorder = self.recorder
+            try:
+                yield connection
+            finally:
+                try:
+                    if connection.status != STATUS_READY:
+                        connection.rollback()
+                    self.pool.putconn(connection)
+                except psycopg2.Error:
+                    self.pool.putconn(connection, close=True)
+
+    # З'єднання пулу вже є psycopg2-з'єднаннями, тож SeedingMixin бере їх
+    # тим самим шляхом, що й решта операцій.
+    def _raw_connection(self, operation):
+        return self._connection(operation)
+
+    # Після перезапуску сервера застарілими можуть бути всі вільні з'єднання
+    # пулу, тож вони відкидаються по черзі, доки якесь не відповість. Якщо не
+    # відповіло й нове з'єднання, сервер недоступний.
+    def _ping(self, connection):
+        error = None
+        for attempt in range(self.pool.maxconn + 1):
+            if attempt:
+                connection = self.pool.getconn()
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+                connection.rollback()
+                return connection
+            except psycopg2.Error as e:
+                self.pool.putconn(connection, close=True)
+                error = e
+        raise OperationalError(f"Помилка підключення до бази даних: {error}")
+
+    # Усередині transaction() кожна операція виконується у власній точці
+    # збереження: помилка скасовує лише її, а не всю транзакцію.
+    @contextmanager
+    def _savepoint(self, connection):
+        with connection.cursor() as cursor:
+            cursor.execute('SAVEPOINT model_operation')
         try:
-            self.cursor.execute("SELECT table_name FROM information_schema.tables WHERE table_schema='public'")
-            return self.cursor.fetchall()
-        except Exception as e:
-            raise Exception(f"Помилка отримання таблиць: {e}")
+            yield
+        except BaseException:
+            with connection.cursor() as cursor:
+                cursor.execute('ROLLBACK TO SAVEPOINT model_operation')
+                cursor.execute('RELEASE SAVEPOINT model_operation')
+            raise
+        with connection.cursor() as cursor:
+            cursor.execute('RELEASE SAVEPOINT model_operation')
+
+    # Закріплює за потоком одне з'єднання: усі виклики Model до виходу з
+    # блоку стають однією транзакцією, яка фіксується в кінці. Кеш
+    # результатів скидається, бо в ньому могли опинитися незафіксовані дані.
+    @contextmanager
+    def transaction(self):
+        with self._connection('transaction') as connection:
+            self.pinned.connection = connection
+            try:
+                yield
+                connection.commit()
+            except BaseException:
+                # Відкат міг прибрати створені в транзакції послідовності id.
+                self.ids.clear()
+                raise
+            finally:
+                self.pinned.connection = None
+                self.results.clear()
+
+    def _commit(self, connection):
+        if connection is not getattr(self.pinned, 'connection', None):
+            connection.commit()
+
+    def _rollback(self, connection):
+        if connection is not getattr(self.pinned, 'connection', None):
+            connection.rollback()
+
+    # Готує послідовності id коротким окремим запитом, до того як операція
+    # візьме своє з'єднання з пулу. У межах transaction() підготовка не
+    # запам'ятовується, бо транзакцію ще можуть відкотити.
+    def _prepare_identifiers(self, tables):
+        pending = [table_name for table_name in tables if not self.ids.is_prepared(table_name)]
+        if not pending:
+            return
+        with self._connection('prepare_identifiers') as connection:
+            cursor = connection.cursor()
+            try:
+                for table_name in pending:
+                    id_column = self.catalog.primary_key(table_name)
+                    if id_column is None:
+                        raise ValueError(f"Таблиця {table_name} не має первинного ключа.")
+                    self.ids.prepare(cursor, table_name, id_column)
+                self._commit(connection)
+            except psycopg2.Error as e:
+                self._rollback(connection)
+                raise Exception(f"Помилка підготовки послідовності ідентифікаторів: {e}")
+            except Exception as e:
+                self._rollback(connection)
+                raise e
+        if getattr(self.pinned, 'connection', None) is None:
+            self.ids.mark_prepared(pending)
+
+    def refresh_catalog(self):
+        with self._connection('refresh_catalog') as connection:
+            try:
+                self.catalog.refresh(connection.cursor())
+                self._commit(connection)
+                self.statements.invalidate()
+                self.results.clear()
+            except Exception as e:
+                self._rollback(connection)
+                raise Exception(f"Помилка завантаження схеми бази даних: {e}")
+
+    def list_tables(self):
+        return [(table,) for table in self.catalog.tables()]
 
     def list_columns(self, table_name):
-        try:
-            self.cursor.execute(
-                "SELECT column_name FROM information_schema.columns WHERE table_name=%s AND table_schema='public'",
-                (table_name.lower(),)
-            )
-            return self.cursor.fetchall()
-        except Exception as e:
-            raise Exception(f"Помилка отримання стовпчиків: {e}")
+        return [(column,) for column, _ in self.catalog.table_columns(table_name)]
 
     def view_table_data(self, table_name):
-        try:
-            identifier_column = f'{table_name.lower()}_id'
-            self.cursor.execute(f"SELECT * FROM {table_name} ORDER BY {identifier_column}")
-            return self.cursor.fetchall()
-        except Exception as e:
-            self.connection.rollback()
-            raise Exception(f"Помилка перегляду даних таблиці: {e}")
+        key = ('view_table_data', table_name.lower())
+        rows = self.results.get(key)
+        if rows is not None:
+            return rows
+
+        version = self.results.version(table_name)
+        with self._connection('view_table_data') as connection:
+            cursor = connection.cursor()
+            try:
+                identifier_column = self.catalog.primary_key(table_name) or f'{table_name.lower()}_id'
+                cursor.execute(f"SELECT * FROM {table_name} ORDER BY {identifier_column}")
+                rows = cursor.fetchall()
+            except Exception as e:
+                self._rollback(connection)
+                raise Exception(f"Помилка перегляду даних таблиці: {e}")
+
+        self.results.put(key, table_name, rows, version, len(rows))
+        return rows
+
+    def iter_table_data(self, table_name, batch_size=STREAM_BATCH_SIZE):
+        key = ('view_table_data', table_name.lower())
+        rows = self.results.get(key)
+        if rows is not None:
+            yield from rows
+            return
+
+        # Прочитані рядки запам'ятовуються для кешу, лише поки їх не більше
+        # за ліміт кешу, тож для великих таблиць пам'ять не зростає.
+        collected = []
+        version = self.results.version(table_name)
+        identifier_column = self.catalog.primary_key(table_name) or f'{table_name.lower()}_id'
+        # З'єднання утримується, доки генератор не вичерпано або не закрито;
+        # відкат при поверненні в пул закриває і серверний курсор.
+        with self._connection('iter_table_data') as connection:
+            # Іменований курсор живе на сервері: клієнт отримує рядки порціями
+            # по batch_size, тож пам'ять не залежить від розміру таблиці.
+            cursor = connection.cursor(name=f'view_cursor_{next(self.cursor_names)}')
+            cursor.itersize = batch_size
+            try:
+                cursor.execute(f"SELECT * FROM {table_name} ORDER BY {identifier_column}")
+                for row in cursor:
+                    if collected is not None:
+                        collected.append(row)
+                        if len(collected) > self.results.max_rows:
+                            collected = None
+                    yield row
+            except Exception as e:
+                raise Exception(f"Помилка перегляду даних таблиці: {e}")
+
+        if collected is not None:
+            self.results.put(key, table_name, collected, version, len(collected))
+
+    def view_table_page(self, table_name, page_size=VIEW_PAGE_SIZE, after_id=None, before_id=None):
+        key = ('view_table_page', table_name.lower(), page_size, after_id, before_id)
+        page = self.results.get(key)
+        if page is not None:
+            return page
+
+        version = self.results.version(table_name)
+        with self._connection('view_table_page') as connection:
+            cursor = connection.cursor()
+            identifier_column = self.catalog.primary_key(table_name) or f'{table_name.lower()}_id'
+            try:
+                if before_id is not None:
+                    cursor.execute(
+                        f"SELECT * FROM (SELECT * FROM {table_name} WHERE {identifier_column} < %s "
+                        f"ORDER BY {identifier_column} DESC LIMIT %s) AS page ORDER BY {identifier_column}",
+                        (before_id, page_size)
+                    )
+                elif after_id is not None:
+                    cursor.execute(
+                        f"SELECT * FROM {table_name} WHERE {identifier_column} > %s ORDER BY {identifier_column} LIMIT %s",
+                        (after_id, page_size)
+                    )
+                else:
+                    cursor.execute(
+                        f"SELECT * FROM {table_name} ORDER BY {identifier_column} LIMIT %s", (page_size,)
+                    )
+                rows = cursor.fetchall()
+                key_index = [column.name for column in cursor.description].index(identifier_column)
+            except Exception as e:
+                self._rollback(connection)
+                raise Exception(f"Помилка перегляду даних таблиці: {e}")
+
+        page = (rows, rows[0][key_index], rows[-1][key_index]) if rows else (rows, None, None)
+        self.results.put(key, table_name, page, version, len(rows))
+        return page
 
     def insert_data(self, table_name, columns, values):
+        # Якщо id не вказано, він береться з зарезервованого блоку.
+        id_column = self.catalog.primary_key(table_name)
+        assign_id = id_column is not None and id_column not in columns
+        if assign_id:
+            self._prepare_identifiers([table_name])
+
+        with self._connection('insert_data') as connection:
+            cursor = connection.cursor()
+            try:
+                if len(columns) != len(values):
+                    raise ValueError("Кількість стовпців не відповідає кількості значень.")
+
+                for column, value in zip(columns, values):
+                    if column == f'{table_name.lower()}_id':
+                        try:
+                            value = int(value)
+                        except ValueError:
+                            raise ValueError(f"Значення ідентифікатора повинно бути цілим числом для стовпця {column}.")
+
+                        if self._value_exists(cursor, table_name, column, value):
+                            raise ValueError("Ідентифікатор вже існує.")
+                    elif self.catalog.reference(table_name, column) is not None:
+                        try:
+                            value = int(value)
+                        except ValueError:
+                            raise ValueError(f"Значення для {column} повинно бути цілим числом.")
+
+                        referenced_table, referenced_column, _ = self.catalog.reference(table_name, column)
+                        if not self._value_exists(cursor, referenced_table, referenced_column, value):
+                            raise ValueError(f"Значення зовнішнього ключа для {column} не існує.")
+
+                if assign_id:
+                    row_id = next(identifiers(self.ids.reserve(cursor, table_name, 1)))
+                    columns, values = list(columns) + [id_column], list(values) + [row_id]
+
+                columns_str = ', '.join(columns)
+                placeholders = ', '.join(f'${position}' for position in range(1, len(values) + 1))
+                query = f"INSERT INTO {table_name} ({columns_str}) VALUES ({placeholders})"
+                self.statements.execute(cursor, ('insert', table_name.lower(), tuple(columns)), query, values)
+                self._commit(connection)
+                self.results.invalidate(table_name)
+                if not assign_id:
+                    self.ids.forget(table_name)
+            except IntegrityError as e:
+                self._rollback(connection)
+                raise ValueError(f"Помилка вставки даних (можливо, порушення обмежень цілісності): {e}")
+            except Exception as e:
+                self._rollback(connection)
+                raise e
+
+    def insert_many(self, table_name, columns, rows, page_size=INSERT_PAGE_SIZE):
+        id_column = self.catalog.primary_key(table_name)
+        assign_ids = id_column is not None and id_column not in columns
+        if assign_ids:
+            self._prepare_identifiers([table_name])
+            columns = list(columns) + [id_column]
+
+        with self._connection('insert_many') as connection:
+            cursor = connection.cursor()
+            inserted = 0
+            errors = []
+            page = []
+            try:
+                for index, values in enumerate(rows, start=1):
+                    if len(values) != len(columns) - assign_ids:
+                        errors.append((index, "Кількість стовпців не відповідає кількості значень."))
+                        continue
+                    page.append((index, values))
+                    if len(page) == page_size:
+                        if assign_ids:
+                            page = self._assign_identifiers(cursor, table_name, page)
+                        inserted += self._insert_page(cursor, table_name, columns, page, errors)
+                        page = []
+                if page:
+                    if assign_ids:
+                        page = self._assign_identifiers(cursor, table_name, page)
+                    inserted += self._insert_page(cursor, table_name, columns, page, errors)
+
+                self._commit(connection)
+                self.results.invalidate(table_name)
+                if not assign_ids:
+                    self.ids.forget(table_name)
+                return inserted, errors
+            except Exception as e:
+                self._rollback(connection)
+                raise e
+
+    # Один запит резервує id для всієї сторінки.
+    def _assign_identifiers(self, cursor, table_name, page):
+        row_ids = identifiers(self.ids.reserve(cursor, table_name, len(page)))
+        return [(index, tuple(values) + (row_id,)) for (index, values), row_id in zip(page, row_ids)]
+
+    def _insert_page(self, cursor, table_name, columns, page, errors):
+        columns_str = ', '.join(columns)
+        cursor.execute('SAVEPOINT insert_page')
         try:
-            if len(columns) != len(values):
-                raise ValueError("Кількість стовпців не відповідає кількості значень.")
+            execute_values(
+                cursor,
+                f"INSERT INTO {table_name} ({columns_str}) VALUES %s",
+                [values for _, values in page],
+                page_size=len(page)
+            )
+            cursor.execute('RELEASE SAVEPOINT insert_page')
+            return len(page)
+        except psycopg2.Error:
+            cursor.execute('ROLLBACK TO SAVEPOINT insert_page')
 
-            for column, value in zip(columns, values):
-                if column == f'{table_name.lower()}_id':
-                    try:
-                        value = int(value)
-                    except ValueError:
-                        raise ValueError(f"Значення ідентифікатора повинно бути цілим числом для стовпця {column}.")
+        # Сторінка не пройшла цілком - вставляємо її рядки по одному, щоб
+        # відкинути лише помилкові і повідомити, які саме.
+        inserted = 0
+        placeholders = ', '.join(['%s'] * len(columns))
+        for index, values in page:
+            cursor.execute('SAVEPOINT insert_row')
+            try:
+                cursor.execute(f"INSERT INTO {table_name} ({columns_str}) VALUES ({placeholders})", values)
+                cursor.execute('RELEASE SAVEPOINT insert_row')
+                inserted += 1
+            except IntegrityError as e:
+                cursor.execute('ROLLBACK TO SAVEPOINT insert_row')
+                errors.append((index, f"Помилка вставки даних (можливо, порушення обмежень цілісності): {e}".strip()))
+            except psycopg2.Error as e:
+                cursor.execute('ROLLBACK TO SAVEPOINT insert_row')
+                errors.append((index, f"Помилка вставки даних: {e}".strip()))
+        cursor.execute('RELEASE SAVEPOINT insert_page')
+        return inserted
+
+    def update_data(self, table_name, column, row_id, new_value):
+        with self._connection('update_data') as connection:
+            cursor = connection.cursor()
+            identifier_column = f'{table_name.lower()}_id'
+            is_unique_identifier = identifier_column == column
+
+            if is_unique_identifier:
+                try:
+                    val_id = int(new_value)
+                except ValueError:
+                    raise ValueError("Значення ідентифікатора повинно бути цілим числом.")
+
+                if self._value_exists(cursor, table_name, identifier_column, val_id):
+                    raise ValueError("Ідентифікатор вже існує.")
+            elif self.catalog.reference(table_name, column) is not None:
+                try:
+                    val_id = int(new_value)
+                except ValueError:
+                    raise ValueError(f"Значення для {column} повинно бути цілим числом.")
+
+                referenced_table, referenced_column, _ = self.catalog.reference(table_name, column)
+                if not self._value_exists(cursor, referenced_table, referenced_column, val_id):
+                    raise ValueError(f"Значення зовнішнього ключа для {column} не існує.")
+
+            try:
+                query = f"UPDATE {table_name} SET {column} = $1 WHERE {identifier_column} = $2"
+                self.statements.execute(cursor, ('update', table_name.lower(), column), query, (new_value, row_id))
+                if cursor.rowcount == 0:
+                    raise ValueError(f"Рядок з id {row_id} не знайдено в таблиці {table_name}.")
+                self._commit(connection)
+                self.results.invalidate(table_name)
+                if is_unique_identifier:
+                    self.ids.forget(table_name)
+            except IntegrityError as e:
+                self._rollback(connection)
+                raise ValueError(f"Помилка оновлення даних (можливо, порушення обмежень цілісності): {e}")
+            except Exception as e:
+                self._rollback(connection)
+                raise e
 
-                    self.cursor.execute(f'SELECT {column} FROM {table_name}')
-                    existing_identifiers = [item for sublist in self.cursor.fetchall() for item in sublist]
-                    if value in existing_identifiers:
-                        raise ValueError("Ідентифікатор вже існує.")
-                elif column.endswith('_id') and column != f'{table_name.lower()}_id':
+    def update_many(self, table_name, column, new_value, ids=None, id_range=None, predicate=None):
+        if column == self.catalog.primary_key(table_name):
+            raise ValueError("Ідентифікатор не можна змінювати для кількох рядків одночасно.")
+
+        where_clause, where_params = self._row_selection(table_name, ids, id_range, predicate)
+        with self._connection('update_many') as connection:
+            cursor = connection.cursor()
+            try:
+                reference = self.catalog.reference(table_name, column)
+                if reference is not None:
                     try:
-                        value = int(value)
+                        val_id = int(new_value)
                     except ValueError:
                         raise ValueError(f"Значення для {column} повинно бути цілим числом.")
-
-                    referenced_table = column[:-3]
-                    self.cursor.execute(f'SELECT {referenced_table}_id FROM {referenced_table}')
-                    referenced_values = [item for sublist in self.cursor.fetchall() for item in sublist]
-                    if value not in referenced_values:
+                    if not self._value_exists(cursor, reference[0], reference[1], val_id):
                         raise ValueError(f"Значення зовнішнього ключа для {column} не існує.")
 
-            columns_str = ', '.join(columns)
-            placeholders = ', '.join(['%s'] * len(values))
-            query = f"INSERT INTO {table_name} ({columns_str}) VALUES ({placeholders})"
-            self.cursor.execute(query, values)
-            self.connection.commit()
-        except IntegrityError as e:
-            self.connection.rollback()
-            raise ValueError(f"Помилка вставки даних (можливо, порушення обмежень цілісності): {e}")
-        except Exception as e:
-            self.connection.rollback()
-            raise e
+                cursor.execute(
+                    f"UPDATE {table_name} SET {column} = %s WHERE {where_clause}", (new_value,) + where_params
+                )
+                updated = cursor.rowcount
+                self._commit(connection)
+                self.results.invalidate(table_name)
+                return updated
+            except IntegrityError as e:
+                self._rollback(connection)
+                raise ValueError(f"Помилка оновлення даних (можливо, порушення обмежень цілісності): {e}")
+            except Exception as e:
+                self._rollback(connection)
+                raise e
 
-    def update_data(self, table_name, column, row_id, new_value):
-        identifier_column = f'{table_name.lower()}_id'
-        is_unique_identifier = identifier_column == column
+    def delete_many(self, table_name, ids=None, id_range=None, predicate=None):
+        where_clause, where_params = self._row_selection(table_name, ids, id_range, predicate)
+        with self._connection('delete_many') as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(f"DELETE FROM {table_name} WHERE {where_clause}", where_params)
+                deleted = cursor.rowcount
+                self._commit(connection)
+                self.results.invalidate(table_name)
+                return deleted
+            except IntegrityError as e:
+                self._rollback(connection)
+                raise ValueError(f"Помилка видалення даних (можливо, є залежні записи): {e}")
+            except Exception as e:
+                self._rollback(connection)
+                raise e
+
+    def _row_selection(self, table_name, ids, id_range, predicate):
+        if sum(selector is not None for selector in (ids, id_range, predicate)) != 1:
+            raise ValueError("Потрібно вказати рівно один спосіб вибору рядків: список id, діапазон id або умову.")
+
+        identifier_column = self.catalog.primary_key(table_name) or f'{table_name.lower()}_id'
+        try:
+            if ids is not None:
+                return f"{identifier_column} = ANY(%s)", ([int(row_id) for row_id in ids],)
+            if id_range is not None:
+                low, high = id_range
+                return f"{identifier_column} BETWEEN %s AND %s", (int(low), int(high))
+        except ValueError:
+            raise ValueError("Значення ідентифікатора повинно бути цілим числом.")
+
+        column, operator, value = predicate
+        if operator not in PREDICATE_OPERATORS:
+            raise ValueError(f"Непідтримуваний оператор {operator}.")
+        if column not in [name for name, _ in self.catalog.table_columns(table_name)]:
+            raise ValueError(f"Таблиця {table_name} не має стовпця {column}.")
+        return f"{column} {operator} %s", (value,)
+
+    def _value_exists(self, cursor, table_name, column, value):
+        # EXISTS по індексованому ключу зупиняється на першому збігу і не тягне
+        # таблицю на клієнт, тож перевірка не залежить від розміру таблиці.
+        query = f'SELECT EXISTS (SELECT 1 FROM {table_name} WHERE {column} = $1)'
+        self.statements.execute(cursor, ('exists', table_name.lower(), column), query, (value,))
+        return cursor.fetchone()[0]
+
+    def delete_data(self, table_name, row_id):
+        with self._connection('delete_data') as connection:
+            cursor = connection.cursor()
+            try:
+                identifier_column = f'{table_name.lower()}_id'
+                row_id = int(row_id)
+                query = f"DELETE FROM {table_name} WHERE {identifier_column} = $1"
+                self.statements.execute(cursor, ('delete', table_name.lower()), query, (row_id,))
+                if cursor.rowcount == 0:
+                    raise ValueError(f"Рядок з id {row_id} не знайдено в таблиці {table_name}.")
+                self._commit(connection)
+                self.results.invalidate(table_name)
+            except ValueError as ve:
+                self._rollback(connection)
+                raise ve
+            except IntegrityError as e:
+                self._rollback(connection)
+                raise ValueError(f"Помилка видалення даних (можливо, є залежні записи): {e}")
+            except Exception as e:
+                self._rollback(connection)
+                raise e
 
-        if is_unique_identifier:
+    def copy_rows(self, table_name, columns, rows):
+        with self._connection('copy_rows') as connection:
+            cursor = connection.cursor()
+            stream = CopyStream(rows)
             try:
-                val_id = int(new_value)
-            except ValueError:
-                raise ValueError("Значення ідентифікатора повинно бути цілим числом.")
+                self._copy(cursor, table_name, columns, stream)
+                self._commit(connection)
+                self.results.invalidate(table_name)
+                self.ids.forget(table_name)
+                return stream.count
+            except IntegrityError as e:
+                self._rollback(connection)
+                raise ValueError(f"Помилка завантаження даних (можливо, порушення обмежень цілісності): {e}")
+            except Exception as e:
+                self._rollback(connection)
+                raise e
 
-            self.cursor.execute(f'SELECT {identifier_column} FROM {table_name}')
-            existing_identifiers = [item for sublist in self.cursor.fetchall() for item in sublist]
-            if val_id in existing_identifiers:
-                raise ValueError("Ідентифікатор вже існує.")
-        elif column.endswith('_id') and column != f'{table_name.lower()}_id':
+    def import_csv(self, table_name, file_path):
+        with self._connection('import_csv') as connection:
+            cursor = connection.cursor()
             try:
-                val_id = int(new_value)
-            except ValueError:
-                raise ValueError(f"Значення для {column} повинно бути цілим числом.")
+                with open(file_path, newline='', encoding='utf-8') as csv_file:
+                    header = next(csv.reader(csv_file), None)
+                    if not header:
+                        raise ValueError(f"Файл {file_path} порожній.")
+                    csv_file.seek(0)
+                    columns = [column.strip() for column in header]
+                    self._copy(cursor, table_name, columns, csv_file, header=True)
+                self._commit(connection)
+                self.results.invalidate(table_name)
+                self.ids.forget(table_name)
+                return cursor.rowcount
+            except IntegrityError as e:
+                self._rollback(connection)
+                raise ValueError(f"Помилка імпорту даних (можливо, порушення обмежень цілісності): {e}")
+            except Exception as e:
+                self._rollback(connection)
+                raise e
 
-            referenced_table = column[:-3]
-            self.cursor.execute(f'SELECT {referenced_table}_id FROM {referenced_table}')
-            referenced_values = [item for sublist in self.cursor.fetchall() for item in sublist]
-            if val_id not in referenced_values:
-                raise ValueError(f"Значення зовнішнього ключа для {column} не існує.")
+    def export_table(self, table_name, file_path, file_format='csv', columns=None, predicate=None,
+                     compression=None):
+        if file_format not in EXPORT_FORMATS:
+            raise ValueError(f"Непідтримуваний формат експорту {file_format}.")
+        table_columns = [column for column, _ in self.catalog.table_columns(table_name)]
+        if not table_columns:
+            raise ValueError(f"Таблиця {table_name} не знайдена.")
+        columns = columns or table_columns
+        unknown = [column for column in columns if column not in table_columns]
+        if unknown:
+            raise ValueError(f"Таблиця {table_name} не має стовпців: {', '.join(unknown)}.")
 
-        try:
-            query = f"UPDATE {table_name} SET {column} = %s WHERE {identifier_column} = %s"
-            self.cursor.execute(query, (new_value, row_id))
-            if self.cursor.rowcount == 0:
-                raise ValueError(f"Рядок з id {row_id} не знайдено в таблиці {table_name}.")
-            self.connection.commit()
-        except IntegrityError as e:
-            self.connection.rollback()
-            raise ValueError(f"Помилка оновлення даних (можливо, порушення обмежень цілісності): {e}")
-        except Exception as e:
-            self.connection.rollback()
-            raise e
+        with self._connection('export_table') as connection:
+            cursor = connection.cursor()
+            try:
+                columns_str = ', '.join(columns)
+                if predicate is None:
+                    source = f"SELECT {columns_str} FROM {table_name}"
+                else:
+                    # COPY не приймає параметрів, тож умова підставляється
+                    # в текст запиту з екрануванням через mogrify.
+                    where_clause, where_params = self._row_selection(table_name, None, None, predicate)
+                    where_clause = cursor.mogrify(where_clause, where_params).decode()
+                    source = f"SELECT {columns_str} FROM {table_name} WHERE {where_clause}"
 
-    def delete_data(self, table_name, row_id):
-        try:
-            identifier_column = f'{table_name.lower()}_id'
-            row_id = int(row_id)
-            query = f"DELETE FROM {table_name} WHERE {identifier_column} = %s"
-            self.cursor.execute(query, (row_id,))
-            if self.cursor.rowcount == 0:
-                raise ValueError(f"Рядок з id {row_id} не знайдено в таблиці {table_name}.")
-            self.connection.commit()
-        except ValueError as ve:
-            self.connection.rollback()
-            raise ve
-        except IntegrityError as e:
-            self.connection.rollback()
-            raise ValueError(f"Помилка видалення даних (можливо, є залежні записи): {e}")
-        except Exception as e:
-            self.connection.rollback()
-            raise e
+                if file_format == 'jsonl':
+                    # Кожен рядок - готовий JSON з row_to_json. Лапки і роздільник
+                    # CSV замінено символами, яких немає в JSON, тож сервер
+                    # не екранує вивід і кожен рядок виходить як є.
+                    query = (
+                        f"COPY (SELECT row_to_json(exported) FROM ({source}) AS exported) "
+                        f"TO STDOUT WITH (FORMAT csv, QUOTE e'\\x01', DELIMITER e'\\x02')"
+                    )
+                elif predicate is None:
+                    query = f"COPY {table_name} ({columns_str}) TO STDOUT WITH (FORMAT csv, HEADER true)"
+                else:
+                    query = f"COPY ({source}) TO STDOUT WITH (FORMAT csv, HEADER true)"
 
-    def generate_data(self, table_name, count):
-        try:
-            self.cursor.execute(
-                """
-                SELECT column_name, data_type 
-                FROM information_schema.columns 
-                WHERE table_name = %s AND table_schema = 'public'
-                """,
-                (table_name.lower(),)
-            )
-            columns_info = self.cursor.fetchall()
-
-            if not columns_info:
-                raise ValueError(f"Таблиця {table_name} не має стовпців або неправильна назва таблиці.")
-
-            self.cursor.execute(
-                """
-                SELECT kcu.column_name
-                FROM information_schema.table_constraints tc
-                JOIN information_schema.key_column_usage kcu
-                ON tc.constraint_name = kcu.constraint_name
-                AND tc.table_schema = kcu.table_schema
-                WHERE tc.constraint_type = 'PRIMARY KEY'
-                AND tc.table_name = %s
-                AND tc.table_schema = 'public'
-                """,
-                (table_name.lower(),)
-            )
-            pk_info = self.cursor.fetchone()
-            if pk_info:
-                id_column = pk_info[0]
-            else:
-                raise ValueError(f"Таблиця {table_name} не має первинного ключа.")
-
-            for _ in range(count):
-                insert_query = f'INSERT INTO {table_name} ('
-                select_subquery = ""
-
-                for column_info in columns_info:
-                    column_name = column_info[0]
-                    column_type = column_info[1]
-
-                    if column_name == id_column:
-                        select_subquery += f"(SELECT COALESCE(MAX({id_column}), 0) + 1 FROM {table_name}),"
-                    elif column_name.endswith('_id') and column_name != id_column:
-                        related_table_name = column_name[:-3]
-                        select_subquery += f"(SELECT {related_table_name}_id FROM {related_table_name} ORDER BY RANDOM() LIMIT 1),"
-                    elif column_type == 'integer':
-                        if column_name.lower() == 'year':
-                            select_subquery += '(2000 + FLOOR(RANDOM() * 100)),' 
-                        else:
-                            select_subquery += 'FLOOR(RANDOM() * 100 + 1),'
-                    elif column_type in ['character varying', 'varchar']:
-                        select_subquery += f"'Random {column_name} ' || substr(md5(random()::text), 1, 5),"
-                    elif column_type == 'date':
-                        if column_name == 'end_date':
-                            select_subquery += "current_date + (FLOOR(RANDOM() * 365))::int,"
-                        else:
-                            select_subquery += "current_date - (FLOOR(RANDOM() * 365))::int,"
-                    elif column_type == 'timestamp with time zone':
-                        if column_name == 'end_date':
-                            select_subquery += "NOW() + (FLOOR(RANDOM() * 365) || ' days')::interval,"
-                        else:
-                            select_subquery += "NOW() - (FLOOR(RANDOM() * 365) || ' days')::interval,"
-                    else:
-                        select_subquery += 'NULL,'
-
-                    insert_query += f'{column_name},'
-
-                insert_query = insert_query.rstrip(',') + f') VALUES ({select_subquery.rstrip(",")})'
-                self.cursor.execute(insert_query)
-
-            self.connection.commit()
-        except Exception as e:
-            self.connection.rollback()
-            raise e
+                with open_export(file_path, compression) as output:
+                    cursor.copy_expert(query, output)
+                self._commit(connection)
+                return cursor.rowcount
+            except psycopg2.Error as e:
+                self._rollback(connection)
+                raise Exception(f"Помилка експорту даних таблиці: {e}")
 
+    def missing_indexes(self, filter_columns=None):
+        return missing_indexes(self.catalog, filter_columns)
+
+    # Створює відсутні індекси і повертає (створені індекси, плани до, плани
+    # після). CREATE INDEX CONCURRENTLY не блокує запис у таблицю, але не може
+    # виконуватись у транзакції, тож з'єднання на цей час переходить в autocommit.
+    def create_missing_indexes(self, concurrently=False, filter_columns=None, explain=True):
+        if concurrently and getattr(self.pinned, 'connection', None) is not None:
+            raise ValueError("CREATE INDEX CONCURRENTLY не можна виконати всередині транзакції.")
+        columns = missing_indexes(self.catalog, filter_columns)
+        before = self.explain_queries(columns) if explain else []
+
+        created = []
+        with self._connection('create_missing_indexes') as connection:
+            if concurrently:
+                connection.autocommit = True
+            try:
+                cursor = connection.cursor()
+                for table, column, _ in columns:
+                    cursor.execute(create_index_query(table, column, concurrently))
+                    created.append(index_name(table, column))
+                self._commit(connection)
+            except psycopg2.Error as e:
+                self._rollback(connection)
+                if concurrently:
+                    # Перерваний CREATE INDEX CONCURRENTLY залишає невалідний
+                    # індекс, який IF NOT EXISTS далі пропускав би.
+                    connection.cursor().execute(
+                        f"DROP INDEX CONCURRENTLY IF EXISTS {index_name(table, column)}"
+                    )
+                raise Exception(f"Помилка створення індексів: {e}")
+            finally:
+                if concurrently:
+                    connection.autocommit = False
+
+        self.refresh_catalog()
+        after = self.explain_queries(columns) if explain else []
+        return created, before, after
+
+    # EXPLAIN ANALYZE виконує запит насправді, тож після замірів транзакція
+    # відкочується і блокування FOR KEY SHARE знімаються.
+    def explain_queries(self, columns=None):
+        if columns is None:
+            columns = missing_indexes(self.catalog)
+        plans = []
+        with self._connection('explain_queries') as connection:
+            cursor = connection.cursor()
+            try:
+                for label, table, query in explain_targets(self.catalog, columns):
+                    cursor.execute(query)
+                    plans.append(plan_summary(label, table, cursor.fetchone()[0]))
+            except psycopg2.Error as e:
+                raise Exception(f"Помилка отримання плану запиту: {e}")
+            finally:
+                self._rollback(connection)
+        return plans
+
+    def prepared_statement_stats(self):
+        return self.statements.stats()
+
+    def result_cache_stats(self):
+        return self.results.stats()
+
+    def slow_statements(self, limit=SLOW_STATEMENTS_LIMIT):
+        return self.recorder.slowest(limit)
+
+    def latency_histograms(self):
+        return self.recorder.latency_histograms()
+
+    def export_query_stats(self, file_path):
+        try:
+            return self.recorder.export_json(file_path)
+        except OSError as e:
+            raise Exception(f"Помилка експорту статистики запитів: {e}")
 
     def close_connection(self):
         try:
-            self.cursor.close()
-            self.connection.close()
+            self.pool.closeall()
         except Exception as e:
             raise Exception(f"Помилка закриття підключення: {e}")
@@ -0,0 +1,61 @@
+import itertools
+import threading
+
+from psycopg2.extensions import connection
+
+from common.instrumentation import InstrumentedCursor
+
+
+# Підготовлені оператори існують лише в межах серверного сеансу, тому
+# перелік уже підготовлених зберігається на самому з'єднанні пулу.
+# Курсори з'єднання записують свої запити в recorder, якщо його задано.
+class PreparingConnection(connection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared_statements = {}
+        self.prepared_generation = 0
+        self.recorder = None
+        self.cursor_factory = InstrumentedCursor
+
+
+# Кеш спільний для всіх потоків Model, тож лічильники змінюються під lock.
+class PreparedStatementCache:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.generation = 0
+        self.names = itertools.count(1)
+        self.hits = 0
+        self.misses = 0
+
+    # Після зміни схеми старі плани можуть бути неправильними: кожне з'єднання
+    # звільняє свої оператори при наступному зверненні до кешу.
+    def invalidate(self):
+        self.generation += 1
+
+    def execute(self, cursor, key, query, params):
+        connection = cursor.connection
+        if connection.prepared_generation != self.generation:
+            if connection.prepared_statements:
+                cursor.execute('DEALLOCATE ALL')
+            connection.prepared_statements = {}
+            connection.prepared_generation = self.generation
+
+        name = connection.prepared_statements.get(key)
+        if name is None:
+            with self.lock:
+                self.misses += 1
+            name = f'model_statement_{next(self.names)}'
+            cursor.execute(f'PREPARE {name} AS {query}', statement=f'PREPARE {query}')
+            connection.prepared_statements[key] = name
+        else:
+            with self.lock:
+                self.hits += 1
+
+        placeholders = ', '.join(['%s'] * len(params))
+        # У статистиці запит записується під власним текстом, а не під
+        # іменем оператора, яке різне на різних з'єднаннях.
+        cursor.execute(f'EXECUTE {name} ({placeholders})', params, statement=query)
+
+    def stats(self):
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses}
@@ -1,4 +1,15 @@
+import sys
+
+from common.render import RENDER_CHUNK_SIZE, TableRenderer, page, pager_available
+
+STATEMENT_PREVIEW_LENGTH = 120
+
+
 class View:
+    def __init__(self, output=None, pager=False):
+        self.output = open(output, 'w', encoding='utf-8', buffering=RENDER_CHUNK_SIZE) if output else None
+        self.pager = pager
+
     def display_menu(self):
         print("\nМеню:")
         print("1. Вивід назв таблиць")
@@ -8,18 +19,81 @@ class View:
         print("5. Оновлення даних в таблиці")
         print("6. Видалення даних в таблиці")
         print("7. Генерування даних в таблицю")
-        print("8. Вихід")
+        print("8. Імпорт даних з CSV-файлу")
+        print("9. Пакетне додавання даних з CSV-файлу (з пропуском помилкових рядків)")
+        print("10. Посторінковий перегляд даних у таблиці")
+        print("11. Оновлення кешу схеми бази даних")
+        print("12. Генерування даних для всієї схеми")
+        print("13. Масове оновлення даних (за списком id, діапазоном id або умовою)")
+        print("14. Масове видалення даних (за списком id, діапазоном id або умовою)")
+        print("15. Найповільніші запити та гістограми затримок")
+        print("16. Експорт статистики запитів у JSON")
+        print("17. Статистика кешів")
+        print("18. Експорт даних таблиці у файл (CSV або JSON Lines)")
+        print("19. Порадник індексів (відсутні індекси та EXPLAIN ANALYZE до і після)")
+        print("20. Генерування зв'язків багато-до-багатьох (унікальні пари, рівномірний або Zipf-розподіл)")
+        print("0. Вихід")
         return input("Оберіть опцію: ")
 
     def prompt(self, message):
         return input(message)
 
+    # Таблиця пишеться у файл --output, у пейджер (--pager, лише в
+    # терміналі) або в stdout. Якщо користувач вийшов з пейджера раніше,
+    # решта рядків не читається.
     def display_result(self, result):
-        if not result:
-            print("Немає даних для відображення.")
+        if self.output is not None:
+            count = TableRenderer(self.output).render(result)
+            print(f"Виведено {count} рядків у файл {self.output.name}." if count else "Немає даних для відображення.")
+            return
+
+        if self.pager and pager_available():
+            count = page(result)
         else:
-            for row in result:
-                print(row)
+            count = TableRenderer(sys.stdout).render(result)
+        if count == 0:
+            print("Немає даних для відображення.")
+
+    def close(self):
+        if self.output is not None:
+            self.output.close()
 
     def display_message(self, message):
         print(message)
+
+    def display_row_errors(self, errors):
+        for index, message in errors:
+            print(f"Рядок {index}: {message}")
+
+    def display_slow_statements(self, statements):
+        if not statements:
+            print("Запити ще не виконувались.")
+            return
+        for stats in statements:
+            print(f"[{stats['operation']}] {stats['statement'][:STATEMENT_PREVIEW_LENGTH]}")
+            print(f"    викликів: {stats['calls']}, разом: {stats['total_ms']:.1f} мс, "
+                  f"середнє: {stats['mean_ms']:.2f} мс, макс.: {stats['max_ms']:.2f} мс, "
+                  f"рядків: {stats['rows']}, помилок: {stats['errors']}")
+
+    def display_latency_histograms(self, histograms):
+        for operation, histogram in histograms.items():
+            buckets = ', '.join(f"{label}: {count}" for label, count in histogram['buckets'].items() if count)
+            print(f"{operation} ({histogram['calls']} запитів, {histogram['total_ms']:.1f} мс): {buckets}")
+
+    def display_cache_stats(self, title, stats):
+        print(f"{title}: " + ', '.join(f"{name}: {value}" for name, value in stats.items()))
+
+    def display_missing_indexes(self, columns):
+        if not columns:
+            print("Усі зовнішні ключі та стовпці фільтрації вже мають індекси.")
+            return
+        for table, column, reason in columns:
+            print(f"{table}.{column} ({reason})")
+
+    def display_plan_comparison(self, before, after):
+        for old, new in zip(before, after):
+            print(old['query'])
+            for title, plan in (("до", old), ("після", new)):
+                print(f"    {title}: {plan['access']}, планування: {plan['planning_ms']:.2f} мс, "
+                      f"виконання: {plan['execution_ms']:.2f} мс, "
+                      f"сторінок з кешу: {plan['shared_hit']}, з диска: {plan['shared_read']}")
@@ -0,0 +1,32 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.catalog import SchemaCatalog
+
+
+# Рядок CATALOG_QUERY: (таблиця, стовпець, тип, первинний ключ, таблиця і
+# стовпець зовнішнього ключа, індексований, relkind).
+def catalog_row(table, name, primary=False, reference=None, data_type='integer', relkind='r'):
+    ref_table, ref_column = reference or (None, None)
+    return table, name, data_type, primary, ref_table, ref_column, primary, relkind
+
+
+@pytest.fixture
+def research_catalog():
+    catalog = SchemaCatalog()
+    catalog.load([
+        catalog_row('experiment', 'experiment_id', primary=True),
+        catalog_row('experiment', 'research_project_id', reference=('research_project', 'research_project_id')),
+        catalog_row('research_project', 'research_project_id', primary=True),
+        catalog_row('research_project', 'title', data_type='character varying'),
+        catalog_row('researcher', 'researcher_id', primary=True),
+        catalog_row('researcher_experiment', 'researcher_experiment_id', primary=True),
+        catalog_row('researcher_experiment', 'researcher_id', reference=('researcher', 'researcher_id')),
+        # Зовнішній ключ без обмеження вгадується за назвою стовпця.
+        catalog_row('researcher_experiment', 'experiment_id'),
+    ])
+    return catalog
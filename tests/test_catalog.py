@@ -0,0 +1,45 @@
+import pytest
+
+from common.catalog import SchemaCatalog
+
+
+def test_dependency_levels_put_parents_first(research_catalog):
+    levels = research_catalog.dependency_levels(['Researcher_Experiment', 'experiment', 'researcher', 'research_project'])
+    assert levels == [['research_project', 'researcher'], ['experiment'], ['researcher_experiment']]
+
+
+def test_dependency_levels_ignore_tables_outside_request(research_catalog):
+    assert research_catalog.dependency_levels(['researcher_experiment', 'experiment']) == [
+        ['experiment'], ['researcher_experiment']
+    ]
+
+
+def test_dependency_levels_reject_cycles():
+    catalog = SchemaCatalog()
+    catalog.load([
+        ('a', 'a_id', 'integer', True, None, None, True, 'r'),
+        ('a', 'b_id', 'integer', False, 'b', 'b_id', False, 'r'),
+        ('b', 'b_id', 'integer', True, None, None, True, 'r'),
+        ('b', 'a_id', 'integer', False, 'a', 'a_id', False, 'r'),
+    ])
+    with pytest.raises(ValueError):
+        catalog.dependency_levels(['a', 'b'])
+
+
+def test_reference_marks_guessed_keys(research_catalog):
+    assert research_catalog.reference('researcher_experiment', 'researcher_id') == ('researcher', 'researcher_id', True)
+    assert research_catalog.reference('researcher_experiment', 'experiment_id') == ('experiment', 'experiment_id', False)
+    assert research_catalog.reference('research_project', 'title') is None
+
+
+def test_dependency_levels_skip_views_and_foreign_tables():
+    catalog = SchemaCatalog()
+    catalog.load([
+        ('a', 'a_id', 'integer', True, None, None, True, 'r'),
+        ('a_report', 'a_id', 'integer', False, None, None, False, 'v'),
+        ('b', 'b_id', 'integer', True, None, None, True, 'p'),
+        ('remote', 'remote_id', 'integer', False, None, None, False, 'f'),
+    ])
+    assert catalog.tables() == ['a', 'a_report', 'b', 'remote']
+    assert not catalog.is_table('A_Report')
+    assert catalog.dependency_levels(catalog.tables()) == [['a', 'b']]
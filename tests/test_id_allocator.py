@@ -0,0 +1,87 @@
+import re
+
+import pytest
+
+from common.id_allocator import IdAllocator, first_free_block, identifiers
+
+
+# Імітує таблицю з MAX(id) і послідовність <таблиця>_id_block PostgreSQL.
+class SequenceCursor:
+    def __init__(self, max_id=0):
+        self.max_id = max_id
+        self.sequence = None
+        self.result = []
+
+    def execute(self, query, params=None):
+        self.result = []
+        if query.startswith('CREATE SEQUENCE'):
+            if self.sequence is None:
+                self.sequence = {'last_value': 0, 'is_called': False}
+        elif 'last_value, is_called' in query:
+            self.result = [(self.max_id, self.sequence['last_value'], self.sequence['is_called'])]
+        elif 'setval' in query:
+            value = int(re.search(r', (\d+)\)$', query).group(1))
+            self.sequence = {'last_value': value, 'is_called': True}
+        elif 'nextval' in query:
+            blocks = int(re.search(r'generate_series\(1, (\d+)\)', query).group(1))
+            self.result = [(self._nextval(),) for _ in range(blocks)]
+
+    def _nextval(self):
+        if self.sequence['is_called']:
+            self.sequence['last_value'] += 1
+        self.sequence['is_called'] = True
+        return self.sequence['last_value']
+
+    def fetchone(self):
+        return self.result[0]
+
+    def fetchall(self):
+        return self.result
+
+
+def first_ids(max_id, count=3, prepares=1):
+    cursor = SequenceCursor(max_id)
+    allocator = IdAllocator()
+    for _ in range(prepares):
+        allocator.prepare(cursor, 'researcher', 'researcher_id')
+    return list(identifiers(allocator.reserve(cursor, 'researcher', count)))
+
+
+def test_empty_table_starts_from_one():
+    assert first_ids(0) == [1, 2, 3]
+
+
+@pytest.mark.parametrize('max_id', [1, 5, 500, 999, 1000])
+def test_small_table_skips_first_block(max_id):
+    assert first_ids(max_id) == [1001, 1002, 1003]
+
+
+def test_table_past_first_block():
+    assert first_ids(1001) == [2001, 2002, 2003]
+
+
+def test_repeated_prepare_does_not_move_back():
+    assert first_ids(5, prepares=2) == [1001, 1002, 1003]
+
+    cursor = SequenceCursor(0)
+    allocator = IdAllocator()
+    allocator.prepare(cursor, 'researcher', 'researcher_id')
+    assert list(identifiers(allocator.reserve(cursor, 'researcher', 2))) == [1, 2]
+    allocator.forget('researcher')
+    allocator.prepare(cursor, 'researcher', 'researcher_id')
+    assert list(identifiers(allocator.reserve(cursor, 'researcher', 1))) == [1001]
+
+
+def test_reserve_keeps_spare_and_merges_blocks():
+    cursor = SequenceCursor(0)
+    allocator = IdAllocator(block_size=10)
+    allocator.prepare(cursor, 'researcher', 'researcher_id')
+    assert allocator.reserve(cursor, 'researcher', 4) == [(0, 4)]
+    assert allocator.reserve(cursor, 'researcher', 20) == [(4, 20)]
+    assert allocator.spare['researcher'] == (24, 6)
+    assert allocator.reserve(cursor, 'researcher', 6) == [(24, 6)]
+    assert 'researcher' not in allocator.spare
+
+
+def test_first_free_block():
+    assert [first_free_block(max_id, 1000) for max_id in (0, 1, 999, 1000, 1001)] == [0, 1, 1, 1, 2]
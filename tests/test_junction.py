@@ -0,0 +1,78 @@
+import re
+
+import pytest
+
+from common.junction import PairGenerator
+
+REFERENCES = [
+    ('researcher_id', 'researcher', 'researcher_id'),
+    ('experiment_id', 'experiment', 'experiment_id'),
+]
+
+
+# Віддає ключі і наявні пари так, як їх віддав би COPY ... TO STDOUT.
+class TableCursor:
+    def __init__(self, tables):
+        self.tables = tables
+        self.result = []
+
+    def execute(self, query, params=None):
+        self.result = [(len(self.tables[params[0]]),)]
+
+    def fetchone(self):
+        return self.result[0]
+
+    def copy_expert(self, query, buffer):
+        table_name = re.search(r'FROM (\w+)', query).group(1)
+        lines = (
+            '\t'.join(map(str, row)) if isinstance(row, tuple) else str(row)
+            for row in self.tables[table_name]
+        )
+        buffer.write(''.join(f'{line}\n' for line in lines).encode())
+
+
+def generator(existing=(), distribution='uniform', seed=7):
+    cursor = TableCursor({
+        'researcher': [3, 1, 2, 5, 4],
+        'experiment': [10, 30, 20, 40],
+        'researcher_experiment': list(existing),
+    })
+    return PairGenerator(cursor, 'researcher_experiment', REFERENCES, distribution, seed=seed)
+
+
+@pytest.mark.parametrize('distribution', ['uniform', 'zipf'])
+def test_pairs_are_unique_and_skip_existing(distribution):
+    existing = [(1, 10), (5, 40), (2, 30)]
+    pairs = generator(existing, distribution)
+    lefts, rights = pairs.draw(pairs.capacity())
+
+    drawn = list(zip(lefts, rights))
+    assert len(drawn) == 17
+    assert len(set(drawn)) == len(drawn)
+    assert not set(drawn) & set(existing)
+    assert set(lefts) <= {1, 2, 3, 4, 5}
+    assert set(rights) <= {10, 20, 30, 40}
+
+
+def test_draws_continue_without_repeats():
+    pairs = generator()
+    first = set(zip(*pairs.draw(8)))
+    second = set(zip(*pairs.draw(8)))
+    assert len(first) == len(second) == 8
+    assert not first & second
+    assert pairs.capacity() == 4
+
+
+def test_rejects_more_pairs_than_available():
+    pairs = generator([(1, 10)])
+    with pytest.raises(ValueError):
+        pairs.draw(20)
+
+
+def test_same_seed_gives_same_pairs():
+    assert generator(seed=3).draw(10) == generator(seed=3).draw(10)
+
+
+def test_rejects_unknown_distribution():
+    with pytest.raises(ValueError):
+        generator(distribution='normal')
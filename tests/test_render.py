@@ -0,0 +1,90 @@
+import io
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+
+from common import render
+from common.render import TableRenderer, format_value
+
+
+def rendered(rows, **options):
+    output = io.StringIO()
+    count = TableRenderer(output, **options).render(rows)
+    return count, output.getvalue().splitlines()
+
+
+def test_aligns_text_left_and_numbers_right():
+    count, lines = rendered([(1, 'Ada', Decimal('2.5')), (100, 'Grace Hopper', None)])
+    assert count == 2
+    assert lines == [
+        '  1 | Ada          |  2.5',
+        '100 | Grace Hopper | NULL',
+    ]
+
+
+def test_formats_dates_and_nulls():
+    assert format_value(None) == 'NULL'
+    assert format_value(date(2024, 1, 2)) == '2024-01-02'
+    assert format_value(datetime(2024, 1, 2, 3, 4)) == '2024-01-02 03:04:00'
+
+
+def test_widths_come_from_sample_and_are_capped():
+    rows = [(1, 'a'), (2, 'b'), (3, 'x' * 10)]
+    _, lines = rendered(rows, sample_rows=2)
+    assert lines == ['1 | a', '2 | b', '3 | ' + 'x' * 10]
+    _, lines = rendered([('y' * 10, 1)], max_width=4)
+    assert lines == ['y' * 10 + ' | 1']
+
+
+def test_writes_in_chunks_and_counts_all_rows():
+    output = io.StringIO()
+    writes = []
+    output.write = lambda text: writes.append(text) or len(text)
+    count = TableRenderer(output, chunk_size=64).render((row, 'value') for row in range(100))
+    assert count == 100
+    assert len(writes) > 1
+    assert ''.join(writes).count('\n') == 100
+
+
+def test_empty_result():
+    assert rendered([]) == (0, [])
+
+
+class FakePager:
+    def __init__(self):
+        self.stdin = io.StringIO()
+        self.stdin.close = self.close
+        self.closed = False
+        self.waited = False
+
+    def close(self):
+        self.closed = True
+
+    def wait(self):
+        self.waited = True
+
+
+def test_page_closes_pager_when_rows_fail(monkeypatch):
+    pager = FakePager()
+    monkeypatch.setattr(render, 'open_pager', lambda: pager)
+
+    def rows():
+        yield (1, 'a')
+        raise RuntimeError("помилка читання")
+
+    with pytest.raises(RuntimeError):
+        render.page(rows())
+    assert pager.closed and pager.waited
+
+
+def test_page_returns_none_when_pager_quits(monkeypatch):
+    pager = FakePager()
+    monkeypatch.setattr(render, 'open_pager', lambda: pager)
+
+    def rows():
+        yield (1, 'a')
+        raise BrokenPipeError
+
+    assert render.page(rows()) is None
+    assert pager.closed and pager.waited
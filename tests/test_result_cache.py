@@ -0,0 +1,62 @@
+from common import result_cache
+from common.result_cache import ResultCache
+
+
+def put(cache, key, table_name, size):
+    cache.put(key, table_name, [key] * size, cache.version(table_name), size)
+
+
+def test_evicts_least_recently_used_rows():
+    cache = ResultCache(max_rows=10)
+    put(cache, 'a', 'researcher', 4)
+    put(cache, 'b', 'researcher', 4)
+    assert cache.get('a') is not None
+    put(cache, 'c', 'experiment', 4)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == ['a'] * 4
+    assert cache.get('c') == ['c'] * 4
+    assert cache.stats()['evictions'] == 1
+    assert cache.stats()['rows'] == 8
+
+
+def test_skips_results_larger_than_cache():
+    cache = ResultCache(max_rows=3)
+    put(cache, 'a', 'researcher', 4)
+    assert cache.get('a') is None
+    assert cache.stats()['rows'] == 0
+
+
+def test_expires_entries_after_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(result_cache.time, 'monotonic', lambda: now[0])
+    cache = ResultCache(ttl=5.0)
+    put(cache, 'a', 'researcher', 1)
+
+    now[0] += 5.0
+    assert cache.get('a') == ['a']
+    now[0] += 0.1
+    assert cache.get('a') is None
+    assert cache.stats()['entries'] == 0
+
+
+def test_invalidate_drops_table_and_stale_reads():
+    cache = ResultCache()
+    put(cache, 'a', 'researcher', 1)
+    put(cache, 'b', 'experiment', 1)
+    version = cache.version('Researcher')
+    cache.invalidate('researcher')
+
+    # Результат, прочитаний до зміни таблиці, у кеш не потрапляє.
+    cache.put('c', 'researcher', ['c'], version, 1)
+    assert cache.get('a') is None
+    assert cache.get('c') is None
+    assert cache.get('b') == ['b']
+
+
+def test_clear_rejects_reads_started_before_it():
+    cache = ResultCache()
+    version = cache.version('researcher')
+    cache.clear()
+    cache.put('a', 'researcher', ['a'], version, 1)
+    assert cache.get('a') is None
@@ -0,0 +1,42 @@
+from common.sampler import ForeignKeySampler
+
+
+# Оцінка розміру таблиці завищена, щоб спрацювала вибірка TABLESAMPLE.
+class SampleCursor:
+    def __init__(self, keys, estimated_rows=10 ** 7):
+        self.keys = keys
+        self.estimated_rows = estimated_rows
+        self.queries = []
+
+    def execute(self, query, params=None):
+        pass
+
+    def fetchone(self):
+        return (self.estimated_rows,)
+
+    def copy_expert(self, query, buffer):
+        self.queries.append(query)
+        buffer.write(''.join(f'{key}\n' for key in self.keys).encode())
+
+
+def sample_query(seed, table_name='researcher'):
+    cursor = SampleCursor([5, 3, 9, 1])
+    ForeignKeySampler(cursor, table_name, 'researcher_id', seed=seed)
+    return cursor.queries[0]
+
+
+def test_seeded_sample_is_repeatable():
+    assert 'REPEATABLE' in sample_query(7)
+    assert sample_query(7) == sample_query(7)
+    assert sample_query(7) != sample_query(8)
+    assert sample_query(7, 'experiment').split('REPEATABLE')[1] != sample_query(7).split('REPEATABLE')[1]
+
+
+def test_unseeded_sample_is_not_pinned():
+    assert 'TABLESAMPLE SYSTEM' in sample_query(None)
+    assert 'REPEATABLE' not in sample_query(None)
+
+
+def test_seeded_keys_are_sorted():
+    sampler = ForeignKeySampler(SampleCursor([5, 3, 9, 1]), 'researcher', 'researcher_id', seed=7)
+    assert list(sampler.keys) == [1, 3, 5, 9]
@@ -0,0 +1,47 @@
+import io
+import json
+from contextlib import contextmanager
+
+from common.script import ScriptRunner
+
+
+# Модель, чия транзакція падає на фіксації заданих за номером пакетів.
+class FakeModel:
+    def __init__(self, failing_batches=()):
+        self.failing_batches = set(failing_batches)
+        self.batches = 0
+        self.deleted = []
+
+    @contextmanager
+    def transaction(self):
+        self.batches += 1
+        yield
+        if self.batches in self.failing_batches:
+            raise RuntimeError('could not serialize access')
+
+    def delete_data(self, table_name, row_id):
+        if row_id == 0:
+            raise ValueError('Запис не знайдено.')
+        self.deleted.append(row_id)
+
+
+def run(model, ids, batch_size):
+    output = io.StringIO()
+    lines = [json.dumps({'op': 'delete', 'table': 'researcher', 'id': row_id}) for row_id in ids]
+    succeeded, failed, _ = ScriptRunner(model, output, batch_size).run(lines)
+    return succeeded, failed, [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+def test_run_reports_each_operation_after_commit():
+    succeeded, failed, records = run(FakeModel(), [1, 0, 2], batch_size=2)
+    assert (succeeded, failed) == (2, 1)
+    assert [(record['line'], record['status']) for record in records] == [(1, 'ok'), (2, 'error'), (3, 'ok')]
+
+
+def test_failed_commit_marks_whole_batch_as_errors_and_continues():
+    succeeded, failed, records = run(FakeModel(failing_batches=[1]), [1, 0, 2], batch_size=2)
+    assert (succeeded, failed) == (1, 2)
+    assert [(record['line'], record['status']) for record in records] == [(1, 'error'), (2, 'error'), (3, 'ok')]
+    assert 'не зафіксовано' in records[0]['error']
+    # Помилка самої операції не підміняється помилкою фіксації.
+    assert records[1]['error'] == 'Запис не знайдено.'
@@ -0,0 +1,50 @@
+import threading
+
+from common.seeding import SeedingMixin
+
+
+# Замість запитів до бази записує, які частини і в якому порядку генеруються.
+class RecordingModel(SeedingMixin):
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self.lock = threading.Lock()
+        self.prepared = []
+        self.calls = []
+
+    def _prepare_identifiers(self, tables):
+        self.prepared.append(list(tables))
+
+    def generate_data(self, table_name, count, mode='row', first_id=None):
+        with self.lock:
+            self.calls.append((table_name, count, mode))
+        return count
+
+
+class PairsModel(SeedingMixin):
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self.pairs = []
+
+    def generate_pairs(self, table_name, count, **options):
+        self.pairs.append((table_name, count))
+        return count
+
+
+def test_seed_schema_runs_levels_in_order_and_splits_tables(research_catalog):
+    model = RecordingModel(research_catalog)
+    total, _ = model.seed_schema({'Experiment': 10, 'researcher_experiment': 7, 'researcher': 0}, 'copy', workers=4)
+
+    assert total == 17
+    assert model.prepared == [['experiment'], ['researcher_experiment']]
+    assert sorted(model.calls) == [
+        ('experiment', 1, 'copy'), ('experiment', 3, 'copy'), ('experiment', 3, 'copy'), ('experiment', 3, 'copy'),
+        ('researcher_experiment', 7, 'copy'),
+    ]
+    # Таблиця зв'язку генерується лише після своїх батьків.
+    assert model.calls[-1] == ('researcher_experiment', 7, 'copy')
+
+
+def test_generate_data_sends_junction_tables_to_generate_pairs(research_catalog):
+    model = PairsModel(research_catalog)
+    assert model.generate_data('researcher_experiment', 5, 'bulk') == 5
+    assert model.pairs == [('researcher_experiment', 5)]
@@ -0,0 +1,72 @@
+from datetime import date
+
+from common.generation import bulk_insert_query
+from common.values import SEEDED_BASE_DATE, ValueEngine
+
+COLUMNS = [
+    ('experiment_id', 'integer'),
+    ('description', 'character varying'),
+    ('start_date', 'date'),
+    ('research_project_id', 'integer'),
+]
+PROJECTS = [5, 1, 3]
+
+
+def as_list(values):
+    return values.tolist() if hasattr(values, 'tolist') else list(values)
+
+
+def generate(engine, first_id, count):
+    batch = engine.columns('experiment', COLUMNS[1:], first_id, count, {'research_project_id': PROJECTS})
+    return {name: as_list(values) for name, values in batch.items()}
+
+
+def test_same_seed_gives_same_values():
+    assert generate(ValueEngine(seed=11), 0, 2500) == generate(ValueEngine(seed=11), 0, 2500)
+    assert generate(ValueEngine(seed=11), 0, 50) != generate(ValueEngine(seed=12), 0, 50)
+
+
+def test_values_depend_on_id_not_on_split():
+    engine = ValueEngine(seed=11)
+    whole = generate(engine, 0, 2500)
+    parts = [generate(engine, 0, 700), generate(engine, 700, 1300), generate(engine, 2000, 500)]
+    for name, values in whole.items():
+        assert values == [value for part in parts for value in part[name]]
+
+
+def test_values_follow_generation_rules():
+    batch = generate(ValueEngine(seed=1), 0, 200)
+    assert all(value.startswith('Random description ') for value in batch['description'])
+    assert set(batch['research_project_id']) <= set(PROJECTS)
+    assert ValueEngine(seed=1).base_date == SEEDED_BASE_DATE
+
+
+def test_rows_put_ids_in_place():
+    engine = ValueEngine(seed=3, overrides={'experiment.description': 'fixed'})
+    rows = list(engine.rows('experiment', COLUMNS, 'experiment_id', [(0, 2), (1000, 2)],
+                            {'research_project_id': PROJECTS}))
+    assert [row[0] for row in rows] == [1, 2, 1001, 1002]
+    assert {row[1] for row in rows} == {'fixed'}
+
+
+def test_server_seed_is_stable_and_in_range():
+    engine = ValueEngine(seed=5)
+    seeds = [engine.server_seed('experiment', first_id) for first_id in (0, 1000, 2000)]
+    assert seeds == [ValueEngine(seed=5).server_seed('Experiment', first_id) for first_id in (0, 1000, 2000)]
+    assert len(set(seeds)) == 3
+    assert all(-1 <= seed <= 1 for seed in seeds)
+    assert ValueEngine().server_seed('experiment', 0) is None
+    assert ValueEngine().server_base_date() is None
+
+
+def test_seeded_bulk_query_fixes_dates_and_key_order(research_catalog):
+    columns_info = [('experiment_id', 'integer'), ('research_project_id', 'integer'), ('start_date', 'date')]
+    query = bulk_insert_query(research_catalog, 'experiment', 10, columns_info, 'experiment_id', 1000,
+                              date(2024, 1, 1))
+    assert "DATE '2024-01-01'" in query
+    assert 'array_agg(research_project_id ORDER BY research_project_id)' in query
+    assert '1000 + g' in query
+
+    unseeded = bulk_insert_query(research_catalog, 'experiment', 10, columns_info, 'experiment_id', 0)
+    assert 'current_date' in unseeded
+    assert 'ORDER BY' not in unseeded